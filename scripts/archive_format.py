@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Compact archive format for daily digests.
+
+Each day is stored as gzip-compressed JSON Lines (archive/YYYY-MM-DD-digest.jsonl.gz):
+- line 1: header with the date, section order and top-level fields (image_path, error, ...)
+- one line per section, starting with {"section":"<key>", ...}
+
+Markdown is not stored; it is rendered from the structured data when read.
+Sections can be loaded lazily: the reader stops at the requested line and
+only JSON-decodes that one.
+
+Usage:
+    python3 scripts/archive_format.py compact [archive_dir] [--remove]
+    python3 scripts/archive_format.py show 2025-11-21 tech_news [--archive-dir archive]
+"""
+
+import os
+import sys
+import json
+import gzip
+import glob
+import argparse
+from typing import Dict, List, Optional, Iterator
+
+
+FORMAT_VERSION = 1
+COMPACT_SUFFIX = "-digest.jsonl.gz"
+LEGACY_SUFFIX = "-digest.json"
+
+SECTION_KEYS = ["ai_news", "business_news", "tech_news", "podcasts", "motivation_quotes", "wise_knowledge"]
+
+# Top-level fields derived from the structured data at render time
+DERIVED_FIELDS = {"digital_art_markdown"}
+
+
+def compact_path(archive_dir: str, date: str) -> str:
+    """Path of the compact archive file for a date."""
+    return os.path.join(archive_dir, f"{date}{COMPACT_SUFFIX}")
+
+
+def legacy_path(archive_dir: str, date: str) -> str:
+    """Path of the legacy pretty-printed JSON archive file for a date."""
+    return os.path.join(archive_dir, f"{date}{LEGACY_SUFFIX}")
+
+
+def _dumps(data: Dict) -> str:
+    """Serialize one JSON Lines record as compactly as possible."""
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+
+
+def _section_prefix(section: str) -> str:
+    """Line prefix identifying a section record, matched without decoding the line."""
+    return _dumps({"section": section})[:-1]
+
+
+def write_compact_digest(digest: Dict, archive_dir: str = "archive") -> str:
+    """
+    Write a digest in the compact format and return its path.
+    Rendered markdown is dropped unless the digest records an error (error text lives only there).
+    """
+    date = digest.get("date")
+    if not date:
+        raise ValueError("Digest has no date")
+
+    keep_markdown = bool(digest.get("error"))
+    sections = [key for key in SECTION_KEYS if isinstance(digest.get(key), dict)]
+
+    header = {"format": FORMAT_VERSION, "sections": sections}
+    for key, value in digest.items():
+        if key in sections or key in DERIVED_FIELDS:
+            continue
+        header[key] = value
+
+    os.makedirs(archive_dir, exist_ok=True)
+    path = compact_path(archive_dir, date)
+    tmp_path = f"{path}.tmp"
+    lines = [_dumps(header)]
+    for section in sections:
+        record = {"section": section}
+        for key, value in digest[section].items():
+            if key == "markdown" and not keep_markdown:
+                continue
+            record[key] = value
+        lines.append(_dumps(record))
+    
+    # mtime=0 keeps the bytes identical for identical digests, so re-runs don't show up as changes
+    with open(tmp_path, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=9, mtime=0) as f:
+        f.write(("\n".join(lines) + "\n").encode("utf-8"))
+    os.replace(tmp_path, path)
+    return path
+
+
+def _iter_lines(path: str) -> Iterator[str]:
+    """Stream decompressed lines of a compact archive file."""
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            yield line
+
+
+def read_header(path: str) -> Dict:
+    """Read only the header line of a compact archive file."""
+    for line in _iter_lines(path):
+        return json.loads(line)
+    raise ValueError(f"Empty archive file: {path}")
+
+
+def render_section_markdown(section: str, data: Dict, date: str) -> str:
+    """Render a section's markdown from its structured data (as summarize_content does)."""
+    # Imported lazily: only needed when markdown is requested
+    import digest_templates
+    return digest_templates.render_markdown(section, data, date)
+
+
+def load_section(path: str, section: str, with_markdown: bool = True) -> Optional[Dict]:
+    """
+    Lazily load one section from a compact archive file.
+    Stops reading at the matching line; other sections are never JSON-decoded.
+    """
+    prefix = _section_prefix(section)
+    lines = _iter_lines(path)
+    header = json.loads(next(lines))
+    if section not in header.get("sections", []):
+        return None
+
+    for line in lines:
+        if not line.startswith(prefix):
+            continue
+        data = json.loads(line)
+        data.pop("section", None)
+        if with_markdown and "markdown" not in data:
+            data["markdown"] = render_section_markdown(section, data, header.get("date", ""))
+        return data
+    return None
+
+
+def load_compact_digest(path: str, with_markdown: bool = True) -> Dict:
+    """Load a full digest from a compact archive file, in the same shape summarize_content writes."""
+    lines = _iter_lines(path)
+    header = json.loads(next(lines))
+    header.pop("format", None)
+    sections = header.pop("sections", [])
+    date = header.get("date", "")
+
+    digest = {"date": date}
+    for line in lines:
+        data = json.loads(line)
+        section = data.pop("section", None)
+        if section not in sections:
+            continue
+        if with_markdown and "markdown" not in data:
+            data["markdown"] = render_section_markdown(section, data, date)
+        digest[section] = data
+    digest.update(header)
+
+    if with_markdown:
+        import digest_templates
+        digest["digital_art_markdown"] = digest_templates.render_digital_art_markdown(digest.get("image_path"))
+    return digest
+
+
+def load_digest(path: str, with_markdown: bool = True) -> Dict:
+    """Load a digest from either the compact or the legacy JSON format."""
+    if path.endswith(COMPACT_SUFFIX):
+        return load_compact_digest(path, with_markdown=with_markdown)
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def list_archive_files(archive_dir: str = "archive") -> List[str]:
+    """List one archive file per date, preferring the compact format when both exist."""
+    by_date = {}
+    for path in glob.glob(os.path.join(archive_dir, f"*{LEGACY_SUFFIX}")):
+        by_date[os.path.basename(path)[:-len(LEGACY_SUFFIX)]] = path
+    for path in glob.glob(os.path.join(archive_dir, f"*{COMPACT_SUFFIX}")):
+        by_date[os.path.basename(path)[:-len(COMPACT_SUFFIX)]] = path
+    return [by_date[date] for date in sorted(by_date)]
+
+
+def compact_archive(archive_dir: str = "archive", remove: bool = False) -> int:
+    """Convert legacy JSON archive files to the compact format. Returns the number converted."""
+    converted = 0
+    for path in sorted(glob.glob(os.path.join(archive_dir, f"*{LEGACY_SUFFIX}"))):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                digest = json.load(f)
+            new_path = write_compact_digest(digest, archive_dir)
+        except (OSError, json.JSONDecodeError, ValueError) as e:
+            print(f"Skipping {path}: {e}", file=sys.stderr)
+            continue
+
+        print(f"{path} ({os.path.getsize(path):,} bytes) -> {new_path} ({os.path.getsize(new_path):,} bytes)", file=sys.stderr)
+        if remove:
+            os.remove(path)
+        converted += 1
+    return converted
+
+
+def main():
+    """Command-line entry point for converting and inspecting compact archives."""
+    parser = argparse.ArgumentParser(description="Compact digest archive tools")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    compact_parser = subparsers.add_parser("compact", help="Convert archive/*-digest.json to the compact format")
+    compact_parser.add_argument("archive_dir", nargs="?", default="archive")
+    compact_parser.add_argument("--remove", action="store_true", help="Delete the JSON files after converting")
+
+    show_parser = subparsers.add_parser("show", help="Print one section of one day")
+    show_parser.add_argument("date")
+    show_parser.add_argument("section", choices=SECTION_KEYS)
+    show_parser.add_argument("--archive-dir", default="archive")
+
+    args = parser.parse_args()
+
+    if args.command == "compact":
+        count = compact_archive(args.archive_dir, remove=args.remove)
+        print(f"Converted {count} digests", file=sys.stderr)
+    elif args.command == "show":
+        path = compact_path(args.archive_dir, args.date)
+        if os.path.exists(path):
+            data = load_section(path, args.section)
+        elif os.path.exists(legacy_path(args.archive_dir, args.date)):
+            data = load_digest(legacy_path(args.archive_dir, args.date)).get(args.section)
+        else:
+            data = None
+        if data is None:
+            print(f"No {args.section} section for {args.date}", file=sys.stderr)
+            sys.exit(1)
+        print(data.get("markdown", ""))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+SQLite + FTS5 store for all daily digests.
+Normalized tables for sections, summaries, stories, podcasts and images,
+plus a full-text index over titles, content and summaries.
+
+Usage:
+    python3 scripts/archive_store.py import [archive_dir]
+    python3 scripts/archive_store.py search "openai chips" [--since 2025-11-01] [--until 2025-11-30]
+    python3 scripts/archive_store.py range 2025-11-01 2025-11-07 [--section tech_news]
+"""
+
+import os
+import sys
+import json
+import sqlite3
+import argparse
+from typing import List, Dict, Optional, Iterator, Tuple
+
+import archive_format
+
+
+# Derived from the archive files and rewritten daily, so it lives in the Actions
+# cache rather than git; an empty store is rebuilt from archive/ on first use
+DEFAULT_DB_PATH = os.path.join(".cache", "digests.db")
+
+# Digest sections and the key holding their list of entries
+ITEM_SECTIONS = {
+    "ai_news": "stories",
+    "business_news": "stories",
+    "tech_news": "stories",
+    "motivation_quotes": "items",
+    "wise_knowledge": "items",
+}
+PODCAST_SECTION = "podcasts"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS digests (
+    date TEXT PRIMARY KEY,
+    error TEXT
+);
+CREATE TABLE IF NOT EXISTS sections (
+    date TEXT NOT NULL REFERENCES digests(date) ON DELETE CASCADE,
+    section TEXT NOT NULL,
+    markdown TEXT NOT NULL DEFAULT '',
+    PRIMARY KEY (date, section)
+);
+CREATE TABLE IF NOT EXISTS summaries (
+    date TEXT NOT NULL REFERENCES digests(date) ON DELETE CASCADE,
+    section TEXT NOT NULL,
+    summary TEXT NOT NULL,
+    PRIMARY KEY (date, section)
+);
+CREATE TABLE IF NOT EXISTS stories (
+    id INTEGER PRIMARY KEY,
+    date TEXT NOT NULL REFERENCES digests(date) ON DELETE CASCADE,
+    section TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    title TEXT NOT NULL DEFAULT '',
+    url TEXT NOT NULL DEFAULT '',
+    source TEXT NOT NULL DEFAULT '',
+    author TEXT NOT NULL DEFAULT '',
+    points INTEGER NOT NULL DEFAULT 0,
+    comments INTEGER NOT NULL DEFAULT 0,
+    content TEXT NOT NULL DEFAULT '',
+    published TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS idx_stories_date ON stories(date, section);
+CREATE INDEX IF NOT EXISTS idx_stories_source ON stories(source);
+CREATE TABLE IF NOT EXISTS podcasts (
+    id INTEGER PRIMARY KEY,
+    date TEXT NOT NULL REFERENCES digests(date) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    channel TEXT NOT NULL DEFAULT '',
+    title TEXT NOT NULL DEFAULT '',
+    url TEXT NOT NULL DEFAULT '',
+    published_at TEXT NOT NULL DEFAULT '',
+    description TEXT NOT NULL DEFAULT '',
+    summary TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS idx_podcasts_date ON podcasts(date);
+CREATE TABLE IF NOT EXISTS images (
+    date TEXT PRIMARY KEY REFERENCES digests(date) ON DELETE CASCADE,
+    path TEXT NOT NULL,
+    markdown TEXT NOT NULL DEFAULT ''
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5(
+    date UNINDEXED,
+    section UNINDEXED,
+    kind UNINDEXED,
+    title,
+    body,
+    tokenize = 'porter unicode61'
+);
+"""
+
+
+def get_db_path() -> str:
+    """Get archive database path from environment or default."""
+    return os.getenv("ARCHIVE_DB", DEFAULT_DB_PATH)
+
+
+def connect(db_path: Optional[str] = None) -> sqlite3.Connection:
+    """Open (and create if needed) the archive database."""
+    db_path = db_path or get_db_path()
+    db_dir = os.path.dirname(db_path)
+    if db_dir:
+        os.makedirs(db_dir, exist_ok=True)
+
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA foreign_keys = ON")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def iter_section_items(digest: Dict) -> Iterator[Tuple[str, List[Dict]]]:
+    """Yield (section, entries) for every story/item section of a digest."""
+    for section, items_key in ITEM_SECTIONS.items():
+        section_data = digest.get(section) or {}
+        yield section, section_data.get(items_key) or []
+
+
+def _as_int(value) -> int:
+    """Coerce counters from fetchers (sometimes None or strings) to int."""
+    try:
+        return int(value or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def store_digest(conn: sqlite3.Connection, digest: Dict):
+    """
+    Insert or replace one day's digest.
+    Existing rows for the same date are replaced, so re-runs stay idempotent.
+    """
+    date = digest.get("date")
+    if not date:
+        raise ValueError("Digest has no date")
+
+    with conn:
+        conn.execute("DELETE FROM digests WHERE date = ?", (date,))
+        conn.execute("DELETE FROM search_index WHERE date = ?", (date,))
+        conn.execute("INSERT INTO digests (date, error) VALUES (?, ?)", (date, digest.get("error")))
+
+        fts_rows = []
+
+        for section in list(ITEM_SECTIONS) + [PODCAST_SECTION]:
+            section_data = digest.get(section) or {}
+            if not section_data:
+                continue
+
+            conn.execute(
+                "INSERT INTO sections (date, section, markdown) VALUES (?, ?, ?)",
+                (date, section, section_data.get("markdown", "")),
+            )
+            summary = section_data.get("summary", "")
+            if summary:
+                conn.execute(
+                    "INSERT INTO summaries (date, section, summary) VALUES (?, ?, ?)",
+                    (date, section, summary),
+                )
+                fts_rows.append((date, section, "summary", "", summary))
+
+        for section, items in iter_section_items(digest):
+            for position, item in enumerate(items, 1):
+                title = item.get("title", "")
+                content = item.get("content", "")
+                conn.execute(
+                    """INSERT INTO stories
+                       (date, section, position, title, url, source, author, points, comments, content, published)
+                       VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                    (
+                        date, section, position, title,
+                        item.get("url", ""), item.get("source", ""), item.get("author", "") or "",
+                        _as_int(item.get("points")), _as_int(item.get("comments")),
+                        content, item.get("published", ""),
+                    ),
+                )
+                fts_rows.append((date, section, "story", title, content))
+
+        podcasts = (digest.get(PODCAST_SECTION) or {}).get("podcasts") or []
+        for position, podcast in enumerate(podcasts, 1):
+            episode = podcast.get("episode") or {}
+            title = episode.get("title", "")
+            summary = podcast.get("summary", "")
+            conn.execute(
+                """INSERT INTO podcasts
+                   (date, position, channel, title, url, published_at, description, summary)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+                (
+                    date, position, podcast.get("channel", episode.get("channel", "")), title,
+                    episode.get("url", ""), episode.get("published_at", ""),
+                    episode.get("description", ""), summary,
+                ),
+            )
+            fts_rows.append((date, PODCAST_SECTION, "podcast", title, summary))
+
+        image_path = digest.get("image_path") or (digest.get("ai_news") or {}).get("image_path")
+        if image_path:
+            conn.execute(
+                "INSERT INTO images (date, path, markdown) VALUES (?, ?, ?)",
+                (date, image_path, digest.get("digital_art_markdown", "")),
+            )
+
+        conn.executemany(
+            "INSERT INTO search_index (date, section, kind, title, body) VALUES (?, ?, ?, ?, ?)",
+            fts_rows,
+        )
+
+
+def import_json_archive(conn: sqlite3.Connection, archive_dir: str = "archive") -> int:
+    """One-shot import of existing archive files (JSON or compact). Returns the number imported."""
+    imported = 0
+    for path in archive_format.list_archive_files(archive_dir):
+        try:
+            store_digest(conn, archive_format.load_digest(path))
+            imported += 1
+        except (OSError, json.JSONDecodeError, ValueError) as e:
+            print(f"Skipping {path}: {e}", file=sys.stderr)
+    return imported
+
+
+def search(
+    conn: sqlite3.Connection,
+    query: str,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    limit: int = 20,
+) -> List[Dict]:
+    """Full-text search across story titles, content and summaries, best matches first."""
+    sql = """SELECT date, section, kind, title, snippet(search_index, 4, '[', ']', '…', 12) AS snippet
+             FROM search_index WHERE search_index MATCH ?"""
+    params: List = [query]
+    if since:
+        sql += " AND date >= ?"
+        params.append(since)
+    if until:
+        sql += " AND date <= ?"
+        params.append(until)
+    sql += " ORDER BY rank LIMIT ?"
+    params.append(limit)
+    return [dict(row) for row in conn.execute(sql, params)]
+
+
+def query_range(
+    conn: sqlite3.Connection,
+    start: str,
+    end: str,
+    section: Optional[str] = None,
+) -> List[Dict]:
+    """Return stories between two dates (inclusive), optionally for one section."""
+    sql = """SELECT date, section, position, title, url, source, points, comments
+             FROM stories WHERE date BETWEEN ? AND ?"""
+    params: List = [start, end]
+    if section:
+        sql += " AND section = ?"
+        params.append(section)
+    sql += " ORDER BY date, section, position"
+    return [dict(row) for row in conn.execute(sql, params)]
+
+
+def main():
+    """Command-line entry point for importing and querying the archive store."""
+    parser = argparse.ArgumentParser(description="Query the digest archive store")
+    parser.add_argument("--db", default=None, help=f"Database path (default: $ARCHIVE_DB or {DEFAULT_DB_PATH})")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = subparsers.add_parser("import", help="Import archive/*-digest.json(l.gz) files")
+    import_parser.add_argument("archive_dir", nargs="?", default="archive")
+
+    search_parser = subparsers.add_parser("search", help="Full-text search")
+    search_parser.add_argument("query")
+    search_parser.add_argument("--since")
+    search_parser.add_argument("--until")
+    search_parser.add_argument("--limit", type=int, default=20)
+
+    range_parser = subparsers.add_parser("range", help="Stories between two dates")
+    range_parser.add_argument("start")
+    range_parser.add_argument("end")
+    range_parser.add_argument("--section", choices=sorted(ITEM_SECTIONS))
+
+    args = parser.parse_args()
+    conn = connect(args.db)
+
+    try:
+        if args.command == "import":
+            count = import_json_archive(conn, args.archive_dir)
+            print(f"Imported {count} digests", file=sys.stderr)
+        elif args.command == "search":
+            for row in search(conn, args.query, args.since, args.until, args.limit):
+                print(f"{row['date']}  {row['section']:<17} {row['title'] or row['snippet']}")
+        elif args.command == "range":
+            for row in query_range(conn, args.start, args.end, args.section):
+                print(f"{row['date']}  {row['section']:<17} {row['position']:>2}. {row['title']} ({row['source']})")
+    except sqlite3.OperationalError as e:
+        print(f"Query error: {e}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Benchmark script import (cold start) time.
+
+Imports each pipeline module in a fresh interpreter with `python -X importtime`
+and reports its cumulative import time (best of several runs) and the slowest
+modules it pulls in. With --check, exits 1 when a module is over the time budget
+or imports a heavy dependency at load time; those belong inside the function
+that uses them.
+
+Usage:
+    python3 scripts/bench_startup.py [--runs 5] [--budget-ms 60] [--check]
+"""
+
+import os
+import sys
+import json
+import argparse
+import subprocess
+from typing import Dict, List, Tuple
+
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+MODULES = (
+    "digest",
+    "summarize_content",
+    "summarize_podcasts",
+    "summarize_ai",
+    "log_stats",
+    "update_readme",
+    "send_notification",
+    "archive_store",
+    "archive_format",
+    "rollups",
+    "trends",
+    "stories",
+    "youtube",
+    "transcripts",
+    "digest_templates",
+    "github_client",
+    "clients",
+    "outbox",
+)
+
+# Dependencies that must only be imported by the code paths that use them
+HEAVY_MODULES = (
+    "requests",
+    "urllib3",
+    "openai",
+    "feedparser",
+    "firecrawl",
+    "numpy",
+    "pytz",
+    "sendgrid",
+    "twilio",
+    "cryptography",
+)
+
+DEFAULT_RUNS = 5
+DEFAULT_BUDGET_MS = 60.0
+TOP_IMPORTS = 3
+
+PROBE = (
+    "import sys, json; before = set(sys.modules); import {module}; "
+    "print(json.dumps(sorted(set(sys.modules) - before)))"
+)
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int]]:
+    """(module, cumulative microseconds) for each line of -X importtime output."""
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue  # header line
+        entries.append((parts[2].strip(), int(parts[1])))
+    return entries
+
+
+def measure(module: str) -> Dict:
+    """Import a module once in a fresh interpreter."""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [SCRIPTS_DIR, env.get("PYTHONPATH")]))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PROBE.format(module=module)],
+        capture_output=True, text=True, cwd=SCRIPTS_DIR, env=env,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed: {result.stderr.strip().splitlines()[-1:]}")
+
+    entries = parse_importtime(result.stderr)
+    cumulative = dict(entries)
+    loaded = json.loads(result.stdout.strip().splitlines()[-1])
+    # Direct and transitive imports this module triggered, slowest first
+    slowest = sorted(
+        ((name, us) for name, us in entries if name in loaded and name != module),
+        key=lambda item: -item[1],
+    )
+    return {
+        "ms": cumulative.get(module, 0) / 1000,
+        "heavy": sorted({name.split(".")[0] for name in loaded} & set(HEAVY_MODULES)),
+        "slowest": [(name, round(us / 1000, 1)) for name, us in slowest[:TOP_IMPORTS]],
+    }
+
+
+def bench(module: str, runs: int) -> Dict:
+    """Best of several cold imports."""
+    samples = [measure(module) for _ in range(runs)]
+    best = min(samples, key=lambda sample: sample["ms"])
+    return {"module": module, "ms": round(best["ms"], 1), "heavy": best["heavy"], "slowest": best["slowest"]}
+
+
+def main():
+    """Run the startup benchmark and print results as JSON."""
+    parser = argparse.ArgumentParser(description="Benchmark script import time")
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS)
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS, help="Per-module import time budget")
+    parser.add_argument("--check", action="store_true", help="Exit 1 if a module is over budget or loads a heavy dependency")
+    parser.add_argument("modules", nargs="*", default=list(MODULES))
+    args = parser.parse_args()
+
+    results = []
+    failures = []
+    for module in args.modules:
+        result = bench(module, args.runs)
+        results.append(result)
+        slowest = ", ".join(f"{name} {ms}ms" for name, ms in result["slowest"])
+        print(f"{module}: {result['ms']}ms ({slowest or 'stdlib only'})", file=sys.stderr)
+        if result["heavy"]:
+            failures.append(f"{module} imports {', '.join(result['heavy'])} at load time")
+        if result["ms"] > args.budget_ms:
+            failures.append(f"{module} takes {result['ms']}ms to import (budget {args.budget_ms}ms)")
+
+    print(json.dumps(results, indent=2))
+    for failure in failures:
+        print(f"Startup budget exceeded: {failure}", file=sys.stderr)
+    if args.check and failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
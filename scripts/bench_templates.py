@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Benchmark digest template rendering.
+
+Renders a synthetic digest (all sections full, plus podcasts) repeatedly and
+reports the time per render for all formats at once and for markdown only.
+
+Usage:
+    python3 scripts/bench_templates.py [--iterations 2000] [--stories 10]
+"""
+
+import sys
+import time
+import json
+import argparse
+from typing import Dict
+
+import digest_templates
+
+
+def synthetic_digest(stories: int) -> Dict:
+    """A digest with every section filled, including characters that need HTML escaping."""
+    def story(section: str, i: int) -> Dict:
+        return {
+            "title": f"{section} story {i} <with> \"markup\" & symbols",
+            "url": f"https://example.com/{section}/{i}?a=1&b=2",
+            "hn_url": f"https://news.ycombinator.com/item?id={i}",
+            "points": 100 - i,
+            "source": "Example",
+        }
+
+    def item(section: str, i: int) -> Dict:
+        return {"content": f"{section} quote {i} " + "words " * 40, "url": f"https://example.com/q/{i}", "source": "r/quotes"}
+
+    digest = {"date": "2025-01-01"}
+    for spec in digest_templates.SECTIONS:
+        make = story if spec.kind == "stories" else item
+        digest[spec.key] = {"summary": f"{spec.title} summary " * 20, spec.kind: [make(spec.key, i) for i in range(stories)]}
+    digest["podcasts"] = {"podcasts": [
+        {
+            "episode": {
+                "channel": f"Channel {i}",
+                "title": f"Episode {i}",
+                "published_at": "2024-12-31T12:00:00Z",
+                "url": f"https://www.youtube.com/watch?v={i}",
+            },
+            "summary": "Episode summary " * 30,
+        }
+        for i in range(4)
+    ]}
+    return digest
+
+
+def bench(label: str, fn, iterations: int) -> Dict:
+    """Time fn() over the given number of iterations."""
+    fn()  # warm up
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    elapsed = time.perf_counter() - started
+    result = {"label": label, "iterations": iterations, "us_per_render": round(elapsed / iterations * 1e6, 1)}
+    print(f"{label}: {result['us_per_render']} us/render", file=sys.stderr)
+    return result
+
+
+def main():
+    """Run the rendering benchmark and print results as JSON."""
+    parser = argparse.ArgumentParser(description="Benchmark digest template rendering")
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--stories", type=int, default=10, help="Stories/items per section")
+    args = parser.parse_args()
+
+    digest = synthetic_digest(args.stories)
+    sections = [spec.key for spec in digest_templates.SECTIONS] + ["podcasts"]
+    results = [
+        bench("all formats (render_digest)", lambda: digest_templates.render_digest(digest), args.iterations),
+        bench(
+            "markdown only (per section)",
+            lambda: [digest_templates.render_markdown(key, digest[key], digest["date"]) for key in sections],
+            args.iterations,
+        ),
+    ]
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Shared API clients.
+
+Clients are created once and reused by every stage, so a single-process run
+(python -m digest run) keeps its HTTP connections and OpenAI client warm.
+requests.Session is not thread-safe, so each thread gets its own session
+(and connection pool); the OpenAI client is shared. The client libraries are
+imported on first use, so importing this module costs nothing.
+
+Rate limiters are shared the same way: every thread calling an API goes
+through that API's limiter, however many tasks run concurrently.
+"""
+
+import os
+import time
+import functools
+import threading
+
+
+HTTP_POOL_SIZE = 16
+
+_local = threading.local()
+
+# Per-API (requests per second, requests in flight); overridable with
+# <NAME>_RATE_LIMIT and <NAME>_MAX_IN_FLIGHT, e.g. YOUTUBE_RATE_LIMIT=5
+RATE_LIMITS = {
+    "youtube": (10.0, 8),
+    "openai": (2.0, 4),
+}
+
+
+def http_session():
+    """This thread's requests session, with a connection pool per host."""
+    session = getattr(_local, "session", None)
+    if session is None:
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        _local.session = session
+    return session
+
+
+@functools.lru_cache(maxsize=None)
+def openai_client(api_key: str):
+    """Shared OpenAI client for an API key."""
+    from openai import OpenAI
+    return OpenAI(api_key=api_key)
+
+
+class RateLimiter:
+    """Spaces calls at least 1/rate seconds apart and caps how many run at once, across threads."""
+
+    def __init__(self, rate: float, max_in_flight: int):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next_start = 0.0
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max(1, max_in_flight))
+
+    def __enter__(self):
+        self._slots.acquire()
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start)
+            self._next_start = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+        return self
+
+    def __exit__(self, *exc):
+        self._slots.release()
+        return False
+
+
+@functools.lru_cache(maxsize=None)
+def rate_limiter(name: str) -> RateLimiter:
+    """Shared rate limiter for an API (see RATE_LIMITS)."""
+    rate, max_in_flight = RATE_LIMITS.get(name, (0.0, HTTP_POOL_SIZE))
+    rate = float(os.getenv(f"{name.upper()}_RATE_LIMIT", rate))
+    max_in_flight = int(os.getenv(f"{name.upper()}_MAX_IN_FLIGHT", max_in_flight))
+    return RateLimiter(rate, max_in_flight)
@@ -0,0 +1,14 @@
+"""
+Single-process daily digest pipeline.
+
+    PYTHONPATH=scripts python3 -m digest run
+
+runs the GitHub stats, content, podcast and README stages in one interpreter,
+sharing API clients and passing data in memory. The individual scripts
+(log_stats.py, summarize_content.py, summarize_podcasts.py, update_readme.py)
+still work on their own.
+"""
+
+from digest.pipeline import STAGES, run
+
+__all__ = ["STAGES", "run"]
@@ -0,0 +1,52 @@
+"""
+Command-line entry point: python -m digest run [options]
+
+Usage:
+    PYTHONPATH=scripts python3 -m digest run
+    PYTHONPATH=scripts python3 -m digest run --stages content,readme
+"""
+
+import os
+import sys
+import json
+import argparse
+
+from digest.pipeline import STAGES, run
+
+
+def main():
+    """Parse arguments and run the pipeline."""
+    parser = argparse.ArgumentParser(prog="python -m digest", description="Daily digest pipeline")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="Run pipeline stages in this process")
+    run_parser.add_argument("--stages", default=",".join(STAGES), help=f"Comma-separated subset of {', '.join(STAGES)}")
+    run_parser.add_argument("--stats-json", default=os.getenv("STATS_JSON", "/tmp/github_stats.json"))
+    run_parser.add_argument("--content-json", default=os.getenv("CONTENT_JSON", "/tmp/content_summary.json"))
+    run_parser.add_argument("--podcasts-json", default=os.getenv("PODCASTS_JSON", "/tmp/podcasts_summary.json"))
+    run_parser.add_argument("--readme", default=os.getenv("README_PATH", "README.md"))
+    run_parser.add_argument("--manifest", default=os.getenv("README_MANIFEST"))
+
+    args = parser.parse_args()
+
+    if args.command == "run":
+        stages = [stage.strip() for stage in args.stages.split(",") if stage.strip()]
+        try:
+            results = run(
+                stages,
+                stats_json=args.stats_json,
+                content_json=args.content_json,
+                podcasts_json=args.podcasts_json,
+                readme_path=args.readme,
+                manifest_path=args.manifest,
+            )
+        except (ValueError, OSError) as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+        print(f"Pipeline timings: {json.dumps(results['timings'])}", file=sys.stderr)
+        if "manifest" in results:
+            print("README updated" if results["manifest"]["changed"] else "README unchanged", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
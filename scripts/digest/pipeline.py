@@ -0,0 +1,152 @@
+"""
+Pipeline stages and the in-process runner.
+
+Stats, content and podcasts don't depend on each other and run concurrently;
+podcasts are then merged into the content digest, which is archived (archive
+file, archive store, rollups, trends) and rendered into the README. Stage outputs are still written as JSON files for the notification
+step and the failure artifacts.
+"""
+
+import sys
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, Optional
+
+
+STAGES = ("stats", "content", "podcasts", "readme")
+
+STATS_FALLBACK = {"date": "", "markdown": "## 📊 Daily Dev Activity\n\n*Error fetching stats.*\n", "stats": {}}
+
+
+def run_stats() -> Dict:
+    """GitHub YTD stats (log_stats.py)."""
+    import log_stats
+    try:
+        return log_stats.collect_stats()
+    except Exception as e:
+        print(f"Stats stage failed: {e}", file=sys.stderr)
+        return dict(STATS_FALLBACK)
+
+
+def run_content() -> Dict:
+    """News, quotes, image, archive, rollups and trends (summarize_content.py)."""
+    import summarize_content
+    try:
+        return summarize_content.build_digest()
+    except Exception as e:
+        print(f"Content stage failed: {e}", file=sys.stderr)
+        import traceback
+        print(traceback.format_exc(), file=sys.stderr)
+        return summarize_content.fallback_digest(str(e))
+
+
+def run_podcasts() -> Dict:
+    """Podcast summaries (summarize_podcasts.py)."""
+    import summarize_podcasts
+    try:
+        return summarize_podcasts.collect_podcasts()
+    except Exception as e:
+        print(f"Podcasts stage failed: {e}", file=sys.stderr)
+        return summarize_podcasts.podcasts_fallback(f"Error fetching podcasts: {str(e)}")
+
+
+def archive_content(content: Dict) -> Dict:
+    """Archive the merged digest and add its rollups and trends (summarize_content.py)."""
+    import summarize_content
+    try:
+        return summarize_content.archive_digest(content)
+    except Exception as e:
+        print(f"Archive stage failed: {e}", file=sys.stderr)
+        return content
+
+
+def merge_podcasts(content: Dict, podcasts: Dict) -> Dict:
+    """Merge the podcast stage output into the content digest (only when it has markdown)."""
+    if podcasts and podcasts.get("markdown"):
+        content["podcasts"] = {
+            "markdown": podcasts["markdown"],
+            "podcasts": podcasts.get("podcasts", []),
+            "summary": podcasts.get("summary", ""),
+        }
+    return content
+
+
+def write_json(path: Optional[str], data: Dict):
+    """Write a stage output for the steps that still read files."""
+    if not path:
+        return
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+
+
+def _timed(name: str, stage: Callable[[], Dict], timings: Dict[str, float]) -> Dict:
+    started = time.monotonic()
+    try:
+        return stage()
+    finally:
+        timings[name] = round(time.monotonic() - started, 2)
+        print(f"Stage {name} finished in {timings[name]}s", file=sys.stderr)
+
+
+def run(
+    stages: Iterable[str] = STAGES,
+    stats_json: Optional[str] = None,
+    content_json: Optional[str] = None,
+    podcasts_json: Optional[str] = None,
+    readme_path: str = "README.md",
+    manifest_path: Optional[str] = None,
+) -> Dict:
+    """
+    Run the selected stages in this process.
+    Returns {"stats", "content", "podcasts", "manifest", "timings"} for the stages that ran.
+    """
+    stages = set(stages)
+    unknown = stages - set(STAGES)
+    if unknown:
+        raise ValueError(f"Unknown stage(s): {', '.join(sorted(unknown))}")
+
+    timings: Dict[str, float] = {}
+    results: Dict = {"timings": timings}
+    independent = {
+        "stats": run_stats,
+        "content": run_content,
+        "podcasts": run_podcasts,
+    }
+    selected = {name: stage for name, stage in independent.items() if name in stages}
+
+    started = time.monotonic()
+    if selected:
+        with ThreadPoolExecutor(max_workers=len(selected)) as executor:
+            futures = {name: executor.submit(_timed, name, stage, timings) for name, stage in selected.items()}
+            for name, future in futures.items():
+                results[name] = future.result()
+
+    if "stats" in results:
+        write_json(stats_json, results["stats"])
+
+    content = results.get("content")
+    if content is None and content_json and ("readme" in stages or "podcasts" in results):
+        # Partial run: build on an existing content digest
+        with open(content_json, "r", encoding="utf-8") as f:
+            content = json.load(f)
+    if content is not None:
+        if "content" in results or "podcasts" in results:
+            merge_podcasts(content, results.get("podcasts"))
+            # Archive only a freshly built digest (a failed content stage carries "error")
+            if "content" in results and not content.get("error"):
+                content = _timed("archive", lambda: archive_content(content), timings)
+            write_json(content_json, content)
+        results["content"] = content
+    if "podcasts" in results:
+        write_json(podcasts_json, results["podcasts"])
+
+    if "readme" in stages and content is not None:
+        import update_readme
+        manifest = _timed("readme", lambda: update_readme.update_readme(content, readme_path), timings)
+        if manifest_path:
+            update_readme.write_manifest(manifest_path, manifest)
+        results["manifest"] = manifest
+
+    timings["total"] = round(time.monotonic() - started, 2)
+    return results
@@ -0,0 +1,343 @@
+"""
+Digest templates for README markdown, email HTML and SMS text.
+
+Section layouts are format strings compiled once at import. A digest dict (the
+summarize_content.py JSON shape) is normalized into section views and every
+format is rendered from them in one pass. Fields are escaped per format: HTML
+output goes through html.escape (quotes are left alone in text and percent-encoded
+in URLs, so the email keeps its original markup), markdown and SMS text are
+emitted as-is.
+"""
+
+import html
+import string
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+
+HN_NEWEST_URL = "https://news.ycombinator.com/newest"
+EMAIL_ITEMS = 5
+EMAIL_QUOTE_CHARS = 200
+SMS_CHARS = 150
+
+
+def validate_url(url: str) -> bool:
+    """Validate that a URL is properly formatted."""
+    try:
+        result = urlparse(url)
+        return all([result.scheme, result.netloc])
+    except Exception:
+        return False
+
+
+class Template:
+    """A format-string template parsed once into literal/field parts."""
+
+    __slots__ = ("source", "parts")
+
+    def __init__(self, source: str):
+        self.source = source
+        self.parts: Tuple[Tuple[str, Optional[str]], ...] = tuple(
+            (literal, field) for literal, field, _, _ in string.Formatter().parse(source)
+        )
+
+    def render(self, fields: Dict, escape: Callable[[str], str]) -> str:
+        """Fill the fields, escaping every value."""
+        out = []
+        for literal, field in self.parts:
+            out.append(literal)
+            if field is not None:
+                out.append(escape(str(fields[field])))
+        return "".join(out)
+
+
+def compile_templates(sources: Dict[str, str]) -> Dict[str, Template]:
+    """Compile a set of named templates."""
+    return {name: Template(source) for name, source in sources.items()}
+
+
+def _no_escape(value: str) -> str:
+    return value
+
+
+def _html_escape(value: str) -> str:
+    return html.escape(value, quote=False)
+
+
+def _attribute_url(url: str) -> str:
+    """A URL safe inside a double-quoted attribute once & < > are escaped."""
+    return url.replace('"', "%22")
+
+
+# Markdown blocks end in a newline; a section drops its final newline when joined
+MARKDOWN = compile_templates({
+    "section_header": "## {emoji} {title} - {date}\n\n### {list_heading}\n\n",
+    "story": "{index}. [{title}]({url})\n\n",
+    "item": "{index}. {content}\n   *Source: [{source}]({url})*\n\n",
+    "section_footer": "### {summary_heading}\n\n{summary}\n\n",
+    "podcasts_header": "## 🎙️ Podcast Summaries - {date}\n\n",
+    "podcasts_empty": "## 🎙️ Podcast Summaries - {date}\n\nNo recent podcast episodes found.\n",
+    "episode_header": "### {channel} - {title}\n",
+    "episode_published": "*Published: {published}*\n",
+    "episode_summary": "\n{summary}\n\n",
+    "episode_no_summary": "\n",
+    "episode_link": "[Watch on YouTube]({url})\n",
+    "episode_footer": "\n---\n\n",
+    "digital_art": (
+        "### 🎨 Digital Art: Pointillism & Motion Design\n\n"
+        "*Inspired by today's news trends across AI, Business, Tech, and Podcasts*\n\n"
+        "![Digital Pointillism Artwork]({image_path})\n"
+    ),
+})
+
+HTML = compile_templates({
+    "header": "<h2>Daily Digest - {date}</h2>\n",
+    "rule": "<hr>\n",
+    "section_header": "<h3>{emoji} {title}</h3>\n",
+    "summary": "<p>{summary}</p>\n",
+    "labeled_summary": "<p><strong>{label}:</strong> {summary}</p>\n",
+    "list_heading": "<h4>{heading}</h4>\n",
+    "list_start": "<ul>\n",
+    "story": '<li><a href="{url}">{title}</a></li>\n',
+    "item": '<li>"{content}" <em>(<a href="{url}">{source}</a>)</em></li>\n',
+    "list_end": "</ul>\n",
+    "empty": "<p>Content is being processed. Check back later for updates.</p>\n",
+    "footer": "<hr>\n<p><small>Generated automatically via GitHub Actions</small></p>",
+})
+
+TEXT = compile_templates({
+    "subject": "📊 Daily Digest - {date}",
+    "header": "Daily Digest - {date}",
+    "line": "\n\n{emoji} {label}: {text}",
+})
+
+
+@dataclass(frozen=True, slots=True)
+class SectionSpec:
+    """Static layout of one digest section."""
+    key: str
+    title: str
+    emoji: str
+    kind: str = "stories"  # "stories" (linked headlines) or "items" (quotes with sources)
+    list_heading: str = "Top Stories"
+    summary_heading: str = "Summary"
+    fallback_url: str = "#"
+    prefer_hn: bool = False
+    sms_label: str = ""
+    sms_first_item: bool = False  # SMS shows the first item instead of the summary
+    email_summary_label: str = ""  # e.g. "Summary" -> <strong>Summary:</strong> before the summary
+    email_list_heading: str = ""  # <h4> above the email list
+    email_rule: bool = True  # <hr> after the section (the last one relies on the footer's)
+
+
+SECTIONS: Tuple[SectionSpec, ...] = (
+    SectionSpec("ai_news", "AI Industry Snapshot", "🤖", list_heading="Top AI Stories",
+                summary_heading="AI Trends Summary", fallback_url=HN_NEWEST_URL, prefer_hn=True, sms_label="AI",
+                email_summary_label="Summary", email_list_heading="Top AI Stories"),
+    SectionSpec("business_news", "Business News", "💼", sms_label="Business"),
+    SectionSpec("tech_news", "Tech News", "💻"),
+    SectionSpec("motivation_quotes", "Motivation Quotes", "💪", kind="items", list_heading="Top Items",
+                sms_label="Quote", sms_first_item=True),
+    SectionSpec("wise_knowledge", "Wise Knowledge", "🧠", kind="items", list_heading="Top Items", email_rule=False),
+)
+SECTIONS_BY_KEY = {spec.key: spec for spec in SECTIONS}
+
+
+@dataclass(slots=True)
+class Entry:
+    """A story or item normalized for rendering."""
+    title: str
+    url: str
+    content: str
+    source: str
+
+
+@dataclass(slots=True)
+class SectionView:
+    """A section's spec plus its normalized entries."""
+    spec: SectionSpec
+    summary: str
+    entries: List[Entry]
+
+
+def link_url(spec: SectionSpec, record: Dict) -> str:
+    """The link shown for a record: validated, or the section's fallback."""
+    url = (record.get("hn_url") if spec.prefer_hn else None) or record.get("url") or spec.fallback_url
+    return url if validate_url(url) else spec.fallback_url
+
+
+def build_section(spec: SectionSpec, records: List[Dict], summary: str) -> SectionView:
+    """Normalize a section's stories/items once for every output format."""
+    entries = [
+        Entry(
+            title=record.get("title", ""),
+            url=link_url(spec, record),
+            content=record.get("content", record.get("title", "")),
+            source=record.get("source", "Unknown"),
+        )
+        for record in records
+    ]
+    return SectionView(spec, summary or "", entries)
+
+
+def section_records(spec: SectionSpec, data: Dict) -> List[Dict]:
+    """The stories or items list of a section's data."""
+    return (data or {}).get(spec.kind) or []
+
+
+def render_section_markdown(spec: SectionSpec, view: SectionView, date: str) -> str:
+    """Render one news/quotes section as README markdown."""
+    out = [MARKDOWN["section_header"].render(
+        {"emoji": spec.emoji, "title": spec.title, "date": date, "list_heading": spec.list_heading}, _no_escape,
+    )]
+    entry_template = MARKDOWN["story" if spec.kind == "stories" else "item"]
+    for i, entry in enumerate(view.entries, 1):
+        out.append(entry_template.render(
+            {"index": i, "title": entry.title, "url": entry.url, "content": entry.content, "source": entry.source},
+            _no_escape,
+        ))
+    out.append(MARKDOWN["section_footer"].render(
+        {"summary_heading": spec.summary_heading, "summary": view.summary}, _no_escape,
+    ))
+    return "".join(out)[:-1]
+
+
+def render_podcasts_markdown(podcasts: List[Dict], date: str) -> str:
+    """Render podcast summaries as README markdown."""
+    if not podcasts:
+        return MARKDOWN["podcasts_empty"].render({"date": date}, _no_escape)[:-1]
+
+    out = [MARKDOWN["podcasts_header"].render({"date": date}, _no_escape)]
+    for podcast in podcasts:
+        episode = podcast.get("episode", {})
+        if not episode:
+            continue
+        summary = podcast.get("summary", "")
+
+        out.append(MARKDOWN["episode_header"].render(
+            {"channel": episode.get("channel", "Unknown"), "title": episode.get("title", "Unknown")}, _no_escape,
+        ))
+        published = ""
+        if episode.get("published_at"):
+            try:
+                published = datetime.fromisoformat(episode["published_at"].replace("Z", "+00:00")).strftime("%Y-%m-%d")
+            except ValueError:
+                published = ""
+        if published:
+            out.append(MARKDOWN["episode_published"].render({"published": published}, _no_escape))
+        if summary:
+            out.append(MARKDOWN["episode_summary"].render({"summary": summary}, _no_escape))
+        else:
+            out.append(MARKDOWN["episode_no_summary"].render({}, _no_escape))
+        video_url = episode.get("url", "")
+        if video_url and validate_url(video_url):
+            out.append(MARKDOWN["episode_link"].render({"url": video_url}, _no_escape))
+        out.append(MARKDOWN["episode_footer"].render({}, _no_escape))
+    return "".join(out)[:-1]
+
+
+def render_digital_art_markdown(image_path: Optional[str]) -> str:
+    """Render the digital art section; "" without an image."""
+    if not image_path:
+        return ""
+    return MARKDOWN["digital_art"].render({"image_path": image_path}, _no_escape)
+
+
+def render_markdown(section: str, data: Dict, date: str) -> str:
+    """Render one section of a digest (by key) as README markdown; "" for unknown or empty sections."""
+    if section == "podcasts":
+        # An empty podcast list means the podcast stage never merged into this digest
+        podcasts = (data or {}).get("podcasts") or []
+        return render_podcasts_markdown(podcasts, date) if podcasts else ""
+    spec = SECTIONS_BY_KEY.get(section)
+    if spec is None:
+        return ""
+    view = build_section(spec, section_records(spec, data), (data or {}).get("summary", ""))
+    return render_section_markdown(spec, view, date)
+
+
+def _has_html(view: SectionView) -> bool:
+    """Whether a section appears in the email: quote sections only with items, news with a summary or stories."""
+    if view.spec.kind == "items":
+        return bool(view.entries)
+    return bool(view.summary or view.entries)
+
+
+def _render_html_section(view: SectionView) -> str:
+    spec = view.spec
+    out = [HTML["section_header"].render({"emoji": spec.emoji, "title": spec.title}, _html_escape)]
+    # Quote sections list their items only; their summary is a README feature
+    if view.summary and spec.kind == "stories":
+        if spec.email_summary_label:
+            out.append(HTML["labeled_summary"].render(
+                {"label": spec.email_summary_label, "summary": view.summary}, _html_escape,
+            ))
+        else:
+            out.append(HTML["summary"].render({"summary": view.summary}, _html_escape))
+    if view.entries:
+        if spec.email_list_heading:
+            out.append(HTML["list_heading"].render({"heading": spec.email_list_heading}, _html_escape))
+        entry_template = HTML["story" if spec.kind == "stories" else "item"]
+        out.append(HTML["list_start"].render({}, _html_escape))
+        for entry in view.entries[:EMAIL_ITEMS]:
+            out.append(entry_template.render(
+                {
+                    "title": entry.title,
+                    "url": _attribute_url(entry.url),
+                    "content": entry.content[:EMAIL_QUOTE_CHARS],
+                    "source": entry.source,
+                },
+                _html_escape,
+            ))
+        out.append(HTML["list_end"].render({}, _html_escape))
+    if spec.email_rule:
+        out.append(HTML["rule"].render({}, _html_escape))
+    return "".join(out)
+
+
+def _render_text_line(view: SectionView) -> str:
+    spec = view.spec
+    if not spec.sms_label:
+        return ""
+    if spec.sms_first_item:
+        text = view.entries[0].content if view.entries else ""
+    else:
+        text = view.summary
+    if not text:
+        return ""
+    return TEXT["line"].render({"emoji": spec.emoji, "label": spec.sms_label, "text": text[:SMS_CHARS]}, _no_escape)
+
+
+def render_digest(digest: Dict) -> Dict:
+    """
+    Render every format of a digest in one pass over its sections.
+    Returns {"subject", "html", "text", "markdown": {section: markdown}}.
+    """
+    date = digest.get("date", "")
+    markdown = {}
+    html_sections = []
+    text_lines = [TEXT["header"].render({"date": date}, _no_escape)]
+
+    for spec in SECTIONS:
+        data = digest.get(spec.key) or {}
+        view = build_section(spec, section_records(spec, data), data.get("summary", ""))
+        markdown[spec.key] = render_section_markdown(spec, view, date)
+        if _has_html(view):
+            html_sections.append(_render_html_section(view))
+        text_lines.append(_render_text_line(view))
+
+    podcasts = (digest.get("podcasts") or {}).get("podcasts") or []
+    markdown["podcasts"] = render_podcasts_markdown(podcasts, date) if podcasts else ""
+
+    header = HTML["header"].render({"date": date}, _html_escape)
+    if not html_sections:
+        header += HTML["empty"].render({}, _html_escape)
+    header += HTML["rule"].render({}, _html_escape)
+    return {
+        "subject": TEXT["subject"].render({"date": date}, _no_escape),
+        "html": header + "".join(html_sections) + HTML["footer"].render({}, _html_escape),
+        "text": "".join(text_lines),
+        "markdown": markdown,
+    }
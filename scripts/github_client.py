@@ -0,0 +1,344 @@
+"""
+Rate-limit-aware GitHub API client.
+
+Tracks the REST (core), search and GraphQL budgets from the X-RateLimit-* response
+headers and adapts how many requests run at once: concurrency grows by one after
+each success and halves on a secondary rate limit, never exceeding what is left of
+the budget. When a budget is spent, requests wait until its reset instead of failing.
+
+With a ResponseCache, REST GETs are revalidated with If-None-Match (GitHub does not
+charge 304s against the rate limit). Entries not used for HTTP_CACHE_MAX_AGE_DAYS
+(e.g. searches for a date range that has moved on) are pruned when the cache opens.
+"""
+
+import os
+import sys
+import time
+import json
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, Optional
+
+import clients
+
+if TYPE_CHECKING:
+    import requests
+
+
+API_URL = "https://api.github.com"
+GRAPHQL_URL = f"{API_URL}/graphql"
+DEFAULT_MAX_CONCURRENCY = 8
+MAX_RETRIES = 4
+# Longest we are willing to sleep for a budget reset before giving up
+MAX_RESET_WAIT_SECONDS = 15 * 60
+# Requests kept in reserve per budget, so concurrent requests don't overdraw it
+BUDGET_RESERVE = 1
+DEFAULT_CACHE_PATH = os.path.join(".cache", "github_cache.db")
+HTTP_CACHE_MAX_AGE_DAYS = 14
+
+
+class GitHubAPIError(Exception):
+    """A GitHub API request that failed after retries."""
+
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def resource_for(url: str) -> str:
+    """Rate limit budget a URL draws from: core, search or graphql."""
+    if url.startswith(GRAPHQL_URL):
+        return "graphql"
+    if url.startswith(f"{API_URL}/search/"):
+        return "search"
+    return "core"
+
+
+def get_cache_path() -> str:
+    """Get GitHub response cache path from environment or default."""
+    return os.getenv("GITHUB_CACHE", DEFAULT_CACHE_PATH)
+
+
+class ResponseCache:
+    """
+    Persistent SQLite cache of GitHub responses.
+    http entries hold a REST response body with its ETag, and fetched_at is when it
+    was last fetched or revalidated; values hold immutable derived data such as
+    per-commit stats, which are kept for good.
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS http (
+        url TEXT PRIMARY KEY,
+        etag TEXT,
+        body TEXT NOT NULL,
+        fetched_at REAL NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS immutable_values (
+        key TEXT PRIMARY KEY,
+        value TEXT NOT NULL
+    );
+    """
+
+    def __init__(self, path: Optional[str] = None, max_age_days: float = HTTP_CACHE_MAX_AGE_DAYS):
+        path = path or get_cache_path()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.executescript(self.SCHEMA)
+        self._lock = threading.Lock()
+        self.prune_http(max_age_days)
+
+    def prune_http(self, max_age_days: float) -> int:
+        """Drop http entries not fetched or revalidated within max_age_days; returns how many."""
+        with self._lock, self.conn:
+            cursor = self.conn.execute("DELETE FROM http WHERE fetched_at < ?", (time.time() - max_age_days * 86400,))
+        if cursor.rowcount:
+            print(f"Pruned {cursor.rowcount} stale GitHub cache entries", file=sys.stderr)
+        return cursor.rowcount
+
+    def get_http(self, url: str) -> Optional[Dict]:
+        """Cached entry for a URL: {"etag", "body"}."""
+        with self._lock:
+            row = self.conn.execute("SELECT etag, body FROM http WHERE url = ?", (url,)).fetchone()
+        return {"etag": row[0], "body": row[1]} if row else None
+
+    def put_http(self, url: str, etag: Optional[str], body: str):
+        with self._lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO http (url, etag, body, fetched_at) VALUES (?, ?, ?, ?)",
+                (url, etag, body, time.time()),
+            )
+
+    def touch_http(self, url: str):
+        """Mark an entry as just revalidated (a 304), so pruning keeps it."""
+        with self._lock, self.conn:
+            self.conn.execute("UPDATE http SET fetched_at = ? WHERE url = ?", (time.time(), url))
+
+    def get_values(self, keys: List[str]) -> Dict[str, object]:
+        """Cached immutable values for the given keys (missing keys are left out)."""
+        found = {}
+        with self._lock:
+            for i in range(0, len(keys), 500):
+                chunk = keys[i:i + 500]
+                placeholders = ",".join("?" * len(chunk))
+                for key, value in self.conn.execute(
+                    f"SELECT key, value FROM immutable_values WHERE key IN ({placeholders})", chunk
+                ):
+                    found[key] = json.loads(value)
+        return found
+
+    def put_values(self, values: Dict[str, object]):
+        with self._lock, self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO immutable_values (key, value) VALUES (?, ?)",
+                [(key, json.dumps(value)) for key, value in values.items()],
+            )
+
+    def close(self):
+        self.conn.close()
+
+
+def cached_response(url: str, body: str) -> "requests.Response":
+    """A 200 response rebuilt from a cached body."""
+    import requests
+
+    response = requests.Response()
+    response.status_code = 200
+    response.url = url
+    response._content = body.encode("utf-8")
+    response.encoding = "utf-8"
+    response.headers["Content-Type"] = "application/json"
+    return response
+
+
+class GitHubClient:
+    """
+    Per-budget tracking and adaptive concurrency for GitHub requests. Requests go
+    through the calling thread's session (clients.http_session), with the auth
+    headers added per request.
+    """
+
+    def __init__(self, token: str, max_concurrency: int = DEFAULT_MAX_CONCURRENCY, cache: Optional[ResponseCache] = None):
+        self.cache = cache
+        self.headers = {
+            "Authorization": f"Bearer {token}",
+            "Accept": "application/vnd.github.v3+json",
+        }
+        self.max_concurrency = max(1, max_concurrency)
+        self.concurrency = max(1, self.max_concurrency // 2)
+        self.in_flight = 0
+        self.budgets: Dict[str, Dict] = {}
+        self.stats = {"requests": 0, "retries": 0, "waited_seconds": 0.0, "not_modified": 0}
+        self._condition = threading.Condition()
+
+    # ----- budgets -----
+
+    def _update_budget(self, resource: str, response: "requests.Response"):
+        headers = response.headers
+        if "X-RateLimit-Remaining" not in headers:
+            return
+        # GitHub names the budget that was charged; trust it over the URL guess
+        resource = headers.get("X-RateLimit-Resource", resource)
+        with self._condition:
+            self.budgets[resource] = {
+                "limit": int(headers.get("X-RateLimit-Limit", 0)),
+                "remaining": int(headers["X-RateLimit-Remaining"]),
+                "reset": int(headers.get("X-RateLimit-Reset", 0)),
+            }
+            self._condition.notify_all()
+
+    def _budget_wait(self, resource: str) -> float:
+        """Seconds to wait before spending from a budget (0 if there is room)."""
+        budget = self.budgets.get(resource)
+        if not budget or budget["remaining"] - self.in_flight > BUDGET_RESERVE:
+            return 0.0
+        return max(0.0, budget["reset"] - time.time()) + 1
+
+    def _sleep(self, seconds: float, reason: str):
+        if seconds > MAX_RESET_WAIT_SECONDS:
+            raise GitHubAPIError(f"{reason}: reset is {seconds:.0f}s away")
+        print(f"GitHub {reason}, waiting {seconds:.0f}s", file=sys.stderr)
+        self.stats["waited_seconds"] += seconds
+        time.sleep(seconds)
+
+    # ----- adaptive concurrency -----
+
+    def _acquire(self, resource: str):
+        while True:
+            with self._condition:
+                wait = self._budget_wait(resource)
+                if not wait and self.in_flight < self.concurrency:
+                    self.in_flight += 1
+                    return
+                if not wait:
+                    self._condition.wait()
+                    continue
+            self._sleep(wait, f"{resource} budget exhausted")
+            with self._condition:
+                # The budget has reset; let the next response headers tell us the new state
+                self.budgets.pop(resource, None)
+
+    def _release(self, ok: bool):
+        with self._condition:
+            self.in_flight -= 1
+            self.stats["requests"] += 1
+            if ok:
+                self.concurrency = min(self.max_concurrency, self.concurrency + 1)
+            self._condition.notify_all()
+
+    def _back_off(self):
+        with self._condition:
+            self.concurrency = max(1, self.concurrency // 2)
+
+    # ----- requests -----
+
+    def request(self, method: str, url: str, **kwargs) -> "requests.Response":
+        """
+        Send a request within the rate limits. Retries secondary rate limits
+        (403/429 with Retry-After or an exhausted budget) and 5xx responses;
+        raises GitHubAPIError for anything else that isn't a success.
+        """
+        import requests
+
+        resource = resource_for(url)
+        kwargs.setdefault("timeout", 30)
+        kwargs["headers"] = {**self.headers, **(kwargs.get("headers") or {})}
+
+        for attempt in range(1, MAX_RETRIES + 1):
+            self._acquire(resource)
+            ok = False
+            try:
+                response = clients.http_session().request(method, url, **kwargs)
+                self._update_budget(resource, response)
+                ok = response.status_code < 400 or response.status_code == 404
+            except requests.RequestException as e:
+                response = None
+                error = str(e)
+            finally:
+                self._release(ok)
+
+            if response is not None:
+                if ok:
+                    return response
+                error = f"{response.status_code} - {response.text[:200]}"
+                retry_after = response.headers.get("Retry-After")
+                exhausted = response.headers.get("X-RateLimit-Remaining") == "0"
+                if response.status_code in (403, 429) and (retry_after or exhausted):
+                    self._back_off()
+                    if retry_after:
+                        wait = float(retry_after)
+                    else:
+                        wait = max(0.0, int(response.headers.get("X-RateLimit-Reset", 0)) - time.time()) + 1
+                    if attempt < MAX_RETRIES:
+                        self.stats["retries"] += 1
+                        self._sleep(wait, f"rate limit ({response.status_code})")
+                        continue
+                elif response.status_code < 500:
+                    raise GitHubAPIError(f"{method} {url} failed: {error}", response.status_code)
+
+            if attempt < MAX_RETRIES:
+                self.stats["retries"] += 1
+                time.sleep(2 ** (attempt - 1))
+
+        raise GitHubAPIError(f"{method} {url} failed after {MAX_RETRIES} attempts: {error}",
+                             response.status_code if response is not None else None)
+
+    def get(self, url: str, **kwargs) -> "requests.Response":
+        """
+        GET a REST URL (absolute, or a path under the API root).
+        With a cache, responses are revalidated with their ETag; a 304 returns
+        the cached body.
+        """
+        if not url.startswith("http"):
+            url = f"{API_URL}/{url.lstrip('/')}"
+        if self.cache is None:
+            return self.request("GET", url, **kwargs)
+
+        entry = self.cache.get_http(url)
+        headers = dict(kwargs.pop("headers", None) or {})
+        if entry and entry["etag"]:
+            headers["If-None-Match"] = entry["etag"]
+        response = self.request("GET", url, headers=headers, **kwargs)
+
+        if response.status_code == 304 and entry:
+            self._count("not_modified")
+            self.cache.touch_http(url)
+            return cached_response(url, entry["body"])
+        if response.status_code == 200:
+            etag = response.headers.get("ETag")
+            if etag:
+                self.cache.put_http(url, etag, response.text)
+        return response
+
+    def _count(self, stat: str):
+        with self._condition:
+            self.stats[stat] += 1
+
+    def graphql(self, query: str, variables: Optional[Dict] = None, allow_partial: bool = False) -> Dict:
+        """
+        Run a GraphQL query and return its data.
+        Raises on GraphQL errors unless allow_partial, in which case errors are logged
+        and whatever data came back is returned.
+        """
+        response = self.request("POST", GRAPHQL_URL, json={"query": query, "variables": variables or {}})
+        payload = response.json()
+        if payload.get("errors"):
+            if not allow_partial or not payload.get("data"):
+                raise GitHubAPIError(f"GraphQL errors: {json.dumps(payload['errors'], indent=2)}")
+            print(f"GraphQL query returned {len(payload['errors'])} error(s), using partial data", file=sys.stderr)
+        return payload.get("data") or {}
+
+    def map(self, fn: Callable, items: Iterable) -> List:
+        """Apply fn to items concurrently; the adaptive limit decides how many requests are in flight."""
+        items = list(items)
+        if not items:
+            return []
+        with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(items))) as executor:
+            return list(executor.map(fn, items))
+
+    def summary(self) -> Dict:
+        """Requests made, retries, time spent waiting and the last known budgets."""
+        return {**self.stats, "concurrency": self.concurrency, "budgets": dict(self.budgets)}
@@ -8,8 +8,15 @@ import os
 import sys
 import json
 from datetime import datetime, timedelta, timezone
-import requests
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
+
+from github_client import GitHubClient, GitHubAPIError, ResponseCache
+
+
+# Commits looked up per GraphQL query
+COMMIT_BATCH_SIZE = 50
+DEFAULT_LEDGER_PATH = os.path.join("logs", "stats-ledger.json")
+# Backfill searches are split into windows so none hits the 1000-result search cap
 
 
 def get_github_token() -> str:
@@ -53,7 +60,7 @@ def get_username() -> str:
     return os.getenv("GITHUB_USERNAME", "ftchvs")
 
 
-def query_contributions(token: str, username: str, since: str) -> Dict:
+def query_contributions(client: GitHubClient, username: str, since: str) -> Dict:
     """Query GitHub GraphQL API for contribution statistics."""
     query = """
     query($username: String!, $since: DateTime!) {
@@ -71,50 +78,20 @@ def query_contributions(token: str, username: str, since: str) -> Dict:
     }
     """
     
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Content-Type": "application/json",
-    }
-    
-    variables = {
-        "username": username,
-        "since": since,
-    }
-    
-    response = requests.post(
-        "https://api.github.com/graphql",
-        json={"query": query, "variables": variables},
-        headers=headers,
-        timeout=30,
-    )
-    
-    if response.status_code != 200:
-        raise Exception(f"GraphQL query failed: {response.status_code} - {response.text}")
-    
-    data = response.json()
-    if "errors" in data:
-        raise Exception(f"GraphQL errors: {json.dumps(data['errors'], indent=2)}")
-    
-    return data.get("data", {})
+    return client.graphql(query, {"username": username, "since": since})
 
 
-def query_recent_commits(token: str, username: str, since: str) -> List[Dict]:
-    """Query recent commits via REST API."""
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Accept": "application/vnd.github.v3+json",
-    }
-    
+def query_recent_commits(client: GitHubClient, username: str, since: str, until: Optional[str] = None) -> List[Dict]:
+    """Query commits authored since a date (YYYY-MM-DD), optionally up to `until` inclusive, via REST search."""
+    date_filter = f"{since}..{until}" if until else f">={since}"
     commits = []
     page = 1
     per_page = 100
     
     while True:
-        url = f"https://api.github.com/search/commits?q=author:{username}+author-date:>={since}&per_page={per_page}&page={page}"
-        response = requests.get(url, headers=headers, timeout=30)
-        
-        if response.status_code != 200:
-            break
+        url = f"https://api.github.com/search/commits?q=author:{username}+author-date:{date_filter}&per_page={per_page}&page={page}"
+        # Failures raise: a silently short result would be recorded in the ledger for good
+        response = client.get(url)
         
         data = response.json()
         items = data.get("items", [])
@@ -130,98 +107,139 @@ def query_recent_commits(token: str, username: str, since: str) -> List[Dict]:
     return commits
 
 
-def query_recent_prs(token: str, username: str, since: str) -> Dict:
-    """Query comprehensive PR stats: created, contributed, reviewed, and managed."""
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Accept": "application/vnd.github.v3+json",
+PR_STATS_QUERY = """
+query($username: String!, $from: DateTime!, $to: DateTime!, $committerQuery: String!,
+      $createdCursor: String, $reviewedCursor: String, $contributedCursor: String,
+      $withCreated: Boolean!, $withReviewed: Boolean!, $withContributed: Boolean!) {
+  user(login: $username) {
+    contributionsCollection(from: $from, to: $to) {
+      pullRequestContributions(first: 100, after: $createdCursor) @include(if: $withCreated) {
+        pageInfo { hasNextPage endCursor }
+        nodes { pullRequest { ...PullRequestState } }
+      }
+      pullRequestReviewContributions(first: 100, after: $reviewedCursor) @include(if: $withReviewed) {
+        pageInfo { hasNextPage endCursor }
+        nodes { pullRequest { ...PullRequestState } }
+      }
     }
-    
-    # Search for PRs created by user
-    created_prs = []
-    page = 1
-    while True:
-        url = f"https://api.github.com/search/issues?q=author:{username}+type:pr+created:>={since}&per_page=100&page={page}"
-        response = requests.get(url, headers=headers, timeout=30)
-        if response.status_code == 200:
-            data = response.json()
-            items = data.get("items", [])
-            if not items:
-                break
-            created_prs.extend(items)
-            if len(items) < 100:
-                break
-            page += 1
-    
-    # Search for PRs where user contributed (as committer, not just author)
-    contributed_prs = []
-    page = 1
-    while True:
-        url = f"https://api.github.com/search/issues?q=committer:{username}+type:pr+created:>={since}&per_page=100&page={page}"
-        response = requests.get(url, headers=headers, timeout=30)
-        if response.status_code == 200:
-            data = response.json()
-            items = data.get("items", [])
-            if not items:
-                break
-            contributed_prs.extend(items)
-            if len(items) < 100:
-                break
-            page += 1
-    
-    # Search for PRs reviewed by user
-    reviewed_prs = []
-    page = 1
-    while True:
-        url = f"https://api.github.com/search/issues?q=reviewed-by:{username}+type:pr+created:>={since}&per_page=100&page={page}"
-        response = requests.get(url, headers=headers, timeout=30)
-        if response.status_code == 200:
-            data = response.json()
-            items = data.get("items", [])
-            if not items:
-                break
-            reviewed_prs.extend(items)
-            if len(items) < 100:
-                break
-            page += 1
-    
-    # Count created PRs by state
-    created_open = len([pr for pr in created_prs if pr.get("state") == "open"])
-    created_merged = len([pr for pr in created_prs if pr.get("state") == "closed" and pr.get("pull_request", {}).get("merged_at")])
-    created_closed = len([pr for pr in created_prs if pr.get("state") == "closed"]) - created_merged
-    
-    # Get unique contributed PRs (excluding those already in created)
-    created_pr_ids = {pr.get("number") for pr in created_prs}
-    unique_contributed = [pr for pr in contributed_prs if pr.get("number") not in created_pr_ids]
-    contributed_merged = len([pr for pr in unique_contributed if pr.get("state") == "closed" and pr.get("pull_request", {}).get("merged_at")])
-    
-    # Count reviewed PRs
-    reviewed_merged = len([pr for pr in reviewed_prs if pr.get("state") == "closed" and pr.get("pull_request", {}).get("merged_at")])
-    
+  }
+  contributed: search(query: $committerQuery, type: ISSUE, first: 100, after: $contributedCursor) @include(if: $withContributed) {
+    pageInfo { hasNextPage endCursor }
+    nodes { ...PullRequestState }
+  }
+}
+
+fragment PullRequestState on PullRequest {
+  id
+  number
+  state
+  createdAt
+  repository { nameWithOwner }
+}
+"""
+
+PR_REFRESH_QUERY = """
+query($ids: [ID!]!) {
+  nodes(ids: $ids) {
+    ...PullRequestState
+  }
+}
+
+fragment PullRequestState on PullRequest {
+  id
+  number
+  state
+  createdAt
+  repository { nameWithOwner }
+}
+"""
+
+# Upper bound on pages per connection, so a misbehaving cursor can never loop forever
+MAX_PR_PAGES = 50
+
+
+def pr_record(node: Optional[Dict]) -> Optional[Dict]:
+    """Normalize a GraphQL PullRequest node: {"key", "id", "state", "created"}."""
+    if not node or not node.get("id"):
+        return None
     return {
-        "created": len(created_prs),
-        "created_open": created_open,
-        "created_merged": created_merged,
-        "created_closed": created_closed,
-        "contributed": len(unique_contributed),
-        "contributed_merged": contributed_merged,
-        "reviewed": len(reviewed_prs),
-        "reviewed_merged": reviewed_merged,
-        "total": len(created_prs) + len(unique_contributed) + len(reviewed_prs),
+        "key": f"{node['repository']['nameWithOwner']}#{node['number']}",
+        "id": node["id"],
+        "state": node["state"].lower(),
+        "created": node["createdAt"][:10],
     }
 
 
-def calculate_line_changes(token: str, commits: List[Dict]) -> Dict:
-    """Calculate total additions and deletions from commit details."""
-    total_additions = 0
-    total_deletions = 0
-    
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Accept": "application/vnd.github.v3+json",
+def query_recent_prs(client: GitHubClient, username: str, since: str, until: str) -> Dict[str, List[Dict]]:
+    """
+    Collect PRs the user created, reviewed or contributed to (as committer) between two
+    ISO timestamps in one paginated GraphQL query. Created and reviewed come from
+    contributionsCollection; contributed comes from a committer search. Every
+    connection is paged with its own cursor and dropped from the query once exhausted.
+    Returns normalized PR records by kind.
+    """
+    connections = {
+        "created": lambda data: data["user"]["contributionsCollection"]["pullRequestContributions"],
+        "reviewed": lambda data: data["user"]["contributionsCollection"]["pullRequestReviewContributions"],
+        "contributed": lambda data: data["contributed"],
     }
+    cursors: Dict[str, Optional[str]] = {kind: None for kind in connections}
+    active = set(connections)
+    results: Dict[str, List[Dict]] = {kind: [] for kind in connections}
+    
+    for page in range(1, MAX_PR_PAGES + 1):
+        data = client.graphql(PR_STATS_QUERY, {
+            "username": username,
+            "from": since,
+            "to": until,
+            "committerQuery": f"committer:{username} type:pr updated:>={since[:10]}",
+            "createdCursor": cursors["created"],
+            "reviewedCursor": cursors["reviewed"],
+            "contributedCursor": cursors["contributed"],
+            "withCreated": "created" in active,
+            "withReviewed": "reviewed" in active,
+            "withContributed": "contributed" in active,
+        })
+        if not data.get("user"):
+            raise Exception(f"GitHub user {username} not found")
+        
+        for kind in sorted(active):
+            connection = connections[kind](data) or {}
+            for node in connection.get("nodes") or []:
+                # Contribution nodes wrap the PR; search nodes are the PR itself
+                record = pr_record(node.get("pullRequest", node) if node else None)
+                if record:
+                    results[kind].append(record)
+            page_info = connection.get("pageInfo") or {}
+            # A cursor that doesn't advance would repeat the same page forever
+            if page_info.get("hasNextPage") and page_info.get("endCursor") not in (None, cursors[kind]):
+                cursors[kind] = page_info["endCursor"]
+            else:
+                active.discard(kind)
+        
+        if not active:
+            break
+    else:
+        print(f"Warning: PR stats stopped after {MAX_PR_PAGES} pages", file=sys.stderr)
     
-    for commit in commits[:50]:  # Limit to first 50 commits to avoid rate limits
+    print(f"PR stats: {', '.join(f'{len(records)} {kind}' for kind, records in results.items())} in {page} GraphQL queries", file=sys.stderr)
+    return results
+
+
+def refresh_pr_states(client: GitHubClient, ids: List[str]) -> List[Dict]:
+    """Current state of PRs by node ID (100 per query), e.g. open PRs from earlier days."""
+    records = []
+    for i in range(0, len(ids), 100):
+        data = client.graphql(PR_REFRESH_QUERY, {"ids": ids[i:i + 100]})
+        records.extend(record for record in map(pr_record, data.get("nodes") or []) if record)
+    return records
+
+
+def commit_refs(commits: List[Dict]) -> List[Tuple[str, str, str]]:
+    """Unique (owner, repo, sha) references of search results, in order."""
+    refs = []
+    seen = set()
+    for commit in commits:
         sha = commit.get("sha")
         repo_url = commit.get("repository", {}).get("url", "")
         if not sha or not repo_url:
@@ -232,23 +250,258 @@ def calculate_line_changes(token: str, commits: List[Dict]) -> Dict:
         if len(parts) < 2:
             continue
         
-        owner, repo = parts[0], parts[1]
-        url = f"https://api.github.com/repos/{owner}/{repo}/commits/{sha}"
-        
+        ref = (parts[0], parts[1], sha)
+        if ref not in seen:
+            seen.add(ref)
+            refs.append(ref)
+    return refs
+
+
+def build_commit_stats_query(refs: List[Tuple[str, str, str]]) -> Tuple[str, Dict[str, str]]:
+    """
+    Build one GraphQL query looking up many commits with aliased object(oid:) fields,
+    grouped by repository. Returns the query and a map of alias path ("rN.cM") to SHA.
+    """
+    by_repo: Dict[Tuple[str, str], List[str]] = {}
+    for owner, repo, sha in refs:
+        by_repo.setdefault((owner, repo), []).append(sha)
+    
+    fields = []
+    aliases = {}
+    for i, ((owner, repo), shas) in enumerate(by_repo.items()):
+        objects = []
+        for j, sha in enumerate(shas):
+            objects.append(f"c{j}: object(oid: {json.dumps(sha)}) {{ ... on Commit {{ additions deletions }} }}")
+            aliases[f"r{i}.c{j}"] = sha
+        fields.append(f"r{i}: repository(owner: {json.dumps(owner)}, name: {json.dumps(repo)}) {{ {' '.join(objects)} }}")
+    
+    return "query {\n  " + "\n  ".join(fields) + "\n}", aliases
+
+
+def fetch_commit_stats_batch(client: GitHubClient, refs: List[Tuple[str, str, str]]) -> Dict[str, Tuple[int, int]]:
+    """Fetch additions/deletions for a batch of commits in one GraphQL call. Returns {sha: (additions, deletions)}."""
+    query, aliases = build_commit_stats_query(refs)
+    # Partial results are still usable (e.g. one repository no longer accessible)
+    repositories = client.graphql(query, allow_partial=True)
+    
+    stats = {}
+    for alias, sha in aliases.items():
+        repo_alias, object_alias = alias.split(".")
+        commit = (repositories.get(repo_alias) or {}).get(object_alias)
+        if commit and "additions" in commit:
+            stats[sha] = (commit["additions"], commit["deletions"])
+    return stats
+
+
+def fetch_commit_stats(client: GitHubClient, commits: List[Dict]) -> Dict[str, Tuple[int, int]]:
+    """
+    Fetch additions and deletions for every commit: {sha: (additions, deletions)}.
+    Commits are looked up in batches of COMMIT_BATCH_SIZE per GraphQL query; the
+    client decides how many queries are in flight.
+    """
+    refs = commit_refs(commits)
+    
+    # Stats of a commit never change, so cached ones are never queried again
+    stats: Dict[str, Tuple[int, int]] = {}
+    if client.cache is not None and refs:
+        cached = client.cache.get_values([f"commit-stats:{sha}" for _, _, sha in refs])
+        stats = {key.split(":", 1)[1]: tuple(value) for key, value in cached.items()}
+        refs = [ref for ref in refs if ref[2] not in stats]
+    cached_count = len(stats)
+    
+    batches = [refs[i:i + COMMIT_BATCH_SIZE] for i in range(0, len(refs), COMMIT_BATCH_SIZE)]
+    
+    def fetch(batch: List[Tuple[str, str, str]]) -> Dict[str, Tuple[int, int]]:
         try:
-            response = requests.get(url, headers=headers, timeout=10)
-            if response.status_code == 200:
-                commit_data = response.json()
-                stats = commit_data.get("stats", {})
-                total_additions += stats.get("additions", 0)
-                total_deletions += stats.get("deletions", 0)
-        except Exception:
-            continue  # Skip on error
+            return fetch_commit_stats_batch(client, batch)
+        except GitHubAPIError as e:
+            print(f"Warning: {e}", file=sys.stderr)  # Skip the batch on error
+            return {}
+    
+    fetched: Dict[str, Tuple[int, int]] = {}
+    for batch_stats in client.map(fetch, batches):
+        fetched.update(batch_stats)
+    if client.cache is not None and fetched:
+        client.cache.put_values({f"commit-stats:{sha}": list(value) for sha, value in fetched.items()})
+    stats.update(fetched)
+    
+    print(f"Line changes from {len(stats)}/{cached_count + len(refs)} commits ({cached_count} cached, {len(batches)} GraphQL queries)", file=sys.stderr)
+    return stats
+
+
+def calculate_line_changes(client: GitHubClient, commits: List[Dict]) -> Dict:
+    """Calculate total additions and deletions over all commits."""
+    stats = fetch_commit_stats(client, commits)
+    total_additions = sum(additions for additions, _ in stats.values())
+    total_deletions = sum(deletions for _, deletions in stats.values())
     
     return {
         "additions": total_additions,
         "deletions": total_deletions,
         "net": total_additions - total_deletions,
+        "commits": len(stats),
+    }
+
+
+# ============ STATS LEDGER ============
+#
+# logs/stats-ledger.json keeps per-day commit and line deltas plus one record per PR
+# for the current year. Each run only queries activity since the last checkpoint and
+# YTD totals are derived from the ledger, so API calls stay flat all year.
+
+def get_ledger_path() -> str:
+    """Get stats ledger path from environment or default."""
+    return os.getenv("STATS_LEDGER", DEFAULT_LEDGER_PATH)
+
+
+def empty_ledger(year: int, username: str) -> Dict:
+    """A ledger with nothing recorded; the first run backfills from January 1."""
+    return {"year": year, "username": username, "checkpoint": None, "days": {}, "prs": {}}
+
+
+def load_ledger(path: str, year: int, username: str) -> Dict:
+    """Load the ledger, starting over for a new year or a different user."""
+    if not os.path.exists(path):
+        return empty_ledger(year, username)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            ledger = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"Warning: Could not read stats ledger {path}, starting over: {e}", file=sys.stderr)
+        return empty_ledger(year, username)
+    if ledger.get("year") != year or ledger.get("username") != username:
+        return empty_ledger(year, username)
+    return ledger
+
+
+def save_ledger(path: str, ledger: Dict):
+    """Write the ledger atomically."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(ledger, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def date_windows(since: str, until: str) -> List[Tuple[str, str]]:
+    """
+    Split [since, until] (YYYY-MM-DD, inclusive) into search windows with fixed
+    bounds: whole calendar months where the range covers them (a backfill; at most
+    31 days, so a query stays under the search API's 1000-result cap) and single
+    days otherwise. A daily run searches the checkpoint day and today, windows it
+    already searched yesterday or will search again tomorrow, so the cached
+    responses are revalidated with their ETags instead of written once per run.
+    """
+    day = datetime.strptime(since, "%Y-%m-%d").date()
+    end = datetime.strptime(until, "%Y-%m-%d").date()
+    windows = []
+    while day <= end:
+        next_month = (day.replace(day=28) + timedelta(days=4)).replace(day=1)
+        month_end = next_month - timedelta(days=1)
+        if day.day == 1 and month_end <= end:
+            windows.append((day.isoformat(), month_end.isoformat()))
+            day = next_month
+        else:
+            windows.append((day.isoformat(), day.isoformat()))
+            day += timedelta(days=1)
+    return windows
+
+
+def commit_day(commit: Dict) -> str:
+    """UTC author date (YYYY-MM-DD) of a commit search item."""
+    authored = commit.get("commit", {}).get("author", {}).get("date", "")
+    try:
+        return datetime.fromisoformat(authored.replace("Z", "+00:00")).astimezone(timezone.utc).strftime("%Y-%m-%d")
+    except ValueError:
+        return authored[:10]
+
+
+def update_commit_days(ledger: Dict, client: GitHubClient, username: str, since: str, until: str):
+    """
+    Recompute the ledger days from `since` (the last checkpoint, which may have been
+    a partial day) through `until` from a fresh commit search.
+    """
+    commits = []
+    for window_start, window_end in date_windows(since, until):
+        commits.extend(query_recent_commits(client, username, window_start, window_end))
+    line_stats = fetch_commit_stats(client, commits)
+    
+    days = {day: entry for day, entry in ledger["days"].items() if day < since}
+    seen = set()
+    for commit in commits:
+        sha = commit.get("sha")
+        day = commit_day(commit)
+        if not sha or sha in seen or not (since <= day <= until):
+            continue
+        seen.add(sha)
+        entry = days.setdefault(day, {"commits": 0, "additions": 0, "deletions": 0})
+        additions, deletions = line_stats.get(sha, (0, 0))
+        entry["commits"] += 1
+        entry["additions"] += additions
+        entry["deletions"] += deletions
+    ledger["days"] = days
+
+
+def update_pr_records(ledger: Dict, prs_by_kind: Dict[str, List[Dict]], year: int):
+    """Upsert this year's PRs into the ledger with their current state."""
+    records = ledger["prs"]
+    for kind, prs in prs_by_kind.items():
+        for pr in prs:
+            if not pr["created"].startswith(str(year)):
+                continue
+            record = records.setdefault(pr["key"], {"created": pr["created"], "kinds": []})
+            record["id"] = pr["id"]
+            record["state"] = pr["state"]
+            if kind not in record["kinds"]:
+                record["kinds"] = sorted(record["kinds"] + [kind])
+
+
+def refresh_open_prs(ledger: Dict, client: GitHubClient):
+    """Re-check PRs the ledger still has as open, since they may have merged or closed since."""
+    ids = [record["id"] for record in ledger["prs"].values() if record.get("state") == "open" and record.get("id")]
+    if not ids:
+        return
+    by_key = {record["key"]: record for record in refresh_pr_states(client, ids)}
+    for key, record in ledger["prs"].items():
+        if key in by_key:
+            record["state"] = by_key[key]["state"]
+
+
+def pr_stats_from_ledger(ledger: Dict) -> Dict:
+    """Created/contributed/reviewed PR counts (YTD) from the ledger's PR records."""
+    records = list(ledger["prs"].values())
+    created = [record for record in records if "created" in record["kinds"]]
+    # Contributed excludes PRs the user also created
+    contributed = [record for record in records if "contributed" in record["kinds"] and "created" not in record["kinds"]]
+    reviewed = [record for record in records if "reviewed" in record["kinds"]]
+    
+    def count(group: List[Dict], state: str) -> int:
+        return sum(1 for record in group if record["state"] == state)
+    
+    return {
+        "created": len(created),
+        "created_open": count(created, "open"),
+        "created_merged": count(created, "merged"),
+        "created_closed": count(created, "closed"),
+        "contributed": len(contributed),
+        "contributed_merged": count(contributed, "merged"),
+        "reviewed": len(reviewed),
+        "reviewed_merged": count(reviewed, "merged"),
+        "total": len(created) + len(contributed) + len(reviewed),
+    }
+
+
+def line_stats_from_ledger(ledger: Dict) -> Dict:
+    """YTD additions/deletions summed over the ledger days."""
+    additions = sum(entry["additions"] for entry in ledger["days"].values())
+    deletions = sum(entry["deletions"] for entry in ledger["days"].values())
+    return {
+        "additions": additions,
+        "deletions": deletions,
+        "net": additions - deletions,
+        "commits": sum(entry["commits"] for entry in ledger["days"].values()),
     }
 
 
@@ -288,61 +541,79 @@ def save_log(log_content: str, date: str, logs_dir: str = "logs") -> str:
     return log_file
 
 
+def collect_stats() -> Dict:
+    """
+    Update the ledger, save today's log and return the stats output
+    ({"date", "markdown", "stats"}). Raises on failure.
+    """
+    client = GitHubClient(
+        get_github_token(),
+        int(os.getenv("GITHUB_MAX_CONCURRENCY", "8")),
+        cache=ResponseCache(),
+    )
+    username = get_username()
+    
+    # Calculate timestamp for Year-To-Date (January 1st of current year)
+    now = datetime.now(timezone.utc)
+    current_year = now.year
+    ytd_start = datetime(current_year, 1, 1, 0, 0, 0, tzinfo=timezone.utc)
+    since_iso = ytd_start.isoformat()
+    
+    date_str = now.strftime("%Y-%m-%d")
+    
+    print(f"Fetching GitHub YTD stats for {username} since {since_iso}...", file=sys.stderr)
+    
+    # Fetch contributions via GraphQL
+    contributions_data = query_contributions(client, username, since_iso)
+    contributions = contributions_data.get("user", {}).get("contributionsCollection", {})
+    
+    # Query only what happened since the last checkpoint; the checkpoint day itself
+    # may have been partial, so it is recomputed
+    ledger_path = get_ledger_path()
+    ledger = load_ledger(ledger_path, current_year, username)
+    checkpoint = ledger["checkpoint"] or ytd_start.strftime("%Y-%m-%d")
+    print(f"Updating stats ledger from {checkpoint}...", file=sys.stderr)
+    
+    update_commit_days(ledger, client, username, checkpoint, date_str)
+    refresh_open_prs(ledger, client)
+    update_pr_records(ledger, query_recent_prs(client, username, f"{checkpoint}T00:00:00Z", now.strftime("%Y-%m-%dT%H:%M:%SZ")), current_year)
+    ledger["checkpoint"] = date_str
+    save_ledger(ledger_path, ledger)
+    
+    # YTD totals come from the ledger
+    prs = pr_stats_from_ledger(ledger)
+    lines = line_stats_from_ledger(ledger)
+    
+    # Compile stats
+    stats = {
+        "date": date_str,
+        "commits": {
+            "total": contributions.get("totalCommitContributions", lines["commits"]),
+        },
+        "prs": prs,
+        "lines": lines,
+    }
+    
+    # Format as markdown
+    markdown = format_stats_markdown(stats, date_str)
+    
+    # Save log
+    log_file = save_log(markdown, date_str)
+    print(f"Log saved to {log_file}", file=sys.stderr)
+    print(f"GitHub API usage: {json.dumps(client.summary())}", file=sys.stderr)
+    
+    return {
+        "date": date_str,
+        "markdown": markdown,
+        "stats": stats,
+    }
+
+
 def main():
     """Main execution function."""
     try:
-        token = get_github_token()
-        username = get_username()
-        
-        # Calculate timestamp for Year-To-Date (January 1st of current year)
-        now = datetime.now(timezone.utc)
-        current_year = now.year
-        ytd_start = datetime(current_year, 1, 1, 0, 0, 0, tzinfo=timezone.utc)
-        since_iso = ytd_start.isoformat()
-        
-        date_str = now.strftime("%Y-%m-%d")
-        
-        print(f"Fetching GitHub YTD stats for {username} since {since_iso}...", file=sys.stderr)
-        
-        # Fetch contributions via GraphQL
-        contributions_data = query_contributions(token, username, since_iso)
-        contributions = contributions_data.get("user", {}).get("contributionsCollection", {})
-        
-        # Fetch commits via REST (use YYYY-MM-DD format)
-        commits = query_recent_commits(token, username, since_iso.split("T")[0])
-        
-        # Fetch PRs (use YYYY-MM-DD format)
-        prs = query_recent_prs(token, username, since_iso.split("T")[0])
-        
-        # Calculate line changes
-        lines = calculate_line_changes(token, commits)
-        
-        # Compile stats
-        stats = {
-            "date": date_str,
-            "commits": {
-                "total": contributions.get("totalCommitContributions", len(commits)),
-            },
-            "prs": prs,
-            "lines": lines,
-        }
-        
-        # Format as markdown
-        markdown = format_stats_markdown(stats, date_str)
-        
-        # Save log
-        log_file = save_log(markdown, date_str)
-        
-        # Output JSON for other scripts to consume (to stdout only)
-        output = {
-            "date": date_str,
-            "markdown": markdown,
-            "stats": stats,
-        }
-        
-        # Print status to stderr, JSON to stdout
-        print(f"Log saved to {log_file}", file=sys.stderr)
-        print(json.dumps(output))
+        # Print status to stderr, JSON for other scripts to consume to stdout
+        print(json.dumps(collect_stats()))
         
     except Exception as e:
         print(f"Error: {e}", file=sys.stderr)
@@ -351,4 +622,3 @@ def main():
 
 if __name__ == "__main__":
     main()
-
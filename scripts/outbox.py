@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Persistent notification outbox (SQLite).
+
+Every message is keyed by an idempotency key derived from (date, channel, recipient),
+so re-running the workflow never sends the same digest twice. Failed messages stay
+pending with exponential backoff and are retried on later runs (or flushed with
+`python3 scripts/send_notification.py drain`).
+"""
+
+import os
+import json
+import sqlite3
+import hashlib
+from datetime import datetime, timedelta, timezone
+from typing import List, Dict, Optional, Tuple
+
+
+DEFAULT_OUTBOX_PATH = os.path.join(".cache", "notification_outbox.db")
+MAX_ATTEMPTS = 6
+BACKOFF_BASE_MINUTES = 5
+BACKOFF_MAX_HOURS = 24
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS payloads (
+    id TEXT PRIMARY KEY,
+    subject TEXT NOT NULL,
+    html TEXT NOT NULL,
+    text TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS messages (
+    idempotency_key TEXT PRIMARY KEY,
+    date TEXT NOT NULL,
+    channel TEXT NOT NULL,
+    recipient TEXT NOT NULL,
+    payload_id TEXT NOT NULL REFERENCES payloads(id),
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at TEXT NOT NULL,
+    last_error TEXT,
+    created_at TEXT NOT NULL,
+    sent_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_messages_due ON messages(status, next_attempt_at);
+"""
+
+
+def get_outbox_path() -> str:
+    """Get outbox database path from environment or default."""
+    return os.getenv("NOTIFY_OUTBOX", DEFAULT_OUTBOX_PATH)
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _iso(moment: datetime) -> str:
+    return moment.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def connect(db_path: Optional[str] = None) -> sqlite3.Connection:
+    """Open (and create if needed) the outbox database."""
+    db_path = db_path or get_outbox_path()
+    db_dir = os.path.dirname(db_path)
+    if db_dir:
+        os.makedirs(db_dir, exist_ok=True)
+
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def idempotency_key(date: str, channel: str, recipient: str) -> str:
+    """Stable key for one digest delivery to one recipient on one channel."""
+    return hashlib.sha256(f"{date}|{channel}|{recipient.lower()}".encode("utf-8")).hexdigest()
+
+
+def enqueue(
+    conn: sqlite3.Connection,
+    date: str,
+    subject: str,
+    html: str,
+    text: str,
+    deliveries: List[Tuple[str, str]],
+) -> int:
+    """
+    Queue (channel, recipient) deliveries of one digest.
+    Deliveries already in the outbox (sent or pending) are left untouched.
+    Returns the number of newly queued messages.
+    """
+    payload_id = hashlib.sha256(json.dumps([subject, html, text]).encode("utf-8")).hexdigest()
+    now = _iso(_now())
+    with conn:
+        conn.execute(
+            "INSERT OR IGNORE INTO payloads (id, subject, html, text) VALUES (?, ?, ?, ?)",
+            (payload_id, subject, html, text),
+        )
+        before = conn.total_changes
+        conn.executemany(
+            """INSERT OR IGNORE INTO messages
+               (idempotency_key, date, channel, recipient, payload_id, next_attempt_at, created_at)
+               VALUES (?, ?, ?, ?, ?, ?, ?)""",
+            [
+                (idempotency_key(date, channel, recipient), date, channel, recipient, payload_id, now, now)
+                for channel, recipient in deliveries
+            ],
+        )
+        return conn.total_changes - before
+
+
+def due_messages(conn: sqlite3.Connection, ignore_backoff: bool = False) -> List[Dict]:
+    """Pending messages whose next attempt is due (all pending ones when ignore_backoff)."""
+    sql = """SELECT m.idempotency_key, m.date, m.channel, m.recipient, m.attempts,
+                    p.subject, p.html, p.text
+             FROM messages m JOIN payloads p ON p.id = m.payload_id
+             WHERE m.status = 'pending'"""
+    params: List = []
+    if not ignore_backoff:
+        sql += " AND m.next_attempt_at <= ?"
+        params.append(_iso(_now()))
+    sql += " ORDER BY m.date, m.channel, m.created_at"
+    return [dict(row) for row in conn.execute(sql, params)]
+
+
+def mark_sent(conn: sqlite3.Connection, keys: List[str]):
+    """Record successful deliveries."""
+    now = _iso(_now())
+    with conn:
+        conn.executemany(
+            "UPDATE messages SET status = 'sent', attempts = attempts + 1, sent_at = ?, last_error = NULL WHERE idempotency_key = ?",
+            [(now, key) for key in keys],
+        )
+
+
+def backoff_delay(attempts: int) -> timedelta:
+    """Exponential backoff after the given number of failed attempts."""
+    minutes = BACKOFF_BASE_MINUTES * (2 ** max(attempts - 1, 0))
+    return min(timedelta(minutes=minutes), timedelta(hours=BACKOFF_MAX_HOURS))
+
+
+def mark_failed(conn: sqlite3.Connection, failures: List[Tuple[str, int, str]]):
+    """
+    Record failed deliveries as (key, previous_attempts, error).
+    Messages are rescheduled with exponential backoff, or marked dead after MAX_ATTEMPTS.
+    """
+    now = _now()
+    with conn:
+        for key, previous_attempts, error in failures:
+            attempts = previous_attempts + 1
+            status = "dead" if attempts >= MAX_ATTEMPTS else "pending"
+            conn.execute(
+                """UPDATE messages SET status = ?, attempts = ?, next_attempt_at = ?, last_error = ?
+                   WHERE idempotency_key = ?""",
+                (status, attempts, _iso(now + backoff_delay(attempts)), error, key),
+            )
+
+
+def status_counts(conn: sqlite3.Connection) -> Dict[str, int]:
+    """Number of messages per status."""
+    return {row["status"]: row["count"] for row in conn.execute("SELECT status, COUNT(*) AS count FROM messages GROUP BY status")}
@@ -0,0 +1,417 @@
+#!/usr/bin/env python3
+"""
+Incremental weekly and monthly rollups of the daily digests.
+
+Each daily run folds that day's digest into small aggregate files
+(archive/rollups/weekly/YYYY-Www.json, archive/rollups/monthly/YYYY-MM.json)
+instead of re-reading the whole archive. The files keep the top STORY_LIMIT
+stories and THEME_LIMIT themes. Each day's contribution (story ids with points,
+theme terms, source counts) is replay data kept in .cache/rollups/, so
+re-running a day replaces its counts instead of adding them twice; when the
+cache is cold, the period is replayed from the archive. Longer rollups (e.g. a
+year) merge the monthly aggregates.
+
+Usage:
+    python3 scripts/rollups.py rebuild [archive_dir]
+    python3 scripts/rollups.py show 2025-W47 | 2025-11 | 2025
+"""
+
+import os
+import re
+import sys
+import html
+import json
+import glob
+import hashlib
+import argparse
+from collections import Counter
+from datetime import datetime
+from typing import Callable, Dict, Iterator, List, Optional
+
+import archive_format
+
+
+ROLLUP_DIR = os.path.join("archive", "rollups")
+# Per-day contributions are derived from the archive, so they live in the Actions cache
+CONTRIBUTIONS_DIR = os.path.join(".cache", "rollups")
+NEWS_SECTIONS = ["ai_news", "business_news", "tech_news"]
+# Stories (ranked by days seen, then points) and themes kept in an aggregate file
+STORY_LIMIT = 50
+THEME_LIMIT = 100
+
+STOPWORDS = {
+    "the", "and", "for", "with", "from", "that", "this", "are", "was", "were", "has", "have",
+    "had", "but", "not", "you", "your", "its", "it's", "into", "over", "after", "about", "will",
+    "what", "when", "how", "why", "who", "new", "says", "say", "can", "more", "than", "out",
+    "all", "just", "now", "our", "they", "their", "his", "her", "she", "him", "get", "got",
+    "amid", "back", "first", "one", "two", "year", "years", "day", "week", "show", "via",
+    "here", "there", "been", "being", "does", "did", "could", "would", "should", "may", "off",
+    "some", "any", "most", "make", "made", "like", "also", "still", "up", "down", "vs",
+}
+
+
+def extract_terms(text: str) -> List[str]:
+    """Lowercase word terms of a headline, without stopwords or very short tokens."""
+    return [
+        term for term in re.findall(r"[a-z][a-z0-9+#-]*[a-z0-9+#]", html.unescape(text).lower())
+        if len(term) >= 3 and term not in STOPWORDS
+    ]
+
+
+def story_key(title: str) -> str:
+    """Normalized title used to recognize the same story across days."""
+    return " ".join(re.findall(r"[a-z0-9]+", title.lower()))
+
+
+def story_id(key: str) -> str:
+    """Short stable id of a story key, used in the per-day contributions."""
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()[:10]
+
+
+def week_period(date: str) -> str:
+    """ISO week label for a YYYY-MM-DD date, e.g. 2025-W47."""
+    iso_year, iso_week, _ = datetime.strptime(date, "%Y-%m-%d").isocalendar()
+    return f"{iso_year}-W{iso_week:02d}"
+
+
+def month_period(date: str) -> str:
+    """Month label for a YYYY-MM-DD date, e.g. 2025-11."""
+    return date[:7]
+
+
+def aggregate_path(kind: str, period: str, rollup_dir: str = ROLLUP_DIR) -> str:
+    """Path of a weekly or monthly aggregate file."""
+    return os.path.join(rollup_dir, kind, f"{period}.json")
+
+
+def empty_aggregate(period: str) -> Dict:
+    """A new aggregate with no days applied."""
+    return {"period": period, "days": [], "stories": {}, "themes": {}, "sources": {}, "contributions": {}}
+
+
+def _read_json(path: str) -> Optional[Dict]:
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"Warning: Could not read rollup {path}, starting over: {e}", file=sys.stderr)
+        return None
+
+
+def _write_json(path: str, data: Dict):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp_path, path)
+
+
+def load_aggregate(path: str, period: str, contributions_path: Optional[str] = None) -> Dict:
+    """Load an aggregate file (and its contributions, if a path is given), or start a new one."""
+    aggregate = _read_json(path) or empty_aggregate(period)
+    aggregate["contributions"] = (_read_json(contributions_path) if contributions_path else None) or {}
+    return aggregate
+
+
+def save_aggregate(path: str, aggregate: Dict, contributions_path: Optional[str] = None):
+    """Write an aggregate file (top themes only) and its contributions, each atomically."""
+    summary = {key: value for key, value in aggregate.items() if key != "contributions"}
+    summary["themes"] = dict(Counter(aggregate["themes"]).most_common(THEME_LIMIT))
+    _write_json(path, summary)
+    if contributions_path:
+        _write_json(contributions_path, aggregate.get("contributions", {}))
+
+
+def day_contribution(digest: Dict) -> Dict:
+    """
+    What one day's digest adds to an aggregate: {"stories": {story_id: points},
+    "terms": [...], "sources": {source: count}}, plus the day's story records by
+    story key ("records", not stored) for stories new to the aggregate.
+    """
+    stories = {}
+    records = {}
+    terms = set()
+    sources = Counter()
+    for section in NEWS_SECTIONS:
+        for story in (digest.get(section) or {}).get("stories") or []:
+            title = story.get("title", "")
+            key = story_key(title)
+            if not key:
+                continue
+            records.setdefault(key, {"title": title, "url": story.get("url", ""), "section": section})
+            sid = story_id(key)
+            stories[sid] = max(stories.get(sid, 0), story.get("points") or 0)
+            sources[story.get("source") or "Unknown"] += 1
+            terms.update(extract_terms(title))
+    return {"stories": stories, "terms": sorted(terms), "sources": dict(sources), "records": records}
+
+
+def _refresh_story(aggregate: Dict, key: str, record: Optional[Dict] = None):
+    """
+    Recompute a story's days, points and first/last seen dates from the recorded
+    contributions. A story no longer seen is dropped; an untracked one is added
+    from record (if given).
+    """
+    sid = story_id(key)
+    seen = sorted(
+        (date, contribution["stories"][sid])
+        for date, contribution in aggregate["contributions"].items()
+        if sid in contribution["stories"]
+    )
+    entry = aggregate["stories"].get(key)
+    if not seen:
+        aggregate["stories"].pop(key, None)
+        return
+    if entry is None:
+        if record is None:
+            return
+        entry = aggregate["stories"][key] = dict(record)
+    entry["days"] = len(seen)
+    entry["points"] = max(points for _, points in seen)
+    entry["first_seen"] = seen[0][0]
+    entry["last_seen"] = seen[-1][0]
+
+
+def _cap_stories(aggregate: Dict):
+    """Keep only the top STORY_LIMIT stories by days seen, then points."""
+    stories = aggregate["stories"]
+    if len(stories) <= STORY_LIMIT:
+        return
+    ranked = sorted(stories, key=lambda key: (stories[key]["days"], stories[key]["points"]), reverse=True)
+    aggregate["stories"] = {key: stories[key] for key in ranked[:STORY_LIMIT]}
+
+
+def _recount(aggregate: Dict):
+    """Days, themes and source counts from the recorded contributions."""
+    contributions = aggregate["contributions"]
+    themes = Counter()
+    sources = Counter()
+    for contribution in contributions.values():
+        # Themes count the days a term appeared, so one busy day can't dominate
+        themes.update(contribution["terms"])
+        sources.update(contribution["sources"])
+    aggregate["days"] = sorted(contributions)
+    aggregate["themes"] = dict(themes)
+    aggregate["sources"] = dict(sources)
+
+
+def apply_digest(aggregate: Dict, digest: Dict) -> bool:
+    """
+    Fold one day's digest into an aggregate. A day that was already applied is
+    replaced: its stored contribution is swapped for the new one.
+    Returns False (and changes nothing) for a digest without a date, or for a day
+    applied without a recorded contribution.
+    """
+    date = digest.get("date", "")
+    if not date:
+        return False
+    contributions = aggregate.setdefault("contributions", {})
+    if date in aggregate["days"] and date not in contributions:
+        return False
+
+    previous = contributions.get(date)
+    contribution = day_contribution(digest)
+    records = contribution.pop("records")
+    contributions[date] = contribution
+    _recount(aggregate)
+
+    # Stories only the replaced version of the day had lose that day
+    if previous:
+        for key in list(aggregate["stories"]):
+            if story_id(key) in previous["stories"] and key not in records:
+                _refresh_story(aggregate, key)
+    for key, record in records.items():
+        _refresh_story(aggregate, key, record)
+    _cap_stories(aggregate)
+    return True
+
+
+def merge_aggregates(period: str, aggregates: List[Dict]) -> Dict:
+    """Merge several aggregates (e.g. the months of a year) into one."""
+    merged = empty_aggregate(period)
+    themes = Counter()
+    sources = Counter()
+
+    for aggregate in aggregates:
+        merged["days"].extend(aggregate.get("days", []))
+        themes.update(aggregate.get("themes", {}))
+        sources.update(aggregate.get("sources", {}))
+        for key, entry in aggregate.get("stories", {}).items():
+            current = merged["stories"].get(key)
+            if current is None:
+                merged["stories"][key] = dict(entry)
+                continue
+            current["days"] += entry["days"]
+            current["points"] = max(current["points"], entry["points"])
+            current["first_seen"] = min(current["first_seen"], entry["first_seen"])
+            current["last_seen"] = max(current.get("last_seen", ""), entry.get("last_seen", ""))
+
+    merged["days"] = sorted(set(merged["days"]))
+    del merged["contributions"]
+    _cap_stories(merged)
+    merged["themes"] = dict(themes)
+    merged["sources"] = dict(sources)
+    return merged
+
+
+def _periods(date: str):
+    return (("weekly", week_period(date)), ("monthly", month_period(date)))
+
+
+def update_rollups(
+    digest: Dict,
+    rollup_dir: str = ROLLUP_DIR,
+    contributions_dir: str = CONTRIBUTIONS_DIR,
+    archive_dir: str = "archive",
+) -> Dict[str, Dict]:
+    """Fold a daily digest into its weekly and monthly aggregates. Returns them by kind."""
+    date = digest.get("date", "")
+    updated = {}
+    for kind, period in _periods(date):
+        path = aggregate_path(kind, period, rollup_dir)
+        contributions_path = aggregate_path(kind, period, contributions_dir)
+        aggregate = load_aggregate(path, period, contributions_path)
+        if set(aggregate["days"]) - set(aggregate["contributions"]):
+            # Cold cache: replay the period from the archive before adding today
+            aggregate = replay_period(kind, period, archive_dir)
+            print(f"Replayed {kind} rollup {period} from {len(aggregate['days'])} archived days", file=sys.stderr)
+        if apply_digest(aggregate, digest):
+            save_aggregate(path, aggregate, contributions_path)
+        updated[kind] = aggregate
+    return updated
+
+
+def load_rollup(period: str, rollup_dir: str = ROLLUP_DIR) -> Optional[Dict]:
+    """Load a weekly (YYYY-Www), monthly (YYYY-MM) or yearly (YYYY) rollup."""
+    if "-W" in period:
+        path = aggregate_path("weekly", period, rollup_dir)
+        return load_aggregate(path, period) if os.path.exists(path) else None
+    if len(period) == 7:
+        path = aggregate_path("monthly", period, rollup_dir)
+        return load_aggregate(path, period) if os.path.exists(path) else None
+
+    # Yearly: merge the (at most 12) monthly aggregates
+    paths = sorted(glob.glob(os.path.join(rollup_dir, "monthly", f"{period}-*.json")))
+    if not paths:
+        return None
+    return merge_aggregates(period, [load_aggregate(path, os.path.basename(path)[:-5]) for path in paths])
+
+
+def format_rollup_markdown(aggregate: Dict, title: str, top_n: int = 10) -> str:
+    """Format a rollup (top stories, recurring themes, source mix) as markdown."""
+    days = aggregate.get("days", [])
+    lines = [
+        f"## 🗓️ {title} - {aggregate.get('period', '')}",
+        "",
+        f"*{len(days)} daily digests" + (f", {days[0]} to {days[-1]}*" if days else "*"),
+        "",
+        "### Top Stories",
+        "",
+    ]
+
+    ranked = sorted(
+        aggregate.get("stories", {}).values(),
+        key=lambda entry: (entry["days"], entry["points"]),
+        reverse=True,
+    )
+    for i, entry in enumerate(ranked[:top_n], 1):
+        seen = f" *(seen {entry['days']} days)*" if entry["days"] > 1 else ""
+        if entry.get("url"):
+            lines.append(f"{i}. [{entry['title']}]({entry['url']}){seen}")
+        else:
+            lines.append(f"{i}. {entry['title']}{seen}")
+    lines.append("")
+
+    themes = Counter(aggregate.get("themes", {})).most_common(top_n)
+    if themes:
+        lines.extend([
+            "### Recurring Themes",
+            "",
+            ", ".join(f"**{term}** ({count})" for term, count in themes),
+            "",
+        ])
+
+    sources = Counter(aggregate.get("sources", {}))
+    total = sum(sources.values())
+    if total:
+        lines.extend(["### Source Mix", ""])
+        for source, count in sources.most_common(top_n):
+            lines.append(f"- {source}: {count} ({count / total:.0%})")
+        lines.append("")
+
+    return "\n".join(lines)
+
+
+def _archived_digests(archive_dir: str, dates: Optional[Callable[[str], bool]] = None) -> Iterator[Dict]:
+    """Archived digests in date order, optionally only for dates accepted by a filter."""
+    for path in archive_format.list_archive_files(archive_dir):
+        if dates is not None and not dates(os.path.basename(path)[:10]):
+            continue
+        try:
+            digest = archive_format.load_digest(path, with_markdown=False)
+        except (OSError, json.JSONDecodeError, ValueError) as e:
+            print(f"Skipping {path}: {e}", file=sys.stderr)
+            continue
+        if digest.get("date"):
+            yield digest
+
+
+def replay_period(kind: str, period: str, archive_dir: str = "archive") -> Dict:
+    """Recompute one weekly or monthly aggregate from the archive."""
+    period_of = week_period if kind == "weekly" else month_period
+    aggregate = empty_aggregate(period)
+    for digest in _archived_digests(archive_dir, lambda date: period_of(date) == period):
+        apply_digest(aggregate, digest)
+    return aggregate
+
+
+def rebuild_rollups(
+    archive_dir: str = "archive",
+    rollup_dir: str = ROLLUP_DIR,
+    contributions_dir: str = CONTRIBUTIONS_DIR,
+) -> int:
+    """Recompute every aggregate from the archive (recovery only; daily runs are incremental)."""
+    aggregates = {}
+    for digest in _archived_digests(archive_dir):
+        for kind, period in _periods(digest["date"]):
+            aggregate = aggregates.setdefault((kind, period), empty_aggregate(period))
+            apply_digest(aggregate, digest)
+
+    for (kind, period), aggregate in aggregates.items():
+        save_aggregate(
+            aggregate_path(kind, period, rollup_dir), aggregate, aggregate_path(kind, period, contributions_dir),
+        )
+    return len(aggregates)
+
+
+def main():
+    """Command-line entry point for rebuilding and showing rollups."""
+    parser = argparse.ArgumentParser(description="Weekly/monthly digest rollups")
+    parser.add_argument("--rollup-dir", default=ROLLUP_DIR)
+    parser.add_argument("--contributions-dir", default=CONTRIBUTIONS_DIR)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    rebuild_parser = subparsers.add_parser("rebuild", help="Recompute all aggregates from the archive")
+    rebuild_parser.add_argument("archive_dir", nargs="?", default="archive")
+
+    show_parser = subparsers.add_parser("show", help="Print a rollup as markdown")
+    show_parser.add_argument("period", help="YYYY-Www, YYYY-MM or YYYY")
+
+    args = parser.parse_args()
+
+    if args.command == "rebuild":
+        count = rebuild_rollups(args.archive_dir, args.rollup_dir, args.contributions_dir)
+        print(f"Rebuilt {count} rollups", file=sys.stderr)
+    elif args.command == "show":
+        aggregate = load_rollup(args.period, args.rollup_dir)
+        if aggregate is None:
+            print(f"No rollup for {args.period}", file=sys.stderr)
+            sys.exit(1)
+        title = "Weekly Rollup" if "-W" in args.period else "Monthly Rollup" if len(args.period) == 7 else "Year in Review"
+        print(format_rollup_markdown(aggregate, title))
+
+
+if __name__ == "__main__":
+    main()
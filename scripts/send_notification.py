@@ -1,12 +1,37 @@
 #!/usr/bin/env python3
 """
-Send email or SMS notifications via SendGrid (email) or Twilio (SMS).
+Send digest notifications via SendGrid (email), Twilio (SMS) and webhooks.
+The digest is rendered once, queued in the notification outbox (see outbox.py) and
+delivered to all configured channels concurrently. Re-runs skip deliveries already
+made; failed ones are retried with backoff on later runs.
+
+Usage:
+    python3 scripts/send_notification.py [send|drain|status]
 """
 
 import os
 import sys
+import csv
 import json
-from typing import Optional
+import time
+import sqlite3
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, List, Callable, Tuple
+
+import digest_templates
+import outbox
+
+
+# SendGrid accepts at most 1000 personalizations per mail/send call
+SENDGRID_MAX_PERSONALIZATIONS = 1000
+SENDGRID_BATCH_RETRIES = 3
+SENDGRID_BACKOFF_SECONDS = 1.0
+WEBHOOK_TIMEOUT = 30
+WEBHOOK_RETRIES = 3
+WEBHOOK_BACKOFF_SECONDS = 1.0
+# Messages of one channel (e.g. several webhooks) delivered at a time
+CHANNEL_CONCURRENCY = 8
 
 
 def send_email_sendgrid(
@@ -30,7 +55,9 @@ def send_email_sendgrid(
             html_content=content
         )
         
-        sg = SendGridAPIClient(api_key)
+        # SENDGRID_API_HOST allows pointing at a local stand-in server
+        api_host = os.getenv("SENDGRID_API_HOST")
+        sg = SendGridAPIClient(api_key, host=api_host) if api_host else SendGridAPIClient(api_key)
         response = sg.send(message)
         
         if response.status_code in [200, 201, 202]:
@@ -45,6 +72,125 @@ def send_email_sendgrid(
         return False
 
 
+def load_subscribers(source: str) -> List[str]:
+    """
+    Load subscriber emails from a CSV file (an "email" column) or a SQLite database
+    (a "subscribers" table with an "email" column and optional "active" flag).
+    Duplicates (case-insensitive) and blank rows are dropped; order is preserved.
+    """
+    emails = []
+    if source.endswith((".db", ".sqlite", ".sqlite3")):
+        conn = sqlite3.connect(source)
+        try:
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(subscribers)")}
+            sql = "SELECT email FROM subscribers"
+            if "active" in columns:
+                sql += " WHERE active"
+            emails = [row[0] for row in conn.execute(sql)]
+        finally:
+            conn.close()
+    else:
+        with open(source, "r", encoding="utf-8", newline="") as f:
+            emails = [row.get("email", "") for row in csv.DictReader(f)]
+    
+    seen = set()
+    unique = []
+    for email in emails:
+        email = (email or "").strip()
+        if email and "@" in email and email.lower() not in seen:
+            seen.add(email.lower())
+            unique.append(email)
+    return unique
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of latencies."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def send_email_batches(
+    api_key: str,
+    recipients: List[str],
+    subject: str,
+    content: str,
+    from_email: Optional[str] = None,
+    batch_size: int = SENDGRID_MAX_PERSONALIZATIONS,
+    concurrency: int = 4,
+) -> Dict:
+    """
+    Fan the digest out to many subscribers via SendGrid personalizations.
+    Each API call carries up to batch_size recipients (one personalization each, so
+    recipients don't see each other); batches run with bounded concurrency and are
+    retried with backoff on errors, 429 and 5xx responses.
+    Returns throughput and latency stats, plus failed_recipients (email -> error).
+    """
+    from sendgrid import SendGridAPIClient
+    
+    from_email = from_email or "noreply@ftchvs.github.io"
+    batch_size = max(1, min(batch_size, SENDGRID_MAX_PERSONALIZATIONS))
+    batches = [recipients[i:i + batch_size] for i in range(0, len(recipients), batch_size)]
+    
+    api_host = os.getenv("SENDGRID_API_HOST")
+    sg = SendGridAPIClient(api_key, host=api_host) if api_host else SendGridAPIClient(api_key)
+    
+    def send_batch(batch: List[str]) -> Dict:
+        payload = {
+            "personalizations": [{"to": [{"email": email}]} for email in batch],
+            "from": {"email": from_email},
+            "subject": subject,
+            "content": [{"type": "text/html", "value": content}],
+        }
+        started = time.monotonic()
+        error = None
+        for attempt in range(1, SENDGRID_BATCH_RETRIES + 1):
+            try:
+                response = sg.client.mail.send.post(request_body=payload)
+                if response.status_code in [200, 201, 202]:
+                    return {"ok": True, "batch": batch, "recipients": len(batch), "attempts": attempt, "seconds": time.monotonic() - started}
+                error = f"status {response.status_code}"
+            except Exception as e:
+                # python-http-client raises on 4xx/5xx; only 429 and 5xx are worth retrying
+                status = getattr(e, "status_code", None)
+                error = f"status {status}" if status else str(e)
+                if status and status < 500 and status != 429:
+                    break
+            if attempt < SENDGRID_BATCH_RETRIES:
+                time.sleep(SENDGRID_BACKOFF_SECONDS * 2 ** (attempt - 1))
+        return {"ok": False, "batch": batch, "recipients": len(batch), "attempts": attempt, "seconds": time.monotonic() - started, "error": error}
+    
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        results = list(executor.map(send_batch, batches))
+    elapsed = time.monotonic() - started
+    
+    sent = sum(result["recipients"] for result in results if result["ok"])
+    latencies = [result["seconds"] for result in results]
+    stats = {
+        "recipients": len(recipients),
+        "batches": len(batches),
+        "sent": sent,
+        "failed": len(recipients) - sent,
+        "failed_batches": sum(1 for result in results if not result["ok"]),
+        "retries": sum(result["attempts"] - 1 for result in results),
+        "seconds": round(elapsed, 3),
+        "recipients_per_second": round(sent / elapsed, 1) if elapsed else 0.0,
+        "batch_latency_p50": round(_percentile(latencies, 50), 3),
+        "batch_latency_p95": round(_percentile(latencies, 95), 3),
+        "batch_latency_max": round(max(latencies), 3) if latencies else 0.0,
+    }
+    print(f"Subscriber fan-out: {json.dumps(stats)}", file=sys.stderr)
+    stats["failed_recipients"] = {
+        email: result["error"] for result in results if not result["ok"] for email in result["batch"]
+    }
+    for result in results:
+        if not result["ok"]:
+            print(f"Batch of {result['recipients']} failed after {result['attempts']} attempts: {result['error']}", file=sys.stderr)
+    return stats
+
+
 def send_sms_twilio(
     account_sid: str,
     auth_token: str,
@@ -72,8 +218,39 @@ def send_sms_twilio(
         return False
 
 
+def send_webhook(url: str, subject: str, text: str, html: str) -> bool:
+    """
+    POST the digest as JSON to a webhook (e.g. Slack/Discord relay or a custom endpoint).
+    Timeouts, connection errors, 429 and 5xx responses are retried with backoff.
+    """
+    try:
+        import requests
+    except ImportError as e:
+        print(f"Error sending webhook: {e}", file=sys.stderr)
+        return False
+    
+    for attempt in range(1, WEBHOOK_RETRIES + 1):
+        try:
+            response = requests.post(
+                url,
+                json={"subject": subject, "text": text, "html": html},
+                timeout=WEBHOOK_TIMEOUT,
+            )
+            if response.status_code < 300:
+                print(f"Webhook delivered. Status: {response.status_code}", file=sys.stderr)
+                return True
+            print(f"Webhook returned status {response.status_code}", file=sys.stderr)
+            if response.status_code < 500 and response.status_code != 429:
+                return False
+        except requests.RequestException as e:
+            print(f"Error sending webhook: {e}", file=sys.stderr)
+        if attempt < WEBHOOK_RETRIES:
+            time.sleep(WEBHOOK_BACKOFF_SECONDS * 2 ** (attempt - 1))
+    return False
+
+
 def format_digest_notification(ai_json_path: str, stats_json_path: str) -> tuple[str, str, str]:
-    """Format notification content from JSON files."""
+    """Format notification content (subject, email HTML, SMS text) from JSON files."""
     try:
         # Read content summary (now includes multiple sections)
         content_data = {}
@@ -81,132 +258,24 @@ def format_digest_notification(ai_json_path: str, stats_json_path: str) -> tuple
             with open(ai_json_path, "r", encoding="utf-8") as f:
                 content_data = json.loads(f.read())
         
-        # Read stats
+        # Read stats (only its date is used, as a fallback)
         stats_data = {}
         if stats_json_path and os.path.exists(stats_json_path):
             with open(stats_json_path, "r", encoding="utf-8") as f:
                 stats_data = json.loads(f.read())
         
-        # Format subject
-        date_str = content_data.get("date", stats_data.get("date", ""))
-        subject = f"📊 Daily Digest - {date_str}"
-        
-        # Format content
-        content_lines = [
-            f"<h2>Daily Digest - {date_str}</h2>",
-            "<hr>",
-        ]
-        
-        # Add AI News section
-        ai_news = content_data.get("ai_news", {})
-        if ai_news.get("summary") or ai_news.get("stories"):
-            content_lines.append("<h3>🤖 AI Industry Snapshot</h3>")
-            if ai_news.get("summary"):
-                content_lines.append(f"<p><strong>Summary:</strong> {ai_news.get('summary', '')}</p>")
-            
-            stories = ai_news.get("stories", [])
-            if stories:
-                content_lines.append("<h4>Top AI Stories</h4>")
-                content_lines.append("<ul>")
-                for story in stories[:5]:
-                    title = story.get("title", "")
-                    url = story.get("hn_url") or story.get("url", "#")
-                    content_lines.append(f'<li><a href="{url}">{title}</a></li>')
-                content_lines.append("</ul>")
-            content_lines.append("<hr>")
-        
-        # Add Business News section
-        business_news = content_data.get("business_news", {})
-        if business_news.get("summary") or business_news.get("stories"):
-            content_lines.append("<h3>💼 Business News</h3>")
-            if business_news.get("summary"):
-                content_lines.append(f"<p>{business_news.get('summary', '')}</p>")
-            
-            stories = business_news.get("stories", [])
-            if stories:
-                content_lines.append("<ul>")
-                for story in stories[:5]:
-                    title = story.get("title", "")
-                    url = story.get("url", "#")
-                    content_lines.append(f'<li><a href="{url}">{title}</a></li>')
-                content_lines.append("</ul>")
-            content_lines.append("<hr>")
-        
-        # Add Tech News section
-        tech_news = content_data.get("tech_news", {})
-        if tech_news.get("summary") or tech_news.get("stories"):
-            content_lines.append("<h3>💻 Tech News</h3>")
-            if tech_news.get("summary"):
-                content_lines.append(f"<p>{tech_news.get('summary', '')}</p>")
-            
-            stories = tech_news.get("stories", [])
-            if stories:
-                content_lines.append("<ul>")
-                for story in stories[:5]:
-                    title = story.get("title", "")
-                    url = story.get("url", "#")
-                    content_lines.append(f'<li><a href="{url}">{title}</a></li>')
-                content_lines.append("</ul>")
-            content_lines.append("<hr>")
-        
-        # Add Motivation Quotes section
-        motivation_quotes = content_data.get("motivation_quotes", {})
-        if motivation_quotes.get("items"):
-            content_lines.append("<h3>💪 Motivation Quotes</h3>")
-            items = motivation_quotes.get("items", [])
-            content_lines.append("<ul>")
-            for item in items[:5]:
-                content = item.get("content", item.get("title", ""))
-                url = item.get("url", "#")
-                source = item.get("source", "")
-                content_lines.append(f'<li>"{content[:200]}" <em>(<a href="{url}">{source}</a>)</em></li>')
-            content_lines.append("</ul>")
-            content_lines.append("<hr>")
-        
-        # Add Wise Knowledge section
-        wise_knowledge = content_data.get("wise_knowledge", {})
-        if wise_knowledge.get("items"):
-            content_lines.append("<h3>🧠 Wise Knowledge</h3>")
-            items = wise_knowledge.get("items", [])
-            content_lines.append("<ul>")
-            for item in items[:5]:
-                content = item.get("content", item.get("title", ""))
-                url = item.get("url", "#")
-                source = item.get("source", "")
-                content_lines.append(f'<li>"{content[:200]}" <em>(<a href="{url}">{source}</a>)</em></li>')
-            content_lines.append("</ul>")
-        
-        # Add footer
-        content_lines.append("<hr>")
-        content_lines.append("<p><small>Generated automatically via GitHub Actions</small></p>")
+        if not content_data.get("date"):
+            content_data["date"] = stats_data.get("date", "")
         
-        content = "\n".join(content_lines)
-        
-        # Ensure we have some content - if nothing was added, provide a fallback
-        if len(content_lines) <= 3:  # Only header, hr, and footer
-            content_lines.insert(1, "<p>Content is being processed. Check back later for updates.</p>")
-            content = "\n".join(content_lines)
+        # Every format comes from one pass over the digest templates
+        rendered = digest_templates.render_digest(content_data)
+        content = rendered["html"]
         
         # Debug: log what we're sending
         print(f"Email content length: {len(content)} characters", file=sys.stderr)
         print(f"Content preview: {content[:200]}...", file=sys.stderr)
         
-        # Plain text version for SMS (shorter)
-        sms_lines = [f"Daily Digest - {date_str}"]
-        
-        if ai_news.get("summary"):
-            sms_lines.append(f"\n🤖 AI: {ai_news.get('summary', '')[:150]}")
-        
-        if business_news.get("summary"):
-            sms_lines.append(f"\n💼 Business: {business_news.get('summary', '')[:150]}")
-        
-        motivation_items = motivation_quotes.get("items", [])
-        if motivation_items:
-            sms_lines.append(f"\n💪 Quote: {motivation_items[0].get('content', '')[:150]}")
-        
-        sms_content = "\n".join(sms_lines)
-        
-        return subject, content, sms_content
+        return rendered["subject"], content, rendered["text"]
         
     except Exception as e:
         print(f"Error formatting notification: {e}", file=sys.stderr)
@@ -215,69 +284,228 @@ def format_digest_notification(ai_json_path: str, stats_json_path: str) -> tuple
         return "Daily Digest", "<p>Error formatting digest content.</p>", "Daily Digest - Error formatting content."
 
 
-def main():
-    """Main execution function."""
-    # Get notification type
-    notify_type = os.getenv("NOTIFY_TYPE", "").lower()  # "email" or "sms"
+def digest_date(ai_json_path: str) -> str:
+    """Date of the digest being sent (UTC today if the content JSON has none)."""
+    try:
+        with open(ai_json_path, "r", encoding="utf-8") as f:
+            date = json.load(f).get("date")
+        if date:
+            return date
+    except (OSError, ValueError, AttributeError):
+        pass
+    return time.strftime("%Y-%m-%d", time.gmtime())
+
+
+def configured_deliveries(notify_type: str = "") -> List[Tuple[str, str]]:
+    """
+    List (channel, recipient) deliveries for every channel configured in the environment.
+    notify_type ("email", "sms", "webhook") restricts delivery to one kind; empty or "all" means every channel.
+    """
+    wanted = {notify_type} if notify_type and notify_type != "all" else {"email", "sms", "webhook"}
+    deliveries = []
     
-    if not notify_type:
-        print("No notification type specified. Set NOTIFY_TYPE=email or NOTIFY_TYPE=sms", file=sys.stderr)
-        sys.exit(0)
+    api_key = os.getenv("SENDGRID_API_KEY")
+    to_email = os.getenv("NOTIFY_EMAIL")
+    if "email" in wanted and api_key and to_email:
+        deliveries.append(("email", to_email))
     
-    # Get file paths
-    ai_json = os.getenv("AI_JSON", "/tmp/ai_summary.json")
-    stats_json = os.getenv("STATS_JSON", "/tmp/github_stats.json")
+    # NOTIFY_SUBSCRIBERS: CSV or SQLite subscriber list for the bulk email fan-out
+    subscribers_source = os.getenv("NOTIFY_SUBSCRIBERS")
+    if "email" in wanted and api_key and subscribers_source:
+        recipients = load_subscribers(subscribers_source)
+        if not recipients:
+            print(f"No subscribers found in {subscribers_source}", file=sys.stderr)
+        deliveries.extend(("email_subscribers", email) for email in recipients)
     
-    # Format notification
-    subject, email_content, sms_content = format_digest_notification(ai_json, stats_json)
+    to_phone = os.getenv("NOTIFY_PHONE")
+    if "sms" in wanted and to_phone and all(os.getenv(name) for name in ("TWILIO_ACCOUNT_SID", "TWILIO_AUTH_TOKEN", "TWILIO_PHONE_NUMBER")):
+        deliveries.append(("sms", to_phone))
     
-    success = False
+    # NOTIFY_WEBHOOK_URLS: comma-separated list of endpoints
+    if "webhook" in wanted:
+        deliveries.extend(
+            ("webhook", url.strip()) for url in os.getenv("NOTIFY_WEBHOOK_URLS", "").split(",") if url.strip()
+        )
     
-    if notify_type == "email":
-        # Send email via SendGrid
-        api_key = os.getenv("SENDGRID_API_KEY")
-        to_email = os.getenv("NOTIFY_EMAIL")
-        
-        if not api_key or not to_email:
-            print("Error: SENDGRID_API_KEY and NOTIFY_EMAIL required for email", file=sys.stderr)
-            sys.exit(1)
-        
-        # Get from_email from environment or use default
-        from_email = os.getenv("SENDGRID_FROM_EMAIL")
-        
-        success = send_email_sendgrid(
+    return deliveries
+
+
+def _deliver_each(messages: List[Dict], send: Callable[[Dict], bool]) -> Dict[str, Optional[str]]:
+    """Deliver a channel's messages one call each, up to CHANNEL_CONCURRENCY at a time."""
+    with ThreadPoolExecutor(max_workers=max(1, min(CHANNEL_CONCURRENCY, len(messages)))) as executor:
+        delivered = list(executor.map(send, messages))
+    return {
+        message["idempotency_key"]: None if ok else "send failed"
+        for message, ok in zip(messages, delivered)
+    }
+
+
+def configured_senders() -> Dict[str, Callable[[List[Dict]], Dict[str, Optional[str]]]]:
+    """
+    Build a sender for every channel whose credentials are set.
+    A sender takes queued outbox messages of its channel and returns {idempotency_key: error or None};
+    single-recipient channels deliver their messages concurrently.
+    """
+    senders = {}
+    
+    api_key = os.getenv("SENDGRID_API_KEY")
+    from_email = os.getenv("SENDGRID_FROM_EMAIL")
+    if api_key:
+        senders["email"] = lambda messages: _deliver_each(messages, lambda message: send_email_sendgrid(
             api_key=api_key,
-            to_email=to_email,
-            subject=subject,
-            content=email_content,
+            to_email=message["recipient"],
+            subject=message["subject"],
+            content=message["html"],
             from_email=from_email
-        )
-        
-    elif notify_type == "sms":
-        # Send SMS via Twilio
-        account_sid = os.getenv("TWILIO_ACCOUNT_SID")
-        auth_token = os.getenv("TWILIO_AUTH_TOKEN")
-        to_phone = os.getenv("NOTIFY_PHONE")
-        from_phone = os.getenv("TWILIO_PHONE_NUMBER")
-        
-        if not all([account_sid, auth_token, to_phone, from_phone]):
-            print("Error: TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN, NOTIFY_PHONE, and TWILIO_PHONE_NUMBER required", file=sys.stderr)
-            sys.exit(1)
-        
-        success = send_sms_twilio(
+        ))
+        
+        def send_to_subscribers(messages: List[Dict]) -> Dict[str, Optional[str]]:
+            # One fan-out per digest payload; a re-run only carries recipients still pending
+            by_payload = {}
+            for message in messages:
+                by_payload.setdefault((message["subject"], message["html"]), []).append(message)
+            outcome = {}
+            for (subject, html), group in by_payload.items():
+                stats = send_email_batches(
+                    api_key=api_key,
+                    recipients=[message["recipient"] for message in group],
+                    subject=subject,
+                    content=html,
+                    from_email=from_email,
+                    batch_size=int(os.getenv("SENDGRID_BATCH_SIZE", SENDGRID_MAX_PERSONALIZATIONS)),
+                    concurrency=int(os.getenv("SENDGRID_CONCURRENCY", "4")),
+                )
+                for message in group:
+                    outcome[message["idempotency_key"]] = stats["failed_recipients"].get(message["recipient"])
+            return outcome
+        senders["email_subscribers"] = send_to_subscribers
+    
+    account_sid = os.getenv("TWILIO_ACCOUNT_SID")
+    auth_token = os.getenv("TWILIO_AUTH_TOKEN")
+    from_phone = os.getenv("TWILIO_PHONE_NUMBER")
+    if all([account_sid, auth_token, from_phone]):
+        senders["sms"] = lambda messages: _deliver_each(messages, lambda message: send_sms_twilio(
             account_sid=account_sid,
             auth_token=auth_token,
-            to_phone=to_phone,
+            to_phone=message["recipient"],
             from_phone=from_phone,
-            message=sms_content
-        )
+            message=message["text"]
+        ))
+    
+    senders["webhook"] = lambda messages: _deliver_each(messages, lambda message: send_webhook(
+        message["recipient"], message["subject"], message["text"], message["html"]
+    ))
+    
+    return senders
+
+
+def dispatch_notifications(messages: List[Dict], senders: Dict[str, Callable[[List[Dict]], Dict[str, Optional[str]]]]) -> Tuple[Dict[str, Dict], Dict[str, Optional[str]]]:
+    """
+    Send queued messages, all channels concurrently.
+    Returns (a result per channel: {"ok", "sent", "failed", "seconds", "error"}, {idempotency_key: error or None}).
+    Messages for channels without credentials on this run are left queued.
+    """
+    by_channel = {}
+    for message in messages:
+        if message["channel"] in senders:
+            by_channel.setdefault(message["channel"], []).append(message)
+        else:
+            print(f"Channel {message['channel']} not configured, keeping message for {message['date']} queued", file=sys.stderr)
+    
+    def run(channel: str) -> Tuple[Dict, Dict[str, Optional[str]]]:
+        started = time.monotonic()
+        queued = by_channel[channel]
+        try:
+            outcome = senders[channel](queued)
+            error = None
+        except Exception as e:
+            outcome = {message["idempotency_key"]: str(e) for message in queued}
+            error = str(e)
+        failed = sum(1 for key_error in outcome.values() if key_error)
+        return {
+            "ok": failed == 0,
+            "sent": len(outcome) - failed,
+            "failed": failed,
+            "seconds": round(time.monotonic() - started, 3),
+            "error": error,
+        }, outcome
+    
+    if not by_channel:
+        return {}, {}
+    
+    results = {}
+    outcomes = {}
+    with ThreadPoolExecutor(max_workers=len(by_channel)) as executor:
+        futures = {channel: executor.submit(run, channel) for channel in by_channel}
+        for channel, future in futures.items():
+            results[channel], outcome = future.result()
+            outcomes.update(outcome)
+    return results, outcomes
+
+
+def record_outcomes(conn: sqlite3.Connection, messages: List[Dict], outcomes: Dict[str, Optional[str]]):
+    """Mark delivered messages sent and reschedule failed ones with backoff."""
+    attempts = {message["idempotency_key"]: message["attempts"] for message in messages}
+    outbox.mark_sent(conn, [key for key, error in outcomes.items() if not error])
+    outbox.mark_failed(conn, [(key, attempts[key], error) for key, error in outcomes.items() if error])
+
+
+def main():
+    """Main execution function."""
+    parser = argparse.ArgumentParser(description="Send digest notifications through the outbox")
+    parser.add_argument(
+        "command", nargs="?", default="send", choices=["send", "drain", "status"],
+        help="send: queue today's digest and deliver due messages (default); "
+             "drain: deliver every pending message now, ignoring backoff; status: print outbox counts",
+    )
+    args = parser.parse_args()
     
-    if success:
-        print(f"Notification sent successfully via {notify_type}", file=sys.stderr)
+    conn = outbox.connect()
+    
+    if args.command == "status":
+        print(json.dumps(outbox.status_counts(conn)))
         sys.exit(0)
-    else:
-        print(f"Failed to send notification via {notify_type}", file=sys.stderr)
+    
+    if args.command == "send":
+        # Optional: restrict to one notification type ("email", "sms", "webhook"); default is all configured
+        notify_type = os.getenv("NOTIFY_TYPE", "").lower()
+        
+        # Get file paths
+        ai_json = os.getenv("AI_JSON", "/tmp/ai_summary.json")
+        stats_json = os.getenv("STATS_JSON", "/tmp/github_stats.json")
+        
+        deliveries = configured_deliveries(notify_type)
+        if deliveries:
+            # Format notification once for every channel
+            subject, email_content, sms_content = format_digest_notification(ai_json, stats_json)
+            queued = outbox.enqueue(conn, digest_date(ai_json), subject, email_content, sms_content, deliveries)
+            print(f"Queued {queued} new of {len(deliveries)} deliveries (the rest were already in the outbox)", file=sys.stderr)
+        else:
+            print("No notification channels configured. Set SENDGRID_API_KEY/NOTIFY_EMAIL (or NOTIFY_SUBSCRIBERS), TWILIO_*/NOTIFY_PHONE or NOTIFY_WEBHOOK_URLS", file=sys.stderr)
+    
+    messages = outbox.due_messages(conn, ignore_backoff=args.command == "drain")
+    if not messages:
+        print(f"No notifications due. Outbox: {json.dumps(outbox.status_counts(conn))}", file=sys.stderr)
+        sys.exit(0)
+    
+    print(f"Sending {len(messages)} queued notification(s)...", file=sys.stderr)
+    results, outcomes = dispatch_notifications(messages, configured_senders())
+    record_outcomes(conn, messages, outcomes)
+    
+    # Machine-readable result per channel on stdout
+    print(json.dumps(results))
+    
+    failed = [name for name, result in results.items() if not result["ok"]]
+    for name, result in results.items():
+        status = f"{result['sent']} sent" if result["ok"] else f"{result['failed']} FAILED{': ' + result['error'] if result['error'] else ''}"
+        print(f"{name}: {status} ({result['seconds']}s)", file=sys.stderr)
+    print(f"Outbox: {json.dumps(outbox.status_counts(conn))}", file=sys.stderr)
+    
+    if failed:
+        print(f"Failed to send notification via {', '.join(failed)}; will retry on a later run", file=sys.stderr)
         sys.exit(1)
+    print("All notifications sent successfully", file=sys.stderr)
+    sys.exit(0)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,149 @@
+"""
+Shared story record used by every fetcher.
+
+Fetchers build records through make_story(), the single normalization and
+schema-check point. Ranking and dedup run on a columnar StoryBatch, and
+records are converted back to plain dicts (to_dict) only at the output
+boundary (JSON, archive, markdown).
+"""
+
+import sys
+from dataclasses import dataclass
+from typing import List, Dict, Optional, Iterable
+
+
+@dataclass(slots=True)
+class Story:
+    """One fetched story, post or quote."""
+    title: str
+    url: str
+    source: str
+    author: str = ""
+    points: int = 0
+    comments: int = 0
+    hn_url: str = ""
+    content: str = ""
+    published: str = ""
+
+    def to_dict(self) -> Dict:
+        """Plain dict in the digest JSON shape; optional fields only when set."""
+        data = {
+            "title": self.title,
+            "url": self.url,
+            "points": self.points,
+            "comments": self.comments,
+            "author": self.author,
+            "source": self.source,
+        }
+        if self.hn_url:
+            data["hn_url"] = self.hn_url
+        if self.content:
+            data["content"] = self.content
+        if self.published:
+            data["published"] = self.published
+        return data
+
+
+def _as_int(value) -> int:
+    """Coerce API counters (None, strings) to int."""
+    try:
+        return int(value or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _as_str(value) -> str:
+    """Coerce API text fields (None, numbers) to a stripped string."""
+    if value is None:
+        return ""
+    return str(value).strip()
+
+
+def make_story(
+    title,
+    url,
+    source: str,
+    author=None,
+    points=0,
+    comments=0,
+    hn_url: str = "",
+    content=None,
+    published=None,
+) -> Optional[Story]:
+    """
+    Build a Story from raw fetcher fields.
+    Returns None (and logs) for records without a title or content, so fetchers can skip them.
+    """
+    title = _as_str(title)
+    content = _as_str(content)
+    if not title and not content:
+        print(f"Skipping {source} item without title or content", file=sys.stderr)
+        return None
+
+    return Story(
+        title=title,
+        url=_as_str(url),
+        source=sys.intern(source),
+        author=_as_str(author),
+        points=_as_int(points),
+        comments=_as_int(comments),
+        hn_url=hn_url,
+        content=content,
+        published=_as_str(published),
+    )
+
+
+def title_key(title: str) -> str:
+    """Dedup key for a story title."""
+    return title.lower().strip()
+
+
+class StoryBatch:
+    """Columnar view of a list of stories for ranking and dedup."""
+
+    __slots__ = ("stories", "keys", "points", "comments")
+
+    def __init__(self, stories: Iterable[Optional[Story]]):
+        self.stories = [story for story in stories if story is not None]
+        self.keys = [title_key(story.title or story.content) for story in self.stories]
+        self.points = [story.points for story in self.stories]
+        self.comments = [story.comments for story in self.stories]
+
+    def __len__(self) -> int:
+        return len(self.stories)
+
+    def _take(self, indices: List[int]) -> "StoryBatch":
+        batch = StoryBatch.__new__(StoryBatch)
+        batch.stories = [self.stories[i] for i in indices]
+        batch.keys = [self.keys[i] for i in indices]
+        batch.points = [self.points[i] for i in indices]
+        batch.comments = [self.comments[i] for i in indices]
+        return batch
+
+    def dedupe(self) -> "StoryBatch":
+        """Keep the first story for each title, in order."""
+        seen = set()
+        keep = []
+        for i, key in enumerate(self.keys):
+            if key and key not in seen:
+                seen.add(key)
+                keep.append(i)
+        return self._take(keep)
+
+    def ranked(self, with_comments: bool = False) -> "StoryBatch":
+        """Sort by points (then comments) descending; ties keep their order."""
+        points, comments = self.points, self.comments
+        if with_comments:
+            order = sorted(range(len(points)), key=lambda i: (points[i], comments[i]), reverse=True)
+        else:
+            order = sorted(range(len(points)), key=points.__getitem__, reverse=True)
+        return self._take(order)
+
+    def top(self, limit: int) -> List[Story]:
+        """First `limit` stories of the batch."""
+        return self.stories[:limit]
+
+
+def stories_to_dicts(stories: Iterable[Story]) -> List[Dict]:
+    """Convert records to plain dicts at the output boundary."""
+    return [story.to_dict() for story in stories]
@@ -10,9 +10,6 @@ import json
 from typing import List, Dict, Optional
 from urllib.parse import urlparse
 from datetime import datetime, timedelta
-import requests
-import feedparser
-from openai import OpenAI
 
 
 def get_openai_key() -> str:
@@ -47,6 +44,8 @@ def ensure_hn_url(object_id: Optional[str], title: str = "") -> str:
 
 def fetch_hacker_news_ai_stories(limit: int = 5) -> List[Dict]:
     """Fetch top AI-related stories from Hacker News via Algolia API."""
+    import requests
+
     # Hacker News Algolia search API
     url = "https://hn.algolia.com/api/v1/search"
     
@@ -106,6 +105,8 @@ def fetch_hacker_news_ai_stories(limit: int = 5) -> List[Dict]:
 
 def fetch_reddit_ai_stories(limit: int = 5) -> List[Dict]:
     """Fetch top AI-related stories from Reddit (r/MachineLearning, r/artificial)."""
+    import requests
+
     # AI-specific subreddits - all posts are relevant
     ai_subreddits = ["MachineLearning", "artificial", "singularity", "artificial_intelligence", "LocalLLaMA", "ChatGPT", "GPT3"]
     # General tech subreddits where we need keyword filtering
@@ -311,6 +312,8 @@ def fetch_twitter_ai_stories(limit: int = 5) -> List[Dict]:
 
 def fetch_youtube_ai_stories(limit: int = 5) -> List[Dict]:
     """Fetch AI-related videos from YouTube."""
+    import requests
+
     ai_keywords = ["ai", "artificial intelligence", "machine learning", "llm", "gpt", "openai", "anthropic", "claude", "neural", "deep learning"]
     stories = []
     
@@ -423,6 +426,8 @@ def deduplicate_stories(all_stories: List[Dict]) -> List[Dict]:
 
 def generate_ai_summary(stories: List[Dict], api_key: str) -> str:
     """Generate AI summary of the top AI stories using OpenAI."""
+    from openai import OpenAI
+
     if not stories:
         return "No AI stories found today."
     
@@ -463,6 +468,9 @@ Summarize the main themes, breakthroughs, or noteworthy developments in the AI s
 
 def generate_pointillism_image(stories: List[Dict], summary: str, api_key: str, date: str) -> Optional[str]:
     """Generate a digital pointillism image with motion design inspired by AI news."""
+    import requests
+    from openai import OpenAI
+
     if not stories:
         return None
     
@@ -10,22 +10,29 @@ Generate summaries via OpenAI and archive logs.
 """
 
 import os
+import re
 import sys
 import json
 import time
+import base64
+import hashlib
+import importlib.util
 from typing import List, Dict, Optional
-from urllib.parse import urlparse
 from datetime import datetime, timedelta
-import requests
-import feedparser
-from openai import OpenAI
 
-# Try to import Firecrawl, but make it optional
-try:
-    from firecrawl import FirecrawlApp
-    FIRECRAWL_AVAILABLE = True
-except ImportError:
-    FIRECRAWL_AVAILABLE = False
+import archive_format
+import clients
+import digest_templates
+import archive_store
+import rollups
+import youtube
+from digest_templates import validate_url
+from stories import Story, StoryBatch, make_story, stories_to_dicts
+
+# Heavy dependencies (requests, feedparser, firecrawl, openai, numpy via trends) are
+# imported where they are used, so fetch-only and render-only runs start fast.
+# Firecrawl is optional; check for it without importing it.
+FIRECRAWL_AVAILABLE = importlib.util.find_spec("firecrawl") is not None
 
 
 # Reddit API headers - Reddit requires a descriptive User-Agent
@@ -34,6 +41,16 @@ REDDIT_HEADERS = {
 }
 
 
+# Previous image-generation inputs, used to skip DALL-E when the news mix barely changed
+IMAGE_FINGERPRINT_PATH = os.path.join("archive", "image-fingerprint.json")
+DEFAULT_IMAGE_REUSE_THRESHOLD = 0.7
+
+# PNG integrity checks for generated images
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+MIN_IMAGE_BYTES = 1024
+B64_CHUNK_SIZE = 64 * 1024  # multiple of 4 so each chunk decodes independently
+
+
 def get_openai_key() -> str:
     """Get OpenAI API key from environment."""
     key = os.getenv("OPENAI_API_KEY")
@@ -47,13 +64,18 @@ def get_firecrawl_key() -> Optional[str]:
     return os.getenv("FIRECRAWL_API_KEY")
 
 
-def validate_url(url: str) -> bool:
-    """Validate that a URL is properly formatted."""
+def get_project_root() -> str:
+    """Get the project root (parent of the scripts directory)."""
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    return os.path.dirname(script_dir)
+
+
+def get_image_reuse_threshold() -> float:
+    """Get the similarity above which the previous image is reused (IMAGE_REUSE_THRESHOLD)."""
     try:
-        result = urlparse(url)
-        return all([result.scheme, result.netloc])
-    except Exception:
-        return False
+        return float(os.getenv("IMAGE_REUSE_THRESHOLD", DEFAULT_IMAGE_REUSE_THRESHOLD))
+    except ValueError:
+        return DEFAULT_IMAGE_REUSE_THRESHOLD
 
 
 def ensure_hn_url(object_id: Optional[str], title: str = "") -> str:
@@ -67,7 +89,7 @@ def ensure_hn_url(object_id: Optional[str], title: str = "") -> str:
 
 # ============ AI NEWS FUNCTIONS ============
 
-def fetch_hacker_news_ai_stories(limit: int = 5) -> List[Dict]:
+def fetch_hacker_news_ai_stories(limit: int = 5) -> List[Story]:
     """Fetch top AI-related stories from Hacker News via Algolia API."""
     url = "https://hn.algolia.com/api/v1/search"
     
@@ -79,7 +101,7 @@ def fetch_hacker_news_ai_stories(limit: int = 5) -> List[Dict]:
     }
     
     try:
-        response = requests.get(url, params=params, timeout=30)
+        response = clients.http_session().get(url, params=params, timeout=30)
         response.raise_for_status()
         data = response.json()
         
@@ -97,15 +119,15 @@ def fetch_hacker_news_ai_stories(limit: int = 5) -> List[Dict]:
                 
                 final_url = external_url if (external_url and validate_url(external_url)) else hn_url
                 
-                ai_stories.append({
-                    "title": title_text,
-                    "url": final_url,
-                    "points": hit.get("points", 0),
-                    "comments": hit.get("num_comments", 0),
-                    "author": hit.get("author", ""),
-                    "hn_url": hn_url,
-                    "source": "Hacker News",
-                })
+                story = make_story(
+                    title_text, final_url, "Hacker News",
+                    author=hit.get("author"),
+                    points=hit.get("points"),
+                    comments=hit.get("num_comments"),
+                    hn_url=hn_url,
+                )
+                if story:
+                    ai_stories.append(story)
                 
                 if len(ai_stories) >= limit:
                     break
@@ -117,8 +139,10 @@ def fetch_hacker_news_ai_stories(limit: int = 5) -> List[Dict]:
         return []
 
 
-def fetch_reddit_ai_stories(limit: int = 5) -> List[Dict]:
+def fetch_reddit_ai_stories(limit: int = 5) -> List[Story]:
     """Fetch top AI-related stories from Reddit."""
+    import requests
+
     # AI-specific subreddits - all posts are relevant
     ai_subreddits = ["MachineLearning", "artificial", "singularity", "artificial_intelligence", "LocalLLaMA", "ChatGPT", "GPT3"]
     # General tech subreddits where we need keyword filtering
@@ -134,7 +158,7 @@ def fetch_reddit_ai_stories(limit: int = 5) -> List[Dict]:
     for subreddit in ai_subreddits:
         try:
             url = f"https://www.reddit.com/r/{subreddit}/hot.json?limit=25"
-            response = requests.get(url, headers=REDDIT_HEADERS, timeout=30)
+            response = clients.http_session().get(url, headers=REDDIT_HEADERS, timeout=30)
             response.raise_for_status()
             data = response.json()
             
@@ -161,14 +185,12 @@ def fetch_reddit_ai_stories(limit: int = 5) -> List[Dict]:
                 
                 final_url = external_url if (external_url and validate_url(external_url) and "reddit.com" not in external_url) else reddit_url
                 
-                all_stories.append({
-                    "title": post_data.get("title", ""),
-                    "url": final_url,
-                    "points": post_data.get("score", 0),
-                    "comments": post_data.get("num_comments", 0),
-                    "author": post_data.get("author", ""),
-                    "source": f"r/{subreddit}",
-                })
+                all_stories.append(make_story(
+                    post_data.get("title"), final_url, f"r/{subreddit}",
+                    author=post_data.get("author"),
+                    points=post_data.get("score"),
+                    comments=post_data.get("num_comments"),
+                ))
             
             # Rate limiting for Reddit
             time.sleep(0.5)
@@ -184,7 +206,7 @@ def fetch_reddit_ai_stories(limit: int = 5) -> List[Dict]:
     for subreddit in general_subreddits:
         try:
             url = f"https://www.reddit.com/r/{subreddit}/hot.json?limit=25"
-            response = requests.get(url, headers=REDDIT_HEADERS, timeout=30)
+            response = clients.http_session().get(url, headers=REDDIT_HEADERS, timeout=30)
             response.raise_for_status()
             data = response.json()
             
@@ -210,14 +232,12 @@ def fetch_reddit_ai_stories(limit: int = 5) -> List[Dict]:
                     
                     final_url = external_url if (external_url and validate_url(external_url) and "reddit.com" not in external_url) else reddit_url
                     
-                    all_stories.append({
-                        "title": post_data.get("title", ""),
-                        "url": final_url,
-                        "points": post_data.get("score", 0),
-                        "comments": post_data.get("num_comments", 0),
-                        "author": post_data.get("author", ""),
-                        "source": f"r/{subreddit}",
-                    })
+                    all_stories.append(make_story(
+                        post_data.get("title"), final_url, f"r/{subreddit}",
+                        author=post_data.get("author"),
+                        points=post_data.get("score"),
+                        comments=post_data.get("num_comments"),
+                    ))
             
             time.sleep(0.5)
                     
@@ -226,13 +246,15 @@ def fetch_reddit_ai_stories(limit: int = 5) -> List[Dict]:
             continue
     
     # Sort by score and return top stories
-    all_stories.sort(key=lambda x: x.get("points", 0), reverse=True)
-    print(f"Total Reddit AI stories found: {len(all_stories)}", file=sys.stderr)
-    return all_stories[:limit]
+    batch = StoryBatch(all_stories).ranked()
+    print(f"Total Reddit AI stories found: {len(batch)}", file=sys.stderr)
+    return batch.top(limit)
 
 
-def fetch_techcrunch_ai_stories(limit: int = 5) -> List[Dict]:
+def fetch_techcrunch_ai_stories(limit: int = 5) -> List[Story]:
     """Fetch AI-related stories from TechCrunch RSS feed."""
+    import feedparser
+
     try:
         rss_url = "https://techcrunch.com/tag/artificial-intelligence/feed/"
         feed = feedparser.parse(rss_url)
@@ -256,14 +278,14 @@ def fetch_techcrunch_ai_stories(limit: int = 5) -> List[Dict]:
                         continue
                 
                 link = entry.get("link", "")
-                stories.append({
-                    "title": entry.get("title", ""),
-                    "url": link if validate_url(link) else "https://techcrunch.com",
-                    "points": 0,
-                    "comments": 0,
-                    "author": entry.get("author", "TechCrunch"),
-                    "source": "TechCrunch",
-                })
+                story = make_story(
+                    entry.get("title"),
+                    link if validate_url(link) else "https://techcrunch.com",
+                    "TechCrunch",
+                    author=entry.get("author", "TechCrunch"),
+                )
+                if story:
+                    stories.append(story)
         
         return stories[:limit]
         
@@ -272,8 +294,8 @@ def fetch_techcrunch_ai_stories(limit: int = 5) -> List[Dict]:
         return []
 
 
-def fetch_youtube_ai_stories(limit: int = 5) -> List[Dict]:
-    """Fetch AI-related videos from YouTube."""
+def fetch_youtube_ai_stories(limit: int = 5) -> List[Story]:
+    """Fetch AI-related videos from YouTube, with view counts as points (one batched videos.list call)."""
     ai_keywords = ["ai", "artificial intelligence", "machine learning", "llm", "gpt", "openai", "anthropic", "claude", "neural", "deep learning"]
     stories = []
     
@@ -282,7 +304,7 @@ def fetch_youtube_ai_stories(limit: int = 5) -> List[Dict]:
         if not youtube_api_key:
             return []
         
-        search_url = "https://www.googleapis.com/youtube/v3/search"
+        search_url = f"{youtube.YOUTUBE_API_URL}/search"
         
         params = {
             "part": "snippet",
@@ -294,31 +316,32 @@ def fetch_youtube_ai_stories(limit: int = 5) -> List[Dict]:
             "key": youtube_api_key,
         }
         
-        response = requests.get(search_url, params=params, timeout=30)
+        response = clients.http_session().get(search_url, params=params, timeout=30)
         response.raise_for_status()
         data = response.json()
         
         items = data.get("items", [])
+        matches = [
+            item for item in items
+            if any(keyword in item.get("snippet", {}).get("title", "").lower() for keyword in ai_keywords)
+        ][:limit]
+        details = youtube.fetch_video_details(
+            (item.get("id", {}).get("videoId", "") for item in matches), youtube_api_key, parts="statistics",
+        )
         
-        for item in items:
+        for item in matches:
             snippet = item.get("snippet", {})
-            title = snippet.get("title", "").lower()
+            video_id = item.get("id", {}).get("videoId", "")
+            video_url = f"https://www.youtube.com/watch?v={video_id}"
             
-            if any(keyword in title for keyword in ai_keywords):
-                video_id = item.get("id", {}).get("videoId", "")
-                video_url = f"https://www.youtube.com/watch?v={video_id}"
-                
-                stories.append({
-                    "title": snippet.get("title", ""),
-                    "url": video_url,
-                    "points": 0,
-                    "comments": 0,
-                    "author": snippet.get("channelTitle", ""),
-                    "source": "YouTube",
-                })
-                
-                if len(stories) >= limit:
-                    break
+            story = make_story(
+                snippet.get("title"), video_url, "YouTube",
+                author=snippet.get("channelTitle"),
+                points=youtube.video_statistic(details.get(video_id), "viewCount"),
+                comments=youtube.video_statistic(details.get(video_id), "commentCount"),
+            )
+            if story:
+                stories.append(story)
         
         return stories[:limit]
         
@@ -327,7 +350,7 @@ def fetch_youtube_ai_stories(limit: int = 5) -> List[Dict]:
         return []
 
 
-def fetch_twitter_ai_stories(limit: int = 5) -> List[Dict]:
+def fetch_twitter_ai_stories(limit: int = 5) -> List[Story]:
     """Fetch AI-related tweets/posts from Twitter/X."""
     # Note: Twitter API requires authentication
     # For now, return empty list - can be implemented with API keys
@@ -337,8 +360,10 @@ def fetch_twitter_ai_stories(limit: int = 5) -> List[Dict]:
 
 # ============ BUSINESS NEWS FUNCTIONS ============
 
-def fetch_rss_business_news(rss_url: str, source_name: str, limit: int = 10) -> List[Dict]:
+def fetch_rss_business_news(rss_url: str, source_name: str, limit: int = 10) -> List[Story]:
     """Generic function to fetch business news from RSS feeds."""
+    import feedparser
+
     try:
         feed = feedparser.parse(rss_url)
         
@@ -359,15 +384,15 @@ def fetch_rss_business_news(rss_url: str, source_name: str, limit: int = 10) ->
                     continue
             
             link = entry.get("link", "")
-            title = entry.get("title", "")
-            
-            stories.append({
-                "title": title,
-                "url": link if validate_url(link) else "",
-                "source": source_name,
-                "author": entry.get("author", source_name),
-                "published": entry.get("published", ""),
-            })
+            story = make_story(
+                entry.get("title"),
+                link if validate_url(link) else "",
+                source_name,
+                author=entry.get("author", source_name),
+                published=entry.get("published"),
+            )
+            if story:
+                stories.append(story)
         
         return stories[:limit]
         
@@ -376,7 +401,7 @@ def fetch_rss_business_news(rss_url: str, source_name: str, limit: int = 10) ->
         return []
 
 
-def fetch_business_news(limit: int = 10) -> List[Dict]:
+def fetch_business_news(limit: int = 10) -> List[Story]:
     """Fetch business news from multiple sources."""
     all_stories = []
     
@@ -426,20 +451,12 @@ def fetch_business_news(limit: int = 10) -> List[Dict]:
     all_stories.extend(nyt_stories)
     
     # Deduplicate by title
-    seen_titles = set()
-    unique_stories = []
-    for story in all_stories:
-        title_key = story.get("title", "").lower().strip()
-        if title_key and title_key not in seen_titles:
-            seen_titles.add(title_key)
-            unique_stories.append(story)
-    
-    return unique_stories[:limit]
+    return StoryBatch(all_stories).dedupe().top(limit)
 
 
 # ============ TECH NEWS FUNCTIONS ============
 
-def fetch_hacker_news_tech_stories(limit: int = 10) -> List[Dict]:
+def fetch_hacker_news_tech_stories(limit: int = 10) -> List[Story]:
     """Fetch top tech stories (non-AI) from Hacker News."""
     url = "https://hn.algolia.com/api/v1/search_by_date"
     
@@ -450,7 +467,7 @@ def fetch_hacker_news_tech_stories(limit: int = 10) -> List[Dict]:
     }
     
     try:
-        response = requests.get(url, params=params, timeout=30)
+        response = clients.http_session().get(url, params=params, timeout=30)
         response.raise_for_status()
         data = response.json()
         
@@ -469,14 +486,14 @@ def fetch_hacker_news_tech_stories(limit: int = 10) -> List[Dict]:
                 
                 final_url = external_url if (external_url and validate_url(external_url)) else hn_url
                 
-                tech_stories.append({
-                    "title": title_text,
-                    "url": final_url,
-                    "points": hit.get("points", 0),
-                    "comments": hit.get("num_comments", 0),
-                    "author": hit.get("author", ""),
-                    "source": "Hacker News",
-                })
+                story = make_story(
+                    title_text, final_url, "Hacker News",
+                    author=hit.get("author"),
+                    points=hit.get("points"),
+                    comments=hit.get("num_comments"),
+                )
+                if story:
+                    tech_stories.append(story)
                 
                 if len(tech_stories) >= limit:
                     break
@@ -488,8 +505,10 @@ def fetch_hacker_news_tech_stories(limit: int = 10) -> List[Dict]:
         return []
 
 
-def fetch_techcrunch_tech_stories(limit: int = 10) -> List[Dict]:
+def fetch_techcrunch_tech_stories(limit: int = 10) -> List[Story]:
     """Fetch general tech stories from TechCrunch (non-AI)."""
+    import feedparser
+
     try:
         rss_url = "https://techcrunch.com/feed/"
         feed = feedparser.parse(rss_url)
@@ -514,12 +533,14 @@ def fetch_techcrunch_tech_stories(limit: int = 10) -> List[Dict]:
                         continue
                 
                 link = entry.get("link", "")
-                stories.append({
-                    "title": entry.get("title", ""),
-                    "url": link if validate_url(link) else "https://techcrunch.com",
-                    "source": "TechCrunch",
-                    "author": entry.get("author", "TechCrunch"),
-                })
+                story = make_story(
+                    entry.get("title"),
+                    link if validate_url(link) else "https://techcrunch.com",
+                    "TechCrunch",
+                    author=entry.get("author", "TechCrunch"),
+                )
+                if story:
+                    stories.append(story)
         
         return stories[:limit]
         
@@ -528,7 +549,7 @@ def fetch_techcrunch_tech_stories(limit: int = 10) -> List[Dict]:
         return []
 
 
-def fetch_reddit_tech_stories(limit: int = 10) -> List[Dict]:
+def fetch_reddit_tech_stories(limit: int = 10) -> List[Story]:
     """Fetch tech stories from Reddit tech subreddits."""
     subreddits = ["technology", "programming", "gadgets", "technews"]
     all_stories = []
@@ -536,7 +557,7 @@ def fetch_reddit_tech_stories(limit: int = 10) -> List[Dict]:
     for subreddit in subreddits:
         try:
             url = f"https://www.reddit.com/r/{subreddit}/hot.json?limit=25"
-            response = requests.get(url, headers=REDDIT_HEADERS, timeout=30)
+            response = clients.http_session().get(url, headers=REDDIT_HEADERS, timeout=30)
             response.raise_for_status()
             data = response.json()
             
@@ -549,14 +570,12 @@ def fetch_reddit_tech_stories(limit: int = 10) -> List[Dict]:
                 
                 final_url = external_url if (external_url and validate_url(external_url) and "reddit.com" not in external_url) else reddit_url
                 
-                all_stories.append({
-                    "title": post_data.get("title", ""),
-                    "url": final_url,
-                    "points": post_data.get("score", 0),
-                    "comments": post_data.get("num_comments", 0),
-                    "author": post_data.get("author", ""),
-                    "source": f"r/{subreddit}",
-                })
+                all_stories.append(make_story(
+                    post_data.get("title"), final_url, f"r/{subreddit}",
+                    author=post_data.get("author"),
+                    points=post_data.get("score"),
+                    comments=post_data.get("num_comments"),
+                ))
             
             time.sleep(0.5)
                     
@@ -564,11 +583,10 @@ def fetch_reddit_tech_stories(limit: int = 10) -> List[Dict]:
             print(f"Error fetching from r/{subreddit}: {e}", file=sys.stderr)
             continue
     
-    all_stories.sort(key=lambda x: x.get("points", 0), reverse=True)
-    return all_stories[:limit]
+    return StoryBatch(all_stories).ranked().top(limit)
 
 
-def fetch_tech_news(limit: int = 10) -> List[Dict]:
+def fetch_tech_news(limit: int = 10) -> List[Story]:
     """Fetch tech news from multiple sources."""
     all_stories = []
     
@@ -584,29 +602,20 @@ def fetch_tech_news(limit: int = 10) -> List[Dict]:
     reddit_stories = fetch_reddit_tech_stories(limit=limit)
     all_stories.extend(reddit_stories)
     
-    # Deduplicate
-    seen_titles = set()
-    unique_stories = []
-    for story in all_stories:
-        title_key = story.get("title", "").lower().strip()
-        if title_key and title_key not in seen_titles:
-            seen_titles.add(title_key)
-            unique_stories.append(story)
-    
-    # Sort by points/engagement
-    unique_stories.sort(key=lambda x: x.get("points", 0), reverse=True)
-    return unique_stories[:limit]
+    # Deduplicate, then sort by points/engagement
+    return StoryBatch(all_stories).dedupe().ranked().top(limit)
 
 
 # ============ MOTIVATION QUOTES FUNCTIONS ============
 
-def fetch_reddit_quotes_with_firecrawl(subreddits: List[str], limit: int = 10, api_key: Optional[str] = None) -> List[Dict]:
+def fetch_reddit_quotes_with_firecrawl(subreddits: List[str], limit: int = 10, api_key: Optional[str] = None) -> List[Story]:
     """
     Fetch quotes from Reddit subreddits using Firecrawl to scrape actual post content.
     First gets post URLs from Reddit JSON API, then uses Firecrawl to scrape full content.
     """
     if not FIRECRAWL_AVAILABLE or not api_key:
         return []
+    from firecrawl import FirecrawlApp
     
     all_items = []
     
@@ -619,7 +628,7 @@ def fetch_reddit_quotes_with_firecrawl(subreddits: List[str], limit: int = 10, a
             try:
                 url = f"https://www.reddit.com/r/{subreddit}/hot.json"
                 params = {"limit": 25}
-                response = requests.get(url, headers=REDDIT_HEADERS, params=params, timeout=30)
+                response = clients.http_session().get(url, headers=REDDIT_HEADERS, params=params, timeout=30)
                 response.raise_for_status()
                 data = response.json()
                 posts = data.get("data", {}).get("children", [])
@@ -673,15 +682,13 @@ def fetch_reddit_quotes_with_firecrawl(subreddits: List[str], limit: int = 10, a
                     continue
                 
                 # Use title from Reddit API, content from Firecrawl
-                all_items.append({
-                    "content": content[:500],  # Limit length
-                    "title": post_info["title"][:200],
-                    "url": post_info["url"],
-                    "points": post_info["score"],
-                    "comments": post_info["comments"],
-                    "author": post_info["author"],
-                    "source": f"r/{post_info['subreddit']}",
-                })
+                all_items.append(make_story(
+                    post_info["title"][:200], post_info["url"], f"r/{post_info['subreddit']}",
+                    author=post_info["author"],
+                    points=post_info["score"],
+                    comments=post_info["comments"],
+                    content=content[:500],  # Limit length
+                ))
                 
                 # Rate limiting for Firecrawl
                 time.sleep(1)
@@ -693,8 +700,7 @@ def fetch_reddit_quotes_with_firecrawl(subreddits: List[str], limit: int = 10, a
         print(f"Total items collected via Firecrawl: {len(all_items)}", file=sys.stderr)
         
         # Sort by score and return top items
-        all_items.sort(key=lambda x: (x.get("points", 0), x.get("comments", 0)), reverse=True)
-        return all_items[:limit]
+        return StoryBatch(all_items).ranked(with_comments=True).top(limit)
         
     except Exception as e:
         print(f"Error in Firecrawl fetching: {e}", file=sys.stderr)
@@ -703,8 +709,10 @@ def fetch_reddit_quotes_with_firecrawl(subreddits: List[str], limit: int = 10, a
         return []
 
 
-def fetch_reddit_quotes(subreddits: List[str], limit: int = 10) -> List[Dict]:
+def fetch_reddit_quotes(subreddits: List[str], limit: int = 10) -> List[Story]:
     """Fetch quotes from Reddit subreddits."""
+    import requests
+
     all_items = []
     
     for subreddit in subreddits:
@@ -713,7 +721,7 @@ def fetch_reddit_quotes(subreddits: List[str], limit: int = 10) -> List[Dict]:
             url = f"https://www.reddit.com/r/{subreddit}/hot.json"
             params = {"limit": 25}
             
-            response = requests.get(url, headers=REDDIT_HEADERS, params=params, timeout=30)
+            response = clients.http_session().get(url, headers=REDDIT_HEADERS, params=params, timeout=30)
             response.raise_for_status()
             data = response.json()
             
@@ -749,15 +757,13 @@ def fetch_reddit_quotes(subreddits: List[str], limit: int = 10) -> List[Dict]:
                 if content:
                     reddit_url = f"https://www.reddit.com{post_data.get('permalink', '')}"
                     
-                    all_items.append({
-                        "content": content,
-                        "title": title,
-                        "url": reddit_url,
-                        "points": post_data.get("score", 0),
-                        "comments": post_data.get("num_comments", 0),
-                        "author": post_data.get("author", ""),
-                        "source": f"r/{subreddit}",
-                    })
+                    all_items.append(make_story(
+                        title, reddit_url, f"r/{subreddit}",
+                        author=post_data.get("author"),
+                        points=post_data.get("score"),
+                        comments=post_data.get("num_comments"),
+                        content=content,
+                    ))
             
             # Rate limiting - be nice to Reddit
             time.sleep(1)
@@ -779,11 +785,10 @@ def fetch_reddit_quotes(subreddits: List[str], limit: int = 10) -> List[Dict]:
     print(f"Total items collected: {len(all_items)}", file=sys.stderr)
     
     # Sort by score and return top items
-    all_items.sort(key=lambda x: (x.get("points", 0), x.get("comments", 0)), reverse=True)
-    return all_items[:limit]
+    return StoryBatch(all_items).ranked(with_comments=True).top(limit)
 
 
-def fetch_motivation_quotes(limit: int = 10) -> List[Dict]:
+def fetch_motivation_quotes(limit: int = 10) -> List[Story]:
     """Fetch motivation quotes from Reddit, using Firecrawl if available."""
     print("Fetching motivation quotes...", file=sys.stderr)
     # Try multiple subreddits - Reddit is case-insensitive but some subreddits may have different names
@@ -804,7 +809,7 @@ def fetch_motivation_quotes(limit: int = 10) -> List[Dict]:
 
 # ============ WISE KNOWLEDGE FUNCTIONS ============
 
-def fetch_wise_knowledge(limit: int = 10) -> List[Dict]:
+def fetch_wise_knowledge(limit: int = 10) -> List[Story]:
     """Fetch wise knowledge from Reddit philosophy/stoicism subreddits, using Firecrawl if available."""
     print("Fetching wise knowledge...", file=sys.stderr)
     subreddits = ["Stoicism", "philosophy", "ZenHabits", "Meditation", "Mindfulness", "zen", "taoism", "selfimprovement"]
@@ -841,7 +846,7 @@ def generate_ai_summary(stories: List[Dict], api_key: str, content_type: str = "
 Summarize the main themes, key insights, or noteworthy developments."""
 
     try:
-        client = OpenAI(api_key=api_key)
+        client = clients.openai_client(api_key)
         
         response = client.chat.completions.create(
             model="gpt-4-turbo-preview",
@@ -863,6 +868,145 @@ Summarize the main themes, key insights, or noteworthy developments."""
 
 # ============ MARKDOWN FORMATTING ============
 
+def build_image_fingerprint(
+    ai_stories: List[Dict], ai_summary: str,
+    business_stories: List[Dict], business_summary: str,
+    tech_stories: List[Dict], tech_summary: str,
+    podcasts_summary: str,
+) -> Dict:
+    """Fingerprint the inputs of generate_pointillism_image (headlines plus summaries)."""
+    headlines = [
+        story.get('title', '')
+        for stories in (ai_stories, business_stories, tech_stories)
+        for story in stories[:3]
+    ]
+    text = "\n".join(headlines + [ai_summary, business_summary, tech_summary, podcasts_summary])
+    tokens = sorted(set(re.findall(r"[a-z0-9]{3,}", text.lower())))
+    return {
+        "hash": hashlib.sha256(text.encode("utf-8")).hexdigest(),
+        "tokens": tokens,
+    }
+
+
+def fingerprint_similarity(current: Dict, previous: Dict) -> float:
+    """Jaccard similarity between two image fingerprints (1.0 for identical inputs)."""
+    if current.get("hash") and current.get("hash") == previous.get("hash"):
+        return 1.0
+    current_tokens = set(current.get("tokens", []))
+    previous_tokens = set(previous.get("tokens", []))
+    union = current_tokens | previous_tokens
+    if not union:
+        return 0.0
+    return len(current_tokens & previous_tokens) / len(union)
+
+
+def load_image_fingerprint(path: str = IMAGE_FINGERPRINT_PATH) -> Optional[Dict]:
+    """Load the fingerprint saved by the previous image generation, if any."""
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"Warning: Could not read image fingerprint: {e}", file=sys.stderr)
+        return None
+
+
+def save_image_fingerprint(
+    fingerprint: Dict, image_path: str, date: str, generation_seconds: float,
+    path: str = IMAGE_FINGERPRINT_PATH
+):
+    """Persist the fingerprint of a freshly generated image for the next run."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    record = {
+        "date": date,
+        "image_path": image_path,
+        "generation_seconds": round(generation_seconds, 2),
+        "hash": fingerprint["hash"],
+        "tokens": fingerprint["tokens"],
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(record, f, ensure_ascii=False)
+
+
+def find_reusable_image(fingerprint: Dict, threshold: float) -> tuple[Optional[Dict], float]:
+    """
+    Return the previous fingerprint record if its image can be reused, plus the similarity.
+    The previous image is reused only if it still exists on disk.
+    """
+    previous = load_image_fingerprint()
+    if not previous or not previous.get("image_path"):
+        return None, 0.0
+    
+    similarity = fingerprint_similarity(fingerprint, previous)
+    previous_file = os.path.join(get_project_root(), previous["image_path"])
+    if similarity >= threshold and os.path.exists(previous_file):
+        return previous, similarity
+    return None, similarity
+
+
+def is_valid_png(filepath: str) -> bool:
+    """Check that a saved image has a plausible size and a PNG header."""
+    try:
+        if os.path.getsize(filepath) < MIN_IMAGE_BYTES:
+            return False
+        with open(filepath, "rb") as f:
+            return f.read(len(PNG_SIGNATURE)) == PNG_SIGNATURE
+    except OSError:
+        return False
+
+
+def save_b64_image(b64_data: str, filepath: str) -> bool:
+    """
+    Decode a base64 image payload to disk in chunks and verify it.
+    Writes to a temp file and renames it into place only if the PNG checks pass.
+    """
+    tmp_path = f"{filepath}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            for start in range(0, len(b64_data), B64_CHUNK_SIZE):
+                f.write(base64.b64decode(b64_data[start:start + B64_CHUNK_SIZE], validate=True))
+        
+        if not is_valid_png(tmp_path):
+            print("Warning: Decoded image failed PNG integrity check", file=sys.stderr)
+            os.remove(tmp_path)
+            return False
+        
+        os.replace(tmp_path, filepath)
+        return True
+    except (ValueError, OSError) as e:
+        print(f"Warning: Could not decode inline image: {e}", file=sys.stderr)
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return False
+
+
+def download_image(image_url: str, filepath: str) -> bool:
+    """Fallback: download the generated image from its CDN URL and verify it."""
+    import requests
+
+    tmp_path = f"{filepath}.tmp"
+    try:
+        with clients.http_session().get(image_url, timeout=30, stream=True) as img_response:
+            img_response.raise_for_status()
+            with open(tmp_path, "wb") as f:
+                for chunk in img_response.iter_content(chunk_size=B64_CHUNK_SIZE):
+                    f.write(chunk)
+        
+        if not is_valid_png(tmp_path):
+            print("Warning: Downloaded image failed PNG integrity check", file=sys.stderr)
+            os.remove(tmp_path)
+            return False
+        
+        os.replace(tmp_path, filepath)
+        return True
+    except (requests.exceptions.RequestException, OSError) as e:
+        print(f"Warning: Could not download image: {e}", file=sys.stderr)
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return False
+
+
 def generate_pointillism_image(
     ai_stories: List[Dict], ai_summary: str,
     business_stories: List[Dict], business_summary: str,
@@ -906,7 +1050,7 @@ Create a description of a stunning digital pointillism artwork that:
 Return ONLY the visual description (no explanation, no markdown, just the description)."""
     
     try:
-        client = OpenAI(api_key=api_key)
+        client = clients.openai_client(api_key)
         
         # Generate the image description
         response = client.chat.completions.create(
@@ -932,23 +1076,26 @@ Return ONLY the visual description (no explanation, no markdown, just the descri
             size="1024x1024",
             quality="standard",
             n=1,
+            response_format="b64_json",
         )
         
-        image_url = image_response.data[0].url
+        image_data = image_response.data[0]
         
-        # Download and save the image
-        # Use absolute path relative to script's directory or project root
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        project_root = os.path.dirname(script_dir)
-        image_dir = os.path.join(project_root, "image", "daily-digest")
+        # Save the image (inline base64 payload, CDN URL only as a fallback)
+        # Use absolute path relative to project root
+        image_dir = os.path.join(get_project_root(), "image", "daily-digest")
         os.makedirs(image_dir, exist_ok=True)
         image_filename = os.path.join(image_dir, f"{date}-pointillism.png")
         
-        img_response = requests.get(image_url, timeout=30)
-        img_response.raise_for_status()
-        
-        with open(image_filename, "wb") as f:
-            f.write(img_response.content)
+        saved = False
+        if getattr(image_data, "b64_json", None):
+            saved = save_b64_image(image_data.b64_json, image_filename)
+        if not saved and getattr(image_data, "url", None):
+            print("Falling back to downloading image from URL...", file=sys.stderr)
+            saved = download_image(image_data.url, image_filename)
+        if not saved:
+            print("Error: No valid image payload returned", file=sys.stderr)
+            return None
         
         # Return relative path for markdown (from project root)
         relative_path = f"image/daily-digest/{date}-pointillism.png"
@@ -965,230 +1112,170 @@ Return ONLY the visual description (no explanation, no markdown, just the descri
 
 def format_ai_markdown(stories: List[Dict], summary: str, date: str, image_path: Optional[str] = None) -> str:
     """Format AI news section as markdown."""
-    lines = [
-        f"## 🤖 AI Industry Snapshot - {date}",
-        "",
-        "### Top AI Stories",
-        "",
-    ]
-    
-    for i, story in enumerate(stories, 1):
-        primary_url = story.get('hn_url') or story.get('url', 'https://news.ycombinator.com/newest')
-        if not validate_url(primary_url):
-            primary_url = 'https://news.ycombinator.com/newest'
-        
-        lines.append(f"{i}. [{story['title']}]({primary_url})")
-        lines.append("")
-    
-    lines.extend([
-        "### AI Trends Summary",
-        "",
-        summary,
-        "",
-    ])
-    
-    return "\n".join(lines)
+    return digest_templates.render_markdown("ai_news", {"stories": stories, "summary": summary}, date)
 
 
 def format_digital_art_markdown(image_path: Optional[str], date: str) -> str:
     """Format digital art section as markdown."""
-    if not image_path:
-        return ""
-    
-    return f"""### 🎨 Digital Art: Pointillism & Motion Design
-
-*Inspired by today's news trends across AI, Business, Tech, and Podcasts*
-
-![Digital Pointillism Artwork]({image_path})
-"""
+    return digest_templates.render_digital_art_markdown(image_path)
 
 
 def format_news_markdown(stories: List[Dict], summary: str, date: str, section_title: str, emoji: str) -> str:
     """Format news section (business/tech) as markdown."""
-    lines = [
-        f"## {emoji} {section_title} - {date}",
-        "",
-        "### Top Stories",
-        "",
-    ]
-    
-    for i, story in enumerate(stories, 1):
-        url = story.get('url', '#')
-        if not validate_url(url):
-            url = '#'
-        lines.append(f"{i}. [{story['title']}]({url})")
-        lines.append("")
-    
-    lines.extend([
-        "### Summary",
-        "",
-        summary,
-        "",
-    ])
-    
-    return "\n".join(lines)
+    spec = digest_templates.SectionSpec("news", section_title, emoji)
+    return digest_templates.render_section_markdown(spec, digest_templates.build_section(spec, stories, summary), date)
 
 
 def format_quotes_markdown(items: List[Dict], summary: str, date: str, section_title: str, emoji: str) -> str:
     """Format quotes/knowledge section as markdown."""
-    lines = [
-        f"## {emoji} {section_title} - {date}",
-        "",
-        "### Top Items",
-        "",
-    ]
-    
-    for i, item in enumerate(items, 1):
-        content = item.get('content', item.get('title', ''))
-        url = item.get('url', '#')
-        if not validate_url(url):
-            url = '#'
-        source = item.get('source', 'Unknown')
-        
-        lines.append(f"{i}. {content}")
-        lines.append(f"   *Source: [{source}]({url})*")
-        lines.append("")
-    
-    lines.extend([
-        "### Summary",
-        "",
-        summary,
-        "",
-    ])
-    
-    return "\n".join(lines)
+    spec = digest_templates.SectionSpec("quotes", section_title, emoji, kind="items", list_heading="Top Items")
+    return digest_templates.render_section_markdown(spec, digest_templates.build_section(spec, items, summary), date)
 
 
 # ============ MAIN FUNCTION ============
 
-def main():
-    """Main execution function."""
+def build_digest() -> Dict:
+    """
+    Fetch every section, summarize and generate the image. Returns the digest;
+    raises on failure. Archiving is a separate step (archive_digest), so the
+    pipeline can merge the podcast section in first.
+    """
+    openai_key = get_openai_key()
+    date_str = datetime.now().strftime("%Y-%m-%d")
+    
+    output = {
+        "date": date_str,
+        "ai_news": {"markdown": "", "stories": [], "summary": "", "image_path": None},
+        "business_news": {"markdown": "", "stories": [], "summary": ""},
+        "tech_news": {"markdown": "", "stories": [], "summary": ""},
+        "podcasts": {"markdown": "", "podcasts": [], "summary": ""},
+        "motivation_quotes": {"markdown": "", "items": [], "summary": ""},
+        "wise_knowledge": {"markdown": "", "items": [], "summary": ""},
+    }
+    
+    # Fetch AI News
+    print("Fetching AI news...", file=sys.stderr)
+    all_ai_stories = []
+    
+    # Fetch from YouTube (if API key available)
     try:
-        openai_key = get_openai_key()
-        date_str = datetime.now().strftime("%Y-%m-%d")
-        
-        output = {
-            "date": date_str,
-            "ai_news": {"markdown": "", "stories": [], "summary": "", "image_path": None},
-            "business_news": {"markdown": "", "stories": [], "summary": ""},
-            "tech_news": {"markdown": "", "stories": [], "summary": ""},
-            "podcasts": {"markdown": "", "podcasts": [], "summary": ""},
-            "motivation_quotes": {"markdown": "", "items": [], "summary": ""},
-            "wise_knowledge": {"markdown": "", "items": [], "summary": ""},
-        }
-        
-        # Fetch AI News
-        print("Fetching AI news...", file=sys.stderr)
-        all_ai_stories = []
-        
-        # Fetch from YouTube (if API key available)
-        try:
-            youtube_ai = fetch_youtube_ai_stories(limit=5)
-            all_ai_stories.extend(youtube_ai)
-            print(f"Found {len(youtube_ai)} AI stories from YouTube", file=sys.stderr)
-        except Exception as e:
-            print(f"YouTube fetch skipped: {e}", file=sys.stderr)
-        
-        # Fetch from Twitter/X (if API key available)
-        try:
-            twitter_ai = fetch_twitter_ai_stories(limit=5)
-            all_ai_stories.extend(twitter_ai)
-            print(f"Found {len(twitter_ai)} AI stories from Twitter/X", file=sys.stderr)
-        except Exception as e:
-            print(f"Twitter fetch skipped: {e}", file=sys.stderr)
-        
-        reddit_ai = fetch_reddit_ai_stories(limit=5)
-        tc_ai = fetch_techcrunch_ai_stories(limit=5)
-        hn_ai = fetch_hacker_news_ai_stories(limit=5)
-        all_ai_stories.extend(reddit_ai)
-        all_ai_stories.extend(tc_ai)
-        all_ai_stories.extend(hn_ai)
-        
-        # Deduplicate AI stories
-        seen_ai = set()
-        unique_ai = []
-        for story in all_ai_stories:
-            title_key = story.get("title", "").lower().strip()
-            if title_key and title_key not in seen_ai:
-                seen_ai.add(title_key)
-                unique_ai.append(story)
-        unique_ai = unique_ai[:10]
-        
-        if unique_ai:
-            ai_summary = generate_ai_summary(unique_ai, openai_key, "AI")
-        else:
-            ai_summary = "No AI stories found today."
-        
-        output["ai_news"]["markdown"] = format_ai_markdown(unique_ai[:10], ai_summary, date_str)
-        output["ai_news"]["stories"] = unique_ai[:10]
-        output["ai_news"]["summary"] = ai_summary
-        
-        # Fetch Business News
-        print("Fetching business news...", file=sys.stderr)
-        business_stories = fetch_business_news(limit=10)
-        if business_stories:
-            business_summary = generate_ai_summary(business_stories, openai_key, "Business")
-        else:
-            business_summary = "No business news found today."
-        
-        output["business_news"]["markdown"] = format_news_markdown(business_stories, business_summary, date_str, "Business News", "💼")
-        output["business_news"]["stories"] = business_stories
-        output["business_news"]["summary"] = business_summary
-        
-        # Fetch Tech News
-        print("Fetching tech news...", file=sys.stderr)
-        tech_stories = fetch_tech_news(limit=10)
-        if tech_stories:
-            tech_summary = generate_ai_summary(tech_stories, openai_key, "Tech")
-        else:
-            tech_summary = "No tech news found today."
-        
-        output["tech_news"]["markdown"] = format_news_markdown(tech_stories, tech_summary, date_str, "Tech News", "💻")
-        output["tech_news"]["stories"] = tech_stories
-        output["tech_news"]["summary"] = tech_summary
-        
-        # Fetch Motivation Quotes
-        print("Fetching motivation quotes...", file=sys.stderr)
-        quotes = fetch_motivation_quotes(limit=10)
-        if quotes:
-            quotes_summary = generate_ai_summary(quotes, openai_key, "Motivation")
-        else:
-            quotes_summary = "No motivation quotes found today."
-        
-        output["motivation_quotes"]["markdown"] = format_quotes_markdown(quotes, quotes_summary, date_str, "Motivation Quotes", "💪")
-        output["motivation_quotes"]["items"] = quotes
-        output["motivation_quotes"]["summary"] = quotes_summary
-        
-        # Fetch Wise Knowledge
-        print("Fetching wise knowledge...", file=sys.stderr)
-        knowledge = fetch_wise_knowledge(limit=10)
-        if knowledge:
-            knowledge_summary = generate_ai_summary(knowledge, openai_key, "Wisdom")
+        youtube_ai = fetch_youtube_ai_stories(limit=5)
+        all_ai_stories.extend(youtube_ai)
+        print(f"Found {len(youtube_ai)} AI stories from YouTube", file=sys.stderr)
+    except Exception as e:
+        print(f"YouTube fetch skipped: {e}", file=sys.stderr)
+    
+    # Fetch from Twitter/X (if API key available)
+    try:
+        twitter_ai = fetch_twitter_ai_stories(limit=5)
+        all_ai_stories.extend(twitter_ai)
+        print(f"Found {len(twitter_ai)} AI stories from Twitter/X", file=sys.stderr)
+    except Exception as e:
+        print(f"Twitter fetch skipped: {e}", file=sys.stderr)
+    
+    reddit_ai = fetch_reddit_ai_stories(limit=5)
+    tc_ai = fetch_techcrunch_ai_stories(limit=5)
+    hn_ai = fetch_hacker_news_ai_stories(limit=5)
+    all_ai_stories.extend(reddit_ai)
+    all_ai_stories.extend(tc_ai)
+    all_ai_stories.extend(hn_ai)
+    
+    # Deduplicate AI stories (records become plain dicts from here on)
+    unique_ai = stories_to_dicts(StoryBatch(all_ai_stories).dedupe().top(10))
+    
+    if unique_ai:
+        ai_summary = generate_ai_summary(unique_ai, openai_key, "AI")
+    else:
+        ai_summary = "No AI stories found today."
+    
+    output["ai_news"]["stories"] = unique_ai[:10]
+    output["ai_news"]["summary"] = ai_summary
+    
+    # Fetch Business News
+    print("Fetching business news...", file=sys.stderr)
+    business_stories = stories_to_dicts(fetch_business_news(limit=10))
+    if business_stories:
+        business_summary = generate_ai_summary(business_stories, openai_key, "Business")
+    else:
+        business_summary = "No business news found today."
+    
+    output["business_news"]["stories"] = business_stories
+    output["business_news"]["summary"] = business_summary
+    
+    # Fetch Tech News
+    print("Fetching tech news...", file=sys.stderr)
+    tech_stories = stories_to_dicts(fetch_tech_news(limit=10))
+    if tech_stories:
+        tech_summary = generate_ai_summary(tech_stories, openai_key, "Tech")
+    else:
+        tech_summary = "No tech news found today."
+    
+    output["tech_news"]["stories"] = tech_stories
+    output["tech_news"]["summary"] = tech_summary
+    
+    # Fetch Motivation Quotes
+    print("Fetching motivation quotes...", file=sys.stderr)
+    quotes = stories_to_dicts(fetch_motivation_quotes(limit=10))
+    if quotes:
+        quotes_summary = generate_ai_summary(quotes, openai_key, "Motivation")
+    else:
+        quotes_summary = "No motivation quotes found today."
+    
+    output["motivation_quotes"]["items"] = quotes
+    output["motivation_quotes"]["summary"] = quotes_summary
+    
+    # Fetch Wise Knowledge
+    print("Fetching wise knowledge...", file=sys.stderr)
+    knowledge = stories_to_dicts(fetch_wise_knowledge(limit=10))
+    if knowledge:
+        knowledge_summary = generate_ai_summary(knowledge, openai_key, "Wisdom")
+    else:
+        knowledge_summary = "No wise knowledge found today."
+    
+    output["wise_knowledge"]["items"] = knowledge
+    output["wise_knowledge"]["summary"] = knowledge_summary
+    
+    # Render every section's markdown in one pass over the structured digest
+    rendered = digest_templates.render_digest(output)
+    for section in digest_templates.SECTIONS_BY_KEY:
+        output[section]["markdown"] = rendered["markdown"][section]
+    
+    # Fetch Podcasts (if summarize_podcasts.py output is available)
+    # This will be populated by calling summarize_podcasts.py separately in the workflow
+    # For now, set empty placeholder
+    podcasts_summary_text = output.get("podcasts", {}).get("summary", "")
+    if not podcasts_summary_text:
+        # Try to extract from markdown if available
+        podcasts_markdown = output.get("podcasts", {}).get("markdown", "")
+        if podcasts_markdown:
+            # Extract summary from podcast markdown if possible
+            podcasts_summary_text = "Today's podcast discussions cover trending topics and insights."
         else:
-            knowledge_summary = "No wise knowledge found today."
-        
-        output["wise_knowledge"]["markdown"] = format_quotes_markdown(knowledge, knowledge_summary, date_str, "Wise Knowledge", "🧠")
-        output["wise_knowledge"]["items"] = knowledge
-        output["wise_knowledge"]["summary"] = knowledge_summary
-        
-        # Fetch Podcasts (if summarize_podcasts.py output is available)
-        # This will be populated by calling summarize_podcasts.py separately in the workflow
-        # For now, set empty placeholder
-        podcasts_summary_text = output.get("podcasts", {}).get("summary", "")
-        if not podcasts_summary_text:
-            # Try to extract from markdown if available
-            podcasts_markdown = output.get("podcasts", {}).get("markdown", "")
-            if podcasts_markdown:
-                # Extract summary from podcast markdown if possible
-                podcasts_summary_text = "Today's podcast discussions cover trending topics and insights."
+            podcasts_summary_text = "No podcast summaries available today."
+    
+    # Generate pointillism image inspired by ALL news trends and podcasts
+    # Skipped (previous image reused) when the inputs barely changed since the last generation
+    image_path = None
+    image_metrics = {"reused": False, "similarity": 0.0, "generation_seconds": 0.0, "saved_seconds": 0.0}
+    try:
+        if unique_ai or business_stories or tech_stories:
+            fingerprint = build_image_fingerprint(
+                unique_ai[:10], ai_summary,
+                business_stories, business_summary,
+                tech_stories, tech_summary,
+                podcasts_summary_text,
+            )
+            threshold = get_image_reuse_threshold()
+            previous, similarity = find_reusable_image(fingerprint, threshold)
+            image_metrics["similarity"] = round(similarity, 3)
+    
+            if previous:
+                image_path = previous["image_path"]
+                image_metrics["reused"] = True
+                image_metrics["saved_seconds"] = previous.get("generation_seconds", 0.0)
+                print(f"News mix {similarity:.0%} similar to {previous.get('date', 'previous run')} (threshold {threshold:.0%}), reusing image: {image_path}", file=sys.stderr)
             else:
-                podcasts_summary_text = "No podcast summaries available today."
-        
-        # Generate pointillism image inspired by ALL news trends and podcasts
-        image_path = None
-        try:
-            if unique_ai or business_stories or tech_stories:
-                print("Generating digital pointillism artwork inspired by all news trends...", file=sys.stderr)
+                started = time.monotonic()
                 image_path = generate_pointillism_image(
                     unique_ai[:10], ai_summary,
                     business_stories, business_summary,
@@ -1196,63 +1283,121 @@ def main():
                     podcasts_summary_text,
                     openai_key, date_str
                 )
+                image_metrics["generation_seconds"] = round(time.monotonic() - started, 2)
                 if image_path:
                     print(f"Successfully generated image: {image_path}", file=sys.stderr)
+                    save_image_fingerprint(fingerprint, image_path, date_str, image_metrics["generation_seconds"])
                 else:
                     print("Warning: Image generation returned None", file=sys.stderr)
-        except Exception as e:
-            print(f"Error during image generation (continuing anyway): {e}", file=sys.stderr)
-            import traceback
-            print(traceback.format_exc(), file=sys.stderr)
-            image_path = None
-        
-        # Add image path and formatted markdown to output
-        output["image_path"] = image_path
-        output["digital_art_markdown"] = format_digital_art_markdown(image_path, date_str)
-        
-        # Save to archive
-        archive_dir = "archive"
-        os.makedirs(archive_dir, exist_ok=True)
-        archive_path = os.path.join(archive_dir, f"{date_str}-digest.json")
+    except Exception as e:
+        print(f"Error during image generation (continuing anyway): {e}", file=sys.stderr)
+        import traceback
+        print(traceback.format_exc(), file=sys.stderr)
+        image_path = None
+    
+    # Add image path and formatted markdown to output
+    output["image_path"] = image_path
+    output["digital_art_markdown"] = format_digital_art_markdown(image_path, date_str)
+    output["metrics"] = {"image": image_metrics}
+    
+    return output
+
+
+def archive_digest(output: Dict) -> Dict:
+    """
+    Save a finished digest (podcasts merged in) to the archive, index it in the
+    archive store and update the rollups and trends. Returns the digest with its
+    rollups and trends sections added.
+    """
+    date_str = output["date"]
+    
+    # Save to archive (compact gzip JSON Lines unless ARCHIVE_FORMAT=json)
+    archive_dir = "archive"
+    os.makedirs(archive_dir, exist_ok=True)
+    if os.getenv("ARCHIVE_FORMAT", "compact").lower() == "json":
+        archive_path = archive_format.legacy_path(archive_dir, date_str)
         with open(archive_path, "w", encoding="utf-8") as f:
             json.dump(output, f, indent=2, ensure_ascii=False)
-        print(f"Archive saved to {archive_path}", file=sys.stderr)
-        
+    else:
+        archive_path = archive_format.write_compact_digest(output, archive_dir)
+    print(f"Archive saved to {archive_path}", file=sys.stderr)
+    
+    # Index into the SQLite archive store (backfilling old JSON archives on first use)
+    try:
+        conn = archive_store.connect()
+        try:
+            if not conn.execute("SELECT 1 FROM digests LIMIT 1").fetchone():
+                imported = archive_store.import_json_archive(conn, archive_dir)
+                print(f"Backfilled archive store with {imported} digests", file=sys.stderr)
+            archive_store.store_digest(conn, output)
+        finally:
+            conn.close()
+        print(f"Archive store updated at {archive_store.get_db_path()}", file=sys.stderr)
+    except Exception as e:
+        print(f"Warning: Could not update archive store: {e}", file=sys.stderr)
+    
+    # Fold today's digest into the weekly/monthly rollup aggregates
+    try:
+        updated_rollups = rollups.update_rollups(output, archive_dir=archive_dir)
+        output["rollups"] = {
+            kind: {
+                "period": aggregate["period"],
+                "markdown": rollups.format_rollup_markdown(aggregate, f"{kind.capitalize()} Rollup"),
+            }
+            for kind, aggregate in updated_rollups.items()
+        }
+    except Exception as e:
+        print(f"Warning: Could not update rollups: {e}", file=sys.stderr)
+    
+    # Append today's column to the trend matrix and render "Trending This Week"
+    try:
+        import trends  # loads NumPy
+        current_trends = trends.update_trends(output, archive_dir=archive_dir)
+        if current_trends:
+            output["trends"] = {
+                "markdown": trends.format_trends_markdown(current_trends),
+                "rising": current_trends["rising"],
+                "falling": current_trends["falling"],
+                "novel": current_trends["novel"],
+                "sources": current_trends["sources"],
+            }
+    except Exception as e:
+        print(f"Warning: Could not update trends: {e}", file=sys.stderr)
+    
+    return output
+
+
+def fallback_digest(error: str) -> Dict:
+    """Digest emitted when the content stage fails, so later stages still run."""
+    date_str = datetime.now().strftime("%Y-%m-%d")
+    return {
+        "date": date_str,
+        "error": error,
+        "ai_news": {"markdown": f"## 🤖 AI Industry Snapshot - {date_str}\n\n*Error: {error}*\n", "stories": [], "summary": "", "image_path": None},
+        "business_news": {"markdown": "", "stories": [], "summary": ""},
+        "tech_news": {"markdown": "", "stories": [], "summary": ""},
+        "motivation_quotes": {"markdown": "", "items": [], "summary": ""},
+        "wise_knowledge": {"markdown": "", "items": [], "summary": ""},
+    }
+
+
+def main():
+    """Main execution function."""
+    try:
         # Output JSON for other scripts
-        print(json.dumps(output))
+        print(json.dumps(archive_digest(build_digest())))
         
     except ValueError as e:
         print(f"Configuration Error: {e}", file=sys.stderr)
-        date_str = datetime.now().strftime("%Y-%m-%d")
-        fallback = {
-            "date": date_str,
-            "error": str(e),
-            "ai_news": {"markdown": f"## 🤖 AI Industry Snapshot - {date_str}\n\n*Error: {str(e)}*\n", "stories": [], "summary": "", "image_path": None},
-            "business_news": {"markdown": "", "stories": [], "summary": ""},
-            "tech_news": {"markdown": "", "stories": [], "summary": ""},
-            "motivation_quotes": {"markdown": "", "items": [], "summary": ""},
-            "wise_knowledge": {"markdown": "", "items": [], "summary": ""},
-        }
-        print(json.dumps(fallback))
+        print(json.dumps(fallback_digest(str(e))))
         sys.exit(1)
     except Exception as e:
         print(f"Error: {e}", file=sys.stderr)
         import traceback
         print(traceback.format_exc(), file=sys.stderr)
-        date_str = datetime.now().strftime("%Y-%m-%d")
-        fallback = {
-            "date": date_str,
-            "error": str(e),
-            "ai_news": {"markdown": f"## 🤖 AI Industry Snapshot - {date_str}\n\n*Error: {str(e)}*\n", "stories": [], "summary": "", "image_path": None},
-            "business_news": {"markdown": "", "stories": [], "summary": ""},
-            "tech_news": {"markdown": "", "stories": [], "summary": ""},
-            "motivation_quotes": {"markdown": "", "items": [], "summary": ""},
-            "wise_knowledge": {"markdown": "", "items": [], "summary": ""},
-        }
-        print(json.dumps(fallback))
+        print(json.dumps(fallback_digest(str(e))))
         sys.exit(1)
 
 
 if __name__ == "__main__":
     main()
-
@@ -2,15 +2,37 @@
 """
 Fetch latest episodes from favorite podcasts and generate summaries.
 Podcasts: All In, Pivot, Lenny Podcast, Joe Rogan (from YouTube).
+
+Each channel's ID and uploads playlist are resolved once and kept in a channel
+cache (.cache/youtube_channels.json); latest episodes are then read from the
+uploads playlist (playlistItems.list, 1 quota unit) instead of search.list
+(100 units). Search is only the fallback for channels that can't be resolved.
+Channels are processed concurrently: each channel's lookup is its own task, and
+its summary starts as soon as its episode is found. YouTube and OpenAI calls go
+through shared rate limiters (clients.rate_limiter). Once every channel's latest
+video ID is known, durations and view counts are looked up for all of them in
+one batched videos.list call.
+
+When a transcript of an episode has been downloaded (see transcripts.py), the
+summary is built from the full transcript instead of the description.
 """
 
 import os
 import sys
 import json
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import List, Dict, Optional
-from datetime import datetime, timedelta
-import requests
-from openai import OpenAI
+from datetime import datetime, timedelta, timezone
+
+import clients
+import digest_templates
+import transcripts
+import youtube
+
+
+DEFAULT_CHANNEL_CACHE_PATH = os.path.join(".cache", "youtube_channels.json")
+PLAYLIST_PAGE_SIZE = 10
+DEFAULT_PODCAST_CONCURRENCY = 8
 
 
 def get_openai_key() -> str:
@@ -26,16 +48,6 @@ def get_youtube_api_key() -> Optional[str]:
     return os.getenv("YOUTUBE_API_KEY")
 
 
-def validate_url(url: str) -> bool:
-    """Validate that a URL is properly formatted."""
-    try:
-        from urllib.parse import urlparse
-        result = urlparse(url)
-        return all([result.scheme, result.netloc])
-    except Exception:
-        return False
-
-
 # Podcast channel IDs or handles (can be found via YouTube API or channel URLs)
 PODCAST_CHANNELS = {
     "All In": {
@@ -57,119 +69,153 @@ PODCAST_CHANNELS = {
 }
 
 
-def resolve_channel_id_from_handle(handle: str, api_key: str) -> Optional[str]:
-    """Resolve a YouTube handle (e.g., 'pivot' or '@pivot') to a channel ID."""
+def get_channel_cache_path() -> str:
+    """Get YouTube channel cache path from environment or default."""
+    return os.getenv("YOUTUBE_CHANNEL_CACHE", DEFAULT_CHANNEL_CACHE_PATH)
+
+
+def load_channel_cache(path: str) -> Dict[str, Dict]:
+    """Load cached channel metadata keyed by "@handle" or channel ID."""
+    if not os.path.exists(path):
+        return {}
     try:
-        # Remove @ if present
-        handle = handle.lstrip('@')
-        
-        channels_url = "https://www.googleapis.com/youtube/v3/channels"
-        params = {
-            "part": "id",
-            "forHandle": handle,
-            "key": api_key,
-        }
-        
-        response = requests.get(channels_url, params=params, timeout=30)
-        response.raise_for_status()
-        data = response.json()
-        
-        items = data.get("items", [])
-        if items:
-            return items[0].get("id")
-        
+        with open(path, "r", encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"Warning: Could not read channel cache {path}, starting over: {e}", file=sys.stderr)
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+
+def save_channel_cache(path: str, cache: Dict[str, Dict]):
+    """Write the channel cache atomically."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(cache, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def channel_cache_key(channel_info: Dict) -> Optional[str]:
+    """Cache key for a configured channel: "@handle" or the channel ID."""
+    if channel_info.get("channel_handle"):
+        return "@" + channel_info["channel_handle"].lstrip("@").lower()
+    return channel_info.get("channel_id")
+
+
+def fetch_channel_metadata(channel_info: Dict, api_key: str) -> Optional[Dict]:
+    """
+    Look up a channel by handle or ID (channels.list, 1 quota unit).
+    Returns {"channel_id", "uploads_playlist_id"}, or None if it doesn't exist.
+    """
+    params = {"part": "id,contentDetails", "key": api_key}
+    if channel_info.get("channel_handle"):
+        params["forHandle"] = channel_info["channel_handle"].lstrip("@")
+    elif channel_info.get("channel_id"):
+        params["id"] = channel_info["channel_id"]
+    else:
+        return None
+
+    items = youtube.api_get("channels", params).get("items", [])
+    if not items:
+        return None
+
+    uploads = items[0].get("contentDetails", {}).get("relatedPlaylists", {}).get("uploads")
+    if not uploads:
         return None
+    return {"channel_id": items[0].get("id"), "uploads_playlist_id": uploads}
+
+
+def resolve_channel(channel_name: str, channel_info: Dict, api_key: str, cache: Dict[str, Dict]) -> Optional[Dict]:
+    """Channel metadata from the cache, looking it up (and caching it) on a miss."""
+    key = channel_cache_key(channel_info)
+    if not key:
+        return None
+    if key in cache:
+        return cache[key]
+
+    try:
+        metadata = fetch_channel_metadata(channel_info, api_key)
     except Exception as e:
-        print(f"Error resolving handle @{handle}: {e}", file=sys.stderr)
+        print(f"Error resolving channel for {channel_name}: {e}", file=sys.stderr)
+        return None
+    if metadata:
+        metadata["resolved_at"] = datetime.now().strftime("%Y-%m-%d")
+        cache[key] = metadata
+    return metadata
+
+
+def fetch_latest_upload(playlist_id: str, api_key: str, days_back: int = 30) -> Optional[Dict]:
+    """Newest public video in an uploads playlist published within days_back (playlistItems.list, 1 quota unit)."""
+    params = {
+        "part": "snippet,contentDetails",
+        "playlistId": playlist_id,
+        "maxResults": PLAYLIST_PAGE_SIZE,
+        "key": api_key,
+    }
+    data = youtube.api_get("playlistItems", params)
+
+    cutoff = (datetime.now(timezone.utc) - timedelta(days=days_back)).strftime("%Y-%m-%dT%H:%M:%SZ")
+    # Private and deleted videos have no videoPublishedAt
+    recent = [
+        item for item in data.get("items", [])
+        if item.get("contentDetails", {}).get("videoPublishedAt", "") >= cutoff
+        and item.get("contentDetails", {}).get("videoId")
+    ]
+    if not recent:
         return None
+    return max(recent, key=lambda item: item["contentDetails"]["videoPublishedAt"])
 
 
-def fetch_latest_podcast_episode(channel_name: str, channel_info: Dict, api_key: str, days_back: int = 30) -> Optional[Dict]:
-    """Fetch the latest episode from a podcast YouTube channel."""
+def fetch_latest_podcast_episode(
+    channel_name: str,
+    channel_info: Dict,
+    api_key: str,
+    days_back: int = 30,
+    channel_cache: Optional[Dict[str, Dict]] = None,
+) -> Optional[Dict]:
+    """
+    Fetch the latest episode from a podcast YouTube channel via its uploads playlist.
+    Views and duration are filled in later for all channels at once (add_video_details).
+    """
+    cache = channel_cache if channel_cache is not None else {}
+    channel = resolve_channel(channel_name, channel_info, api_key, cache)
+    if not channel:
+        print(f"Could not resolve channel for {channel_name}, falling back to search", file=sys.stderr)
+        return fetch_latest_podcast_by_search(channel_name, channel_info, api_key, days_back)
+
     try:
-        # Resolve channel ID if we have a handle
-        channel_id = None
-        if "channel_handle" in channel_info:
-            channel_id = resolve_channel_id_from_handle(channel_info["channel_handle"], api_key)
-            if not channel_id:
-                print(f"Could not resolve channel handle for {channel_name}, falling back to search", file=sys.stderr)
-                return fetch_latest_podcast_by_search(channel_name, channel_info, api_key, days_back)
-        elif "channel_id" in channel_info:
-            channel_id = channel_info["channel_id"]
-        else:
-            # No channel ID or handle, use search
-            return fetch_latest_podcast_by_search(channel_name, channel_info, api_key, days_back)
-        
-        # Get videos from the channel using channel ID
-        channel_url = "https://www.googleapis.com/youtube/v3/search"
-        
-        params = {
-            "part": "snippet",
-            "channelId": channel_id,
-            "type": "video",
-            "maxResults": 10,
-            "order": "date",
-            "publishedAfter": (datetime.now() - timedelta(days=days_back)).isoformat() + "Z",
-            "key": api_key,
-        }
-        
-        response = requests.get(channel_url, params=params, timeout=30)
-        response.raise_for_status()
-        data = response.json()
-        
-        items = data.get("items", [])
-        
-        if not items:
-            # Try searching by channel name if channel ID doesn't work
+        latest = fetch_latest_upload(channel["uploads_playlist_id"], api_key, days_back)
+        if not latest:
+            # Nothing recent on the channel itself; try searching by name
             return fetch_latest_podcast_by_search(channel_name, channel_info, api_key, days_back)
         
-        # Get the most recent video
-        latest_video = items[0]
-        snippet = latest_video.get("snippet", {})
-        video_id = latest_video.get("id", {}).get("videoId", "")
-        
-        if not video_id:
-            return None
-        
-        # Get video details for duration, view count, etc.
-        video_url_api = "https://www.googleapis.com/youtube/v3/videos"
-        video_params = {
-            "part": "contentDetails,statistics",
-            "id": video_id,
-            "key": api_key,
-        }
-        
-        video_response = requests.get(video_url_api, params=video_params, timeout=30)
-        video_response.raise_for_status()
-        video_data = video_response.json()
-        
-        video_details = video_data.get("items", [{}])[0] if video_data.get("items") else {}
-        stats = video_details.get("statistics", {})
-        
+        snippet = latest.get("snippet", {})
+        video_id = latest["contentDetails"]["videoId"]
         video_url = f"https://www.youtube.com/watch?v={video_id}"
         
         return {
             "title": snippet.get("title", ""),
             "url": video_url,
+            "video_id": video_id,
             "channel": channel_name,
-            "published_at": snippet.get("publishedAt", ""),
+            "published_at": latest["contentDetails"]["videoPublishedAt"],
             "description": snippet.get("description", "")[:500],  # First 500 chars
             "thumbnail": snippet.get("thumbnails", {}).get("high", {}).get("url", ""),
-            "views": int(stats.get("viewCount", 0)),
-            "duration": video_details.get("contentDetails", {}).get("duration", ""),
         }
         
     except Exception as e:
         print(f"Error fetching {channel_name} podcast: {e}", file=sys.stderr)
-        # Fallback to search
+        # The cached playlist may be stale (channel moved or deleted); re-resolve next run
+        cache.pop(channel_cache_key(channel_info), None)
         return fetch_latest_podcast_by_search(channel_name, channel_info, api_key, days_back)
 
 
 def fetch_latest_podcast_by_search(channel_name: str, channel_info: Dict, api_key: str, days_back: int = 30) -> Optional[Dict]:
-    """Fallback: Fetch latest podcast episode by searching for channel name."""
+    """Fallback: Fetch latest podcast episode by searching for channel name (search.list, 100 quota units)."""
     try:
-        search_url = "https://www.googleapis.com/youtube/v3/search"
-        
         # Use the first search term
         query = channel_info["search_terms"][0] if channel_info.get("search_terms") else channel_name
         
@@ -183,9 +229,7 @@ def fetch_latest_podcast_by_search(channel_name: str, channel_info: Dict, api_ke
             "key": api_key,
         }
         
-        response = requests.get(search_url, params=params, timeout=30)
-        response.raise_for_status()
-        data = response.json()
+        data = youtube.api_get("search", params)
         
         items = data.get("items", [])
         if not items:
@@ -204,6 +248,7 @@ def fetch_latest_podcast_by_search(channel_name: str, channel_info: Dict, api_ke
         return {
             "title": snippet.get("title", ""),
             "url": video_url,
+            "video_id": video_id,
             "channel": channel_name,
             "published_at": snippet.get("publishedAt", ""),
             "description": snippet.get("description", "")[:500],
@@ -215,11 +260,33 @@ def fetch_latest_podcast_by_search(channel_name: str, channel_info: Dict, api_ke
         return None
 
 
-def generate_podcast_summary(episode: Dict, api_key: str) -> str:
-    """Generate a summary of a podcast episode using OpenAI."""
+def add_video_details(episodes: List[Dict], api_key: str):
+    """Fill in views and duration for all episodes with batched videos.list calls."""
+    details = youtube.fetch_video_details((episode.get("video_id") for episode in episodes), api_key)
+    for episode in episodes:
+        video = details.get(episode.get("video_id"))
+        if video:
+            episode["views"] = youtube.video_statistic(video, "viewCount")
+            episode["duration"] = video.get("contentDetails", {}).get("duration", "")
+
+
+def generate_podcast_summary(
+    episode: Dict, api_key: str, summary_cache: Optional[transcripts.SummaryCache] = None,
+) -> str:
+    """
+    Generate a summary of a podcast episode using OpenAI: from its transcript when one
+    is available, otherwise from the title and description.
+    """
     if not episode:
         return ""
     
+    transcript_path = transcripts.find_transcript(episode.get("video_id", ""))
+    if transcript_path:
+        try:
+            return transcripts.summarize_transcript(transcript_path, episode, api_key, cache=summary_cache)
+        except Exception as e:
+            print(f"Error summarizing transcript {transcript_path}, using description: {e}", file=sys.stderr)
+    
     prompt = f"""Summarize this podcast episode in 2-3 sentences. Focus on the key topics, insights, or discussions covered:
 
 Title: {episode.get('title', 'Unknown')}
@@ -229,17 +296,18 @@ Description: {episode.get('description', 'No description available')[:800]}
 Provide a concise summary of what was discussed in this episode."""
 
     try:
-        client = OpenAI(api_key=api_key)
-        
-        response = client.chat.completions.create(
-            model="gpt-4-turbo-preview",
-            messages=[
-                {"role": "system", "content": "You are a podcast summary writer who creates concise, informative summaries of podcast episodes."},
-                {"role": "user", "content": prompt}
-            ],
-            max_tokens=300,
-            temperature=0.7,
-        )
+        client = clients.openai_client(api_key)
+        
+        with clients.rate_limiter("openai"):
+            response = client.chat.completions.create(
+                model="gpt-4-turbo-preview",
+                messages=[
+                    {"role": "system", "content": "You are a podcast summary writer who creates concise, informative summaries of podcast episodes."},
+                    {"role": "user", "content": prompt}
+                ],
+                max_tokens=300,
+                temperature=0.7,
+            )
         
         summary = response.choices[0].message.content.strip()
         return summary
@@ -251,124 +319,110 @@ Provide a concise summary of what was discussed in this episode."""
 
 def format_podcasts_markdown(podcasts: List[Dict], date: str) -> str:
     """Format podcast summaries as markdown."""
-    if not podcasts:
-        return f"## 🎙️ Podcast Summaries - {date}\n\nNo recent podcast episodes found."
+    return digest_templates.render_podcasts_markdown(podcasts, date)
+
+
+def podcasts_fallback(message: str) -> Dict:
+    """Podcast output carrying only a notice (missing key or error)."""
+    date_str = datetime.now().strftime("%Y-%m-%d")
+    return {
+        "date": date_str,
+        "markdown": f"## 🎙️ Podcast Summaries - {date_str}\n\n*{message}*\n",
+        "podcasts": [],
+    }
+
+
+def collect_podcasts() -> Dict:
+    """Fetch and summarize the latest episode of every channel. Raises on failure."""
+    openai_key = get_openai_key()
+    youtube_key = get_youtube_api_key()
     
-    lines = [
-        f"## 🎙️ Podcast Summaries - {date}",
-        "",
-    ]
+    if not youtube_key:
+        print("YOUTUBE_API_KEY not found. Skipping podcast summaries.", file=sys.stderr)
+        return podcasts_fallback("YouTube API key required. Please configure YOUTUBE_API_KEY in environment.")
     
-    for podcast in podcasts:
-        episode = podcast.get("episode", {})
-        summary = podcast.get("summary", "")
-        
-        if not episode:
-            continue
-        
-        # Format published date if available
-        pub_date = ""
-        if episode.get("published_at"):
-            try:
-                pub_dt = datetime.fromisoformat(episode["published_at"].replace("Z", "+00:00"))
-                pub_date = pub_dt.strftime("%Y-%m-%d")
-            except:
-                pub_date = ""
-        
-        lines.append(f"### {episode.get('channel', 'Unknown')} - {episode.get('title', 'Unknown')}")
-        if pub_date:
-            lines.append(f"*Published: {pub_date}*")
-        lines.append("")
-        
-        if summary:
-            lines.append(summary)
-            lines.append("")
-        
-        video_url = episode.get("url", "")
-        if video_url and validate_url(video_url):
-            lines.append(f"[Watch on YouTube]({video_url})")
-        
-        lines.append("")
-        lines.append("---")
-        lines.append("")
+    cache_path = get_channel_cache_path()
+    channel_cache = load_channel_cache(cache_path)
+    workers = max(1, int(os.getenv("PODCAST_CONCURRENCY", DEFAULT_PODCAST_CONCURRENCY)))
+    # Chunk summaries are only cached when there are transcripts to summarize
+    summary_cache = transcripts.SummaryCache() if os.path.isdir(transcripts.get_transcript_dir()) else None
     
-    return "\n".join(lines)
-
-
-def main():
-    """Main execution function."""
-    try:
-        openai_key = get_openai_key()
-        youtube_key = get_youtube_api_key()
-        
-        if not youtube_key:
-            print("YOUTUBE_API_KEY not found. Skipping podcast summaries.", file=sys.stderr)
-            date_str = datetime.now().strftime("%Y-%m-%d")
-            fallback = {
-                "date": date_str,
-                "markdown": f"## 🎙️ Podcast Summaries - {date_str}\n\n*YouTube API key required. Please configure YOUTUBE_API_KEY in environment.*\n",
-                "podcasts": [],
-            }
-            print(json.dumps(fallback))
-            sys.exit(0)
-        
-        podcasts = []
-        
+    episodes = {}
+    summaries = {}
+    with ThreadPoolExecutor(max_workers=workers) as lookups, ThreadPoolExecutor(max_workers=workers) as summarizers:
+        pending = {}
         for channel_name, channel_info in PODCAST_CHANNELS.items():
             print(f"Fetching latest episode from {channel_name}...", file=sys.stderr)
-            episode = fetch_latest_podcast_episode(channel_name, channel_info, youtube_key, days_back=30)
-            
+            future = lookups.submit(
+                fetch_latest_podcast_episode,
+                channel_name, channel_info, youtube_key, days_back=30, channel_cache=channel_cache,
+            )
+            pending[future] = channel_name
+        
+        # Start each summary as soon as its channel's episode is found
+        for future in as_completed(pending):
+            channel_name = pending[future]
+            episode = future.result()
             if episode:
                 print(f"Found episode: {episode.get('title', 'Unknown')}", file=sys.stderr)
                 print(f"Generating summary for {channel_name}...", file=sys.stderr)
-                summary = generate_podcast_summary(episode, openai_key)
-                
-                podcasts.append({
-                    "channel": channel_name,
-                    "episode": episode,
-                    "summary": summary,
-                })
+                episodes[channel_name] = episode
+                summaries[channel_name] = summarizers.submit(
+                    generate_podcast_summary, episode, openai_key, summary_cache,
+                )
             else:
                 print(f"No recent episode found for {channel_name}", file=sys.stderr)
         
-        date_str = datetime.now().strftime("%Y-%m-%d")
-        markdown = format_podcasts_markdown(podcasts, date_str)
+        # Every video ID is known now: one batched details lookup while summaries run
+        add_video_details(list(episodes.values()), youtube_key)
         
+        podcasts = [
+            {
+                "channel": channel_name,
+                "episode": episodes[channel_name],
+                "summary": summaries[channel_name].result(),
+            }
+            for channel_name in PODCAST_CHANNELS
+            if channel_name in episodes
+        ]
+    
+    if summary_cache is not None:
+        summary_cache.close()
+    
+    try:
+        save_channel_cache(cache_path, channel_cache)
+    except OSError as e:
+        print(f"Warning: Could not save channel cache: {e}", file=sys.stderr)
+    
+    date_str = datetime.now().strftime("%Y-%m-%d")
+    markdown = format_podcasts_markdown(podcasts, date_str)
+    
+    return {
+        "date": date_str,
+        "markdown": markdown,
+        "podcasts": podcasts,
+    }
+
+
+def main():
+    """Main execution function."""
+    try:
         # Output JSON for other scripts to consume
-        output = {
-            "date": date_str,
-            "markdown": markdown,
-            "podcasts": podcasts,
-        }
-        
-        print(json.dumps(output))
+        print(json.dumps(collect_podcasts()))
         
     except ValueError as e:
         # Missing API key
         print(f"Configuration Error: {e}", file=sys.stderr)
-        date_str = datetime.now().strftime("%Y-%m-%d")
-        fallback = {
-            "date": date_str,
-            "markdown": f"## 🎙️ Podcast Summaries - {date_str}\n\n*Error: {str(e)}. Please configure required API keys.*\n",
-            "podcasts": [],
-        }
-        print(json.dumps(fallback))
+        print(json.dumps(podcasts_fallback(f"Error: {str(e)}. Please configure required API keys.")))
         sys.exit(1)
     except Exception as e:
         # Other errors
         print(f"Error: {e}", file=sys.stderr)
         import traceback
         print(traceback.format_exc(), file=sys.stderr)
-        date_str = datetime.now().strftime("%Y-%m-%d")
-        fallback = {
-            "date": date_str,
-            "markdown": f"## 🎙️ Podcast Summaries - {date_str}\n\n*Error fetching podcasts: {str(e)}*\n",
-            "podcasts": [],
-        }
-        print(json.dumps(fallback))
+        print(json.dumps(podcasts_fallback(f"Error fetching podcasts: {str(e)}")))
         sys.exit(1)
 
 
 if __name__ == "__main__":
     main()
-
@@ -0,0 +1,280 @@
+"""
+Transcript-based podcast summaries (map-reduce).
+
+Transcripts are read from a local directory (PODCAST_TRANSCRIPT_DIR, default
+.cache/transcripts) as {video_id}.vtt, .srt or .txt, e.g. captions downloaded
+by a separate step. The file is streamed line by line into chunks of about
+CHUNK_TOKENS tokens, so only the chunks being summarized are held in memory.
+Chunks are summarized in parallel (map), and the chunk summaries are merged
+into the episode summary (reduce), in several rounds if needed.
+
+Every model call is cached by a hash of its model, prompt and input
+(.cache/podcast_summaries.db), so re-runs don't summarize the same chunk twice.
+"""
+
+import os
+import re
+import sys
+import html
+import time
+import sqlite3
+import hashlib
+import threading
+import itertools
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+import clients
+
+
+DEFAULT_TRANSCRIPT_DIR = os.path.join(".cache", "transcripts")
+DEFAULT_SUMMARY_CACHE_PATH = os.path.join(".cache", "podcast_summaries.db")
+TRANSCRIPT_EXTENSIONS = (".vtt", ".srt", ".txt")
+
+SUMMARY_MODEL = "gpt-4-turbo-preview"
+# Rough token estimate (no tokenizer dependency): ~4 characters per token for English
+CHARS_PER_TOKEN = 4
+CHUNK_TOKENS = 3000
+# Longest transcript we read: 40 chunks is ~120k tokens, several hours of talk
+MAX_CHUNKS = 40
+REDUCE_INPUT_TOKENS = 6000
+MAX_REDUCE_ROUNDS = 3
+MAP_CONCURRENCY = 4
+
+CHUNK_PROMPT = """This is part {index} of a transcript of the podcast episode "{title}" ({channel}).
+List the topics discussed and the key insights, claims or announcements in this part, in a few concise bullet points.
+
+Transcript:
+{text}"""
+
+MERGE_PROMPT = """These are notes on consecutive parts of the podcast episode "{title}" ({channel}).
+Merge them into one set of concise bullet points covering the main topics and insights, without repetition.
+
+Notes:
+{text}"""
+
+FINAL_PROMPT = """Summarize this podcast episode in 2-3 sentences. Focus on the key topics, insights, or discussions covered.
+
+Title: {title}
+Channel: {channel}
+Notes from the full transcript:
+{text}
+
+Provide a concise summary of what was discussed in this episode."""
+
+SYSTEM_PROMPT = "You are a podcast summary writer who creates concise, informative summaries of podcast episodes."
+
+TIMESTAMP = re.compile(r"^(\d+:)?\d{1,2}:\d{2}[.,]\d{3}\s+-->")
+TAG = re.compile(r"<[^>]+>")
+
+
+def get_transcript_dir() -> str:
+    """Get transcript directory from environment or default."""
+    return os.getenv("PODCAST_TRANSCRIPT_DIR", DEFAULT_TRANSCRIPT_DIR)
+
+
+def get_summary_cache_path() -> str:
+    """Get summary cache path from environment or default."""
+    return os.getenv("PODCAST_SUMMARY_CACHE", DEFAULT_SUMMARY_CACHE_PATH)
+
+
+def find_transcript(video_id: str, directory: Optional[str] = None) -> Optional[str]:
+    """Path of the transcript for a video, if one has been downloaded."""
+    if not video_id:
+        return None
+    directory = directory or get_transcript_dir()
+    for extension in TRANSCRIPT_EXTENSIONS:
+        path = os.path.join(directory, f"{video_id}{extension}")
+        if os.path.isfile(path):
+            return path
+    return None
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate token count of a text."""
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def iter_transcript_lines(path: str) -> Iterator[str]:
+    """
+    Stream the spoken text of a transcript, one line at a time.
+    WebVTT/SRT headers, cue numbers, timestamps and markup are dropped, as are the
+    repeated lines of rolling auto-captions.
+    """
+    captions = not path.endswith(".txt")
+    skipping_block = False
+    previous = None
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        for raw in f:
+            line = raw.strip()
+            if not line:
+                skipping_block = False
+                continue
+            if captions:
+                if skipping_block:
+                    continue
+                # The WEBVTT header and NOTE/STYLE/REGION blocks run until the next blank line
+                if line.startswith(("WEBVTT", "NOTE", "STYLE", "REGION")):
+                    skipping_block = True
+                    continue
+                if line.isdigit() or TIMESTAMP.match(line):
+                    continue
+                line = html.unescape(TAG.sub("", line)).strip()
+                if not line or line == previous:
+                    continue
+            previous = line
+            yield line
+
+
+def _split_long(line: str, max_chars: int) -> Iterator[str]:
+    """Split a line longer than max_chars at word boundaries."""
+    piece: List[str] = []
+    size = 0
+    for word in line.split():
+        if piece and size + len(word) + 1 > max_chars:
+            yield " ".join(piece)
+            piece, size = [], 0
+        piece.append(word)
+        size += len(word) + 1
+    if piece:
+        yield " ".join(piece)
+
+
+def iter_chunks(lines: Iterable[str], max_tokens: int = CHUNK_TOKENS) -> Iterator[str]:
+    """Group streamed lines into chunks of at most ~max_tokens tokens."""
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    chunk: List[str] = []
+    size = 0
+    for line in lines:
+        for piece in _split_long(line, max_chars) if len(line) > max_chars else (line,):
+            if chunk and size + len(piece) + 1 > max_chars:
+                yield " ".join(chunk)
+                chunk, size = [], 0
+            chunk.append(piece)
+            size += len(piece) + 1
+    if chunk:
+        yield " ".join(chunk)
+
+
+class SummaryCache:
+    """Persistent SQLite cache of model outputs, keyed by a hash of model, prompt and input."""
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS summaries (
+        key TEXT PRIMARY KEY,
+        summary TEXT NOT NULL,
+        created_at REAL NOT NULL
+    );
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        path = path or get_summary_cache_path()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.executescript(self.SCHEMA)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(model: str, prompt: str) -> str:
+        return hashlib.sha256(f"{model}\n{SYSTEM_PROMPT}\n{prompt}".encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self.conn.execute("SELECT summary FROM summaries WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def put(self, key: str, summary: str):
+        with self._lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO summaries (key, summary, created_at) VALUES (?, ?, ?)",
+                (key, summary, time.time()),
+            )
+
+    def close(self):
+        self.conn.close()
+
+
+def complete(prompt: str, api_key: str, cache: Optional[SummaryCache], max_tokens: int = 400) -> str:
+    """One cached, rate-limited chat completion."""
+    key = SummaryCache.key(SUMMARY_MODEL, prompt)
+    if cache is not None:
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+    client = clients.openai_client(api_key)
+    with clients.rate_limiter("openai"):
+        response = client.chat.completions.create(
+            model=SUMMARY_MODEL,
+            messages=[
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": prompt},
+            ],
+            max_tokens=max_tokens,
+            temperature=0.3,
+        )
+    summary = response.choices[0].message.content.strip()
+    if cache is not None:
+        cache.put(key, summary)
+    return summary
+
+
+def map_ordered(fn: Callable[[int, str], str], items: Iterable[str], workers: int = MAP_CONCURRENCY) -> List[str]:
+    """
+    Apply fn(index, item) in parallel, keeping results in input order.
+    At most 2 * workers items are submitted ahead, so a streamed input is never fully in memory.
+    """
+    results: List[str] = []
+    window: deque = deque()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for index, item in enumerate(items, 1):
+            window.append(executor.submit(fn, index, item))
+            if len(window) >= 2 * workers:
+                results.append(window.popleft().result())
+        while window:
+            results.append(window.popleft().result())
+    return results
+
+
+def pack(texts: List[str], max_tokens: int) -> List[str]:
+    """Join consecutive texts into groups of at most ~max_tokens tokens (a longer text is its own group)."""
+    groups: List[str] = []
+    current: List[str] = []
+    size = 0
+    for text in texts:
+        tokens = estimate_tokens(text)
+        if current and size + tokens > max_tokens:
+            groups.append("\n\n".join(current))
+            current, size = [], 0
+        current.append(text)
+        size += tokens
+    if current:
+        groups.append("\n\n".join(current))
+    return groups
+
+
+def summarize_transcript(path: str, episode: Dict, api_key: str, cache: Optional[SummaryCache] = None) -> str:
+    """Summarize a transcript file: parallel chunk summaries, then merged down to one summary."""
+    fields = {"title": episode.get("title", "Unknown"), "channel": episode.get("channel", "Unknown")}
+
+    def summarize_chunk(index: int, text: str) -> str:
+        return complete(CHUNK_PROMPT.format(index=index, text=text, **fields), api_key, cache)
+
+    def merge(index: int, text: str) -> str:
+        return complete(MERGE_PROMPT.format(text=text, **fields), api_key, cache)
+
+    chunks = itertools.islice(iter_chunks(iter_transcript_lines(path)), MAX_CHUNKS)
+    notes = map_ordered(summarize_chunk, chunks)
+    if not notes:
+        raise ValueError(f"Transcript {path} has no text")
+
+    rounds = 0
+    while len(notes) > 1 and estimate_tokens("\n\n".join(notes)) > REDUCE_INPUT_TOKENS and rounds < MAX_REDUCE_ROUNDS:
+        notes = map_ordered(merge, pack(notes, REDUCE_INPUT_TOKENS))
+        rounds += 1
+
+    print(f"Summarized transcript for {fields['channel']} ({len(notes)} note group(s), {rounds} merge round(s))", file=sys.stderr)
+    return complete(FINAL_PROMPT.format(text="\n\n".join(notes), **fields), api_key, cache, max_tokens=300)
@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+Vectorized trend analytics over the digest archive.
+
+Keeps a term x day count matrix (and a source x day matrix) as sparse COO
+triples in .cache/trends/matrix.npz (restored by actions/cache; the matrix is
+derived data, so it is rebuilt from the archive when missing). Each daily run
+appends one day column instead of rescanning the archive; rising/falling
+topics, source share and novelty are computed with NumPy reductions over
+those triples. NumPy is imported by the functions that use it, so importing
+this module stays cheap.
+
+Usage:
+    python3 scripts/trends.py rebuild [archive_dir]
+    python3 scripts/trends.py show [--window 7] [--baseline 28]
+"""
+
+import os
+import sys
+import json
+import argparse
+import importlib.util
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+# NumPy is optional: without it trend analytics are skipped.
+# Check for it without importing it.
+NUMPY_AVAILABLE = importlib.util.find_spec("numpy") is not None
+
+import archive_format
+from rollups import NEWS_SECTIONS, extract_terms
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+TRENDS_PATH = os.path.join(".cache", "trends", "matrix.npz")
+DEFAULT_WINDOW_DAYS = 7
+DEFAULT_BASELINE_DAYS = 28
+
+
+class TrendMatrix:
+    """Sparse term x day and source x day counts, stored as COO triples."""
+
+    def __init__(self):
+        import numpy as np
+
+        self.terms: List[str] = []
+        self.sources: List[str] = []
+        self.days: List[str] = []
+        self.term_rows = np.zeros(0, dtype=np.int32)
+        self.term_cols = np.zeros(0, dtype=np.int32)
+        self.term_counts = np.zeros(0, dtype=np.int32)
+        self.source_rows = np.zeros(0, dtype=np.int32)
+        self.source_cols = np.zeros(0, dtype=np.int32)
+        self.source_counts = np.zeros(0, dtype=np.int32)
+        self._term_index: Dict[str, int] = {}
+        self._source_index: Dict[str, int] = {}
+
+    @classmethod
+    def load(cls, path: str = TRENDS_PATH) -> "TrendMatrix":
+        """Load the matrix from disk, or start an empty one."""
+        import numpy as np
+
+        matrix = cls()
+        if not os.path.exists(path):
+            return matrix
+
+        with np.load(path, allow_pickle=False) as data:
+            matrix.terms = data["terms"].tolist()
+            matrix.sources = data["sources"].tolist()
+            matrix.days = data["days"].tolist()
+            for name in ("term_rows", "term_cols", "term_counts", "source_rows", "source_cols", "source_counts"):
+                setattr(matrix, name, data[name])
+        matrix._term_index = {term: i for i, term in enumerate(matrix.terms)}
+        matrix._source_index = {source: i for i, source in enumerate(matrix.sources)}
+        return matrix
+
+    def save(self, path: str = TRENDS_PATH):
+        """Write the matrix to disk atomically."""
+        import numpy as np
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp.npz"
+        np.savez_compressed(
+            tmp_path,
+            terms=np.array(self.terms, dtype=str),
+            sources=np.array(self.sources, dtype=str),
+            days=np.array(self.days, dtype=str),
+            term_rows=self.term_rows, term_cols=self.term_cols, term_counts=self.term_counts,
+            source_rows=self.source_rows, source_cols=self.source_cols, source_counts=self.source_counts,
+        )
+        os.replace(tmp_path, path)
+
+    def _index(self, values: List[str], index: Dict[str, int], key: str) -> int:
+        """Row index of a term/source, appending it to the vocabulary if new."""
+        if key not in index:
+            index[key] = len(values)
+            values.append(key)
+        return index[key]
+
+    def _drop_day(self, col: int):
+        """Remove every entry of one day column (used when a day is re-applied)."""
+        keep = self.term_cols != col
+        self.term_rows, self.term_cols, self.term_counts = self.term_rows[keep], self.term_cols[keep], self.term_counts[keep]
+        keep = self.source_cols != col
+        self.source_rows, self.source_cols, self.source_counts = self.source_rows[keep], self.source_cols[keep], self.source_counts[keep]
+
+    def add_day(self, date: str, term_counts: Dict[str, int], source_counts: Dict[str, int]):
+        """Append (or replace) one day column."""
+        import numpy as np
+
+        if date in self.days:
+            col = self.days.index(date)
+            self._drop_day(col)
+        else:
+            col = len(self.days)
+            self.days.append(date)
+
+        rows = [self._index(self.terms, self._term_index, term) for term in term_counts]
+        self.term_rows = np.concatenate([self.term_rows, np.array(rows, dtype=np.int32)])
+        self.term_cols = np.concatenate([self.term_cols, np.full(len(rows), col, dtype=np.int32)])
+        self.term_counts = np.concatenate([self.term_counts, np.array(list(term_counts.values()), dtype=np.int32)])
+
+        rows = [self._index(self.sources, self._source_index, source) for source in source_counts]
+        self.source_rows = np.concatenate([self.source_rows, np.array(rows, dtype=np.int32)])
+        self.source_cols = np.concatenate([self.source_cols, np.full(len(rows), col, dtype=np.int32)])
+        self.source_counts = np.concatenate([self.source_counts, np.array(list(source_counts.values()), dtype=np.int32)])
+
+    def _day_mask(self, cols: "np.ndarray", start: str, end: str) -> "np.ndarray":
+        """Mask of entries whose day falls in [start, end] (days may be stored out of order)."""
+        import numpy as np
+
+        days = np.array(self.days, dtype=str)
+        in_range = (days >= start) & (days <= end)
+        return in_range[cols]
+
+    def term_totals(self, start: str, end: str) -> "np.ndarray":
+        """Per-term counts summed over a date range."""
+        import numpy as np
+
+        mask = self._day_mask(self.term_cols, start, end)
+        return np.bincount(self.term_rows[mask], weights=self.term_counts[mask], minlength=len(self.terms))
+
+    def source_totals(self, start: str, end: str) -> "np.ndarray":
+        """Per-source counts summed over a date range."""
+        import numpy as np
+
+        mask = self._day_mask(self.source_cols, start, end)
+        return np.bincount(self.source_rows[mask], weights=self.source_counts[mask], minlength=len(self.sources))
+
+    def first_seen(self) -> "np.ndarray":
+        """Earliest day (as YYYY-MM-DD) each term appeared."""
+        import numpy as np
+
+        days = np.array(self.days, dtype=str)
+        order = np.argsort(days)
+        rank = np.empty(len(days), dtype=np.int64)
+        rank[order] = np.arange(len(days))
+        first = np.full(len(self.terms), len(days), dtype=np.int64)
+        np.minimum.at(first, self.term_rows, rank[self.term_cols])
+        return days[order][np.minimum(first, len(days) - 1)]
+
+
+def count_digest(digest: Dict) -> tuple[Dict[str, int], Dict[str, int]]:
+    """Term counts (titles and summaries) and source counts of one digest's news sections."""
+    term_counts: Dict[str, int] = {}
+    source_counts: Dict[str, int] = {}
+    for section in NEWS_SECTIONS:
+        section_data = digest.get(section) or {}
+        texts = [section_data.get("summary", "")]
+        for story in section_data.get("stories") or []:
+            texts.append(story.get("title", ""))
+            source = story.get("source") or "Unknown"
+            source_counts[source] = source_counts.get(source, 0) + 1
+        for text in texts:
+            for term in extract_terms(text):
+                term_counts[term] = term_counts.get(term, 0) + 1
+    return term_counts, source_counts
+
+
+def compute_trends(
+    matrix: TrendMatrix,
+    window_days: int = DEFAULT_WINDOW_DAYS,
+    baseline_days: int = DEFAULT_BASELINE_DAYS,
+    top_n: int = 10,
+) -> Dict:
+    """Rising/falling topics, source share and novelty for the latest window vs the baseline before it."""
+    import numpy as np
+
+    if not matrix.days:
+        return {"rising": [], "falling": [], "sources": [], "novel": [], "window": [], "novelty": 0.0}
+
+    days = sorted(matrix.days)
+    window = days[-window_days:]
+    baseline = days[-(window_days + baseline_days):-window_days] if len(days) > window_days else []
+
+    recent = matrix.term_totals(window[0], window[-1])
+    if baseline:
+        base = matrix.term_totals(baseline[0], baseline[-1])
+    else:
+        base = np.zeros(len(matrix.terms))
+
+    # Smoothed log ratio of per-day rates
+    recent_rate = recent / len(window)
+    base_rate = base / max(len(baseline), 1)
+    score = np.log2((recent_rate + 0.5) / (base_rate + 0.5))
+    terms = np.array(matrix.terms, dtype=str)
+
+    rising_idx = np.flatnonzero(recent >= 2)
+    rising_idx = rising_idx[np.argsort(-score[rising_idx], kind="stable")][:top_n]
+    falling_idx = np.flatnonzero((base >= 2) & (score < 0)) if baseline else np.zeros(0, dtype=np.int64)
+    falling_idx = falling_idx[np.argsort(score[falling_idx], kind="stable")][:top_n]
+
+    # Novel terms: first seen inside the window
+    first = matrix.first_seen()
+    novel_mask = (first >= window[0]) & (recent > 0)
+    novel_idx = np.flatnonzero(novel_mask)
+    novel_idx = novel_idx[np.argsort(-recent[novel_idx], kind="stable")][:top_n]
+    novelty = float(recent[novel_mask].sum() / recent.sum()) if recent.sum() else 0.0
+
+    source_totals = matrix.source_totals(window[0], window[-1])
+    total = source_totals.sum()
+    source_idx = np.argsort(-source_totals, kind="stable")[:top_n]
+    sources = [
+        {"source": matrix.sources[i], "count": int(source_totals[i]), "share": float(source_totals[i] / total)}
+        for i in source_idx if source_totals[i] > 0
+    ]
+
+    return {
+        "window": [window[0], window[-1]],
+        "rising": [{"term": str(terms[i]), "count": int(recent[i]), "score": round(float(score[i]), 2)} for i in rising_idx],
+        "falling": [{"term": str(terms[i]), "count": int(base[i]), "score": round(float(score[i]), 2)} for i in falling_idx],
+        "novel": [{"term": str(terms[i]), "count": int(recent[i])} for i in novel_idx],
+        "novelty": round(novelty, 3),
+        "sources": sources,
+    }
+
+
+def format_trends_markdown(trends: Dict) -> str:
+    """Format trend analytics as a README-ready "Trending This Week" section."""
+    if not trends.get("window"):
+        return ""
+
+    start, end = trends["window"]
+    lines = [
+        f"## 🔥 Trending This Week - {start} to {end}",
+        "",
+    ]
+
+    if trends["rising"]:
+        lines.append("**Rising:** " + ", ".join(f"{item['term']} (+{item['score']})" for item in trends["rising"]))
+        lines.append("")
+    if trends["falling"]:
+        lines.append("**Cooling off:** " + ", ".join(f"{item['term']} ({item['score']})" for item in trends["falling"]))
+        lines.append("")
+    if trends["novel"]:
+        lines.append(f"**New this week** ({trends['novelty']:.0%} of mentions): " + ", ".join(item["term"] for item in trends["novel"]))
+        lines.append("")
+    if trends["sources"]:
+        lines.append("**Source share:** " + ", ".join(f"{item['source']} {item['share']:.0%}" for item in trends["sources"]))
+        lines.append("")
+
+    return "\n".join(lines)
+
+
+def update_trends(digest: Dict, path: str = TRENDS_PATH, archive_dir: str = "archive") -> Optional[Dict]:
+    """Append a daily digest to the trend matrix and return the current trends."""
+    if not NUMPY_AVAILABLE:
+        print("NumPy not installed. Skipping trend analytics.", file=sys.stderr)
+        return None
+    if not digest.get("date"):
+        return None
+
+    if not os.path.exists(path):
+        # Cold cache: rebuild the history from the archive before adding today
+        count = rebuild_trends(archive_dir, path)
+        print(f"Rebuilt trend matrix with {count} days", file=sys.stderr)
+
+    matrix = TrendMatrix.load(path)
+    term_counts, source_counts = count_digest(digest)
+    matrix.add_day(digest["date"], term_counts, source_counts)
+    matrix.save(path)
+    return compute_trends(matrix)
+
+
+def rebuild_trends(archive_dir: str = "archive", path: str = TRENDS_PATH) -> int:
+    """Recompute the matrix from the archive (recovery only; daily runs are incremental)."""
+    matrix = TrendMatrix()
+    for archive_path in archive_format.list_archive_files(archive_dir):
+        try:
+            digest = archive_format.load_digest(archive_path, with_markdown=False)
+        except (OSError, json.JSONDecodeError, ValueError) as e:
+            print(f"Skipping {archive_path}: {e}", file=sys.stderr)
+            continue
+        if digest.get("date"):
+            matrix.add_day(digest["date"], *count_digest(digest))
+    matrix.save(path)
+    return len(matrix.days)
+
+
+def main():
+    """Command-line entry point for rebuilding and showing trends."""
+    parser = argparse.ArgumentParser(description="Trend analytics over the digest archive")
+    parser.add_argument("--matrix", default=TRENDS_PATH)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    rebuild_parser = subparsers.add_parser("rebuild", help="Recompute the term x day matrix from the archive")
+    rebuild_parser.add_argument("archive_dir", nargs="?", default="archive")
+
+    show_parser = subparsers.add_parser("show", help="Print the trending section as markdown")
+    show_parser.add_argument("--window", type=int, default=DEFAULT_WINDOW_DAYS)
+    show_parser.add_argument("--baseline", type=int, default=DEFAULT_BASELINE_DAYS)
+
+    args = parser.parse_args()
+
+    if not NUMPY_AVAILABLE:
+        print("NumPy is required for trend analytics (pip install numpy)", file=sys.stderr)
+        sys.exit(1)
+
+    if args.command == "rebuild":
+        count = rebuild_trends(args.archive_dir, args.matrix)
+        print(f"Rebuilt trend matrix with {count} days", file=sys.stderr)
+    elif args.command == "show":
+        matrix = TrendMatrix.load(args.matrix)
+        print(format_trends_markdown(compute_trends(matrix, args.window, args.baseline)))
+
+
+if __name__ == "__main__":
+    main()
@@ -10,11 +10,13 @@ Supports multiple sections:
 """
 
 import os
+import re
 import sys
 import json
-from typing import Optional
-from datetime import datetime
-import pytz
+import hashlib
+import tempfile
+from typing import List, Tuple, Dict
+from datetime import datetime, timezone
 
 
 def read_file(filepath: str) -> str:
@@ -24,149 +26,101 @@ def read_file(filepath: str) -> str:
 
 
 def write_file(filepath: str, content: str):
-    """Write content to file."""
-    with open(filepath, "w", encoding="utf-8") as f:
-        f.write(content)
+    """Write content to file atomically (temp file in the same directory + rename)."""
+    directory = os.path.dirname(os.path.abspath(filepath))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".readme-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(content)
+        if os.path.exists(filepath):
+            os.chmod(tmp_path, os.stat(filepath).st_mode & 0o777)
+        os.replace(tmp_path, filepath)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
 
 
-def extract_content_markdown(content_json: str, section_key: str) -> str:
-    """Extract markdown from content JSON output for a specific section."""
-    try:
-        data = json.loads(content_json)
-        section_data = data.get(section_key, {})
-        return section_data.get("markdown", "")
-    except (json.JSONDecodeError, TypeError):
-        return ""
-
-
-def remove_duplicate_sections(content: str, start_marker: str, end_marker: str) -> str:
-    """Remove duplicate sections, keeping only the last occurrence."""
-    # Find all occurrences
-    start_indices = []
-    end_indices = []
-    
-    start_idx = 0
-    while True:
-        idx = content.find(start_marker, start_idx)
-        if idx == -1:
-            break
-        start_indices.append(idx)
-        start_idx = idx + 1
-    
-    start_idx = 0
-    while True:
-        idx = content.find(end_marker, start_idx)
-        if idx == -1:
-            break
-        end_indices.append(idx)
-        start_idx = idx + 1
-    
-    # If we have duplicates, keep only the last one
-    if len(start_indices) > 1:
-        print(f"Found {len(start_indices)} duplicate sections for {start_marker}, removing all but the last", file=sys.stderr)
-        # Remove all but the last occurrence
-        for i in range(len(start_indices) - 1):
-            start_pos = start_indices[i]
-            end_pos = end_indices[i] + len(end_marker)
-            # Remove this section
-            content = content[:start_pos] + content[end_pos:]
-            # Adjust subsequent indices
-            removed_len = end_pos - start_pos
-            for j in range(i + 1, len(start_indices)):
-                start_indices[j] -= removed_len
-                end_indices[j] -= removed_len
-    
-    return content
+def content_hash(content: str) -> str:
+    """SHA-256 of file content, used to skip no-op writes."""
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
 
 
-def update_readme_section(
-    readme_path: str,
-    markdown_content: str,
-    start_marker: str,
-    end_marker: str,
-) -> bool:
+Span = Tuple[int, int]
+
+DISCLAIMER_START = "<!--START_SECTION:disclaimer-->"
+DISCLAIMER_END = "<!--END_SECTION:disclaimer-->"
+
+
+def find_section_blocks(content: str, markers: List[Tuple[str, str]]) -> Tuple[Dict[str, List[Span]], Dict[str, List[Span]]]:
     """
-    Update a specific section in README.md by replacing content between markers.
-    Removes duplicates and keeps only one section.
-    Returns True if file was modified, False otherwise.
+    Tokenize every section's markers in one pass and pair them in order, per section.
+    markers holds (start_marker, end_marker) pairs. Returns (blocks, strays), both keyed
+    by start marker: blocks are (start, end) spans from a start marker through its end
+    marker; strays are spans of unpaired markers (an end with no open start, or a start
+    that is never closed).
     """
-    if not os.path.exists(readme_path):
-        print(f"Error: README file not found at {readme_path}", file=sys.stderr)
-        return False
-    
-    content = read_file(readme_path)
-    
-    # Remove duplicate sections first
-    content = remove_duplicate_sections(content, start_marker, end_marker)
-    
-    # Find the (now single) occurrence
-    start_idx = content.find(start_marker)
-    end_idx = content.find(end_marker)
-    
-    if start_idx == -1:
-        print(f"Warning: Start marker '{start_marker}' not found in README", file=sys.stderr)
-        return False
-    
-    if end_idx == -1:
-        print(f"Error: End marker '{end_marker}' not found in README", file=sys.stderr)
-        return False
-    
-    # Ensure end marker comes after start marker
-    if end_idx < start_idx:
-        print(f"Error: End marker appears before start marker for {start_marker}", file=sys.stderr)
-        return False
-    
-    # Build new content section
+    kinds = {}
+    for start_marker, end_marker in markers:
+        kinds[start_marker] = (start_marker, True)
+        kinds[end_marker] = (start_marker, False)
+    pattern = re.compile("|".join(re.escape(marker) for marker in kinds))
+    blocks: Dict[str, List[Span]] = {start_marker: [] for start_marker, _ in markers}
+    strays: Dict[str, List[Span]] = {start_marker: [] for start_marker, _ in markers}
+    open_starts: Dict[str, int] = {}
+    
+    for match in pattern.finditer(content):
+        section, is_start = kinds[match.group()]
+        if is_start:
+            if section in open_starts:
+                # A second start before the first was closed: the first one is unpaired
+                strays[section].append((open_starts[section], open_starts[section] + len(section)))
+            open_starts[section] = match.start()
+        elif section not in open_starts:
+            strays[section].append(match.span())
+        else:
+            blocks[section].append((open_starts.pop(section), match.end()))
+    
+    for section, start in open_starts.items():
+        strays[section].append((start, start + len(section)))
+    
+    return blocks, strays
+
+
+def splice(content: str, replacements: Dict[Span, str], removals: List[Span]) -> str:
+    """Rebuild content in one pass, substituting and dropping the given spans."""
+    edits = sorted([(span, text) for span, text in replacements.items()] + [(span, "") for span in removals])
+    pieces = []
+    pos = 0
+    for (start, end), text in edits:
+        if start < pos:
+            # Interleaved markers of different sections: keep the earlier edit
+            print(f"Skipping overlapping README markers at offset {start}", file=sys.stderr)
+            continue
+        pieces.append(content[pos:start])
+        pieces.append(text)
+        pos = end
+    pieces.append(content[pos:])
+    return "".join(pieces)
+
+
+def section_block(markdown_content: str, start_marker: str, end_marker: str) -> str:
+    """A section's full block, markers included."""
     new_content = f"{start_marker}\n\n"
     if markdown_content.strip():
         new_content += markdown_content.strip()
     else:
         new_content += "*Content will be updated daily via GitHub Actions*\n"
     new_content += f"\n\n{end_marker}"
-    
-    # Preserve content before and after markers
-    before = content[:start_idx]
-    after = content[end_idx + len(end_marker):]
-    
-    # Reconstruct with new section
-    updated_content = before + new_content + after
-    
-    # Check if content actually changed
-    if updated_content == content:
-        return False
-    
-    write_file(readme_path, updated_content)
-    print(f"README section {start_marker} updated successfully", file=sys.stderr)
-    return True
+    return new_content
 
 
-def update_disclaimer_section(
-    readme_path: str,
-    start_marker: str = "<!--START_SECTION:disclaimer-->",
-    end_marker: str = "<!--END_SECTION:disclaimer-->",
-) -> bool:
-    """
-    Update disclaimer section with current timestamp and all sources.
-    Returns True if file was modified, False otherwise.
-    """
-    if not os.path.exists(readme_path):
-        return False
-    
-    # Get current UTC time
-    utc_now = datetime.now(pytz.UTC)
-    timestamp = utc_now.strftime("%Y-%m-%d %H:%M:%S UTC")
-    
-    content = read_file(readme_path)
-    
-    # Check if markers exist
-    start_idx = content.find(start_marker)
-    end_idx = content.find(end_marker)
-    
-    if start_idx == -1 or end_idx == -1:
-        # Markers don't exist, skip
-        return False
-    
-    # Build new disclaimer content
+def disclaimer_block(
+    timestamp: str,
+    start_marker: str = DISCLAIMER_START,
+    end_marker: str = DISCLAIMER_END,
+) -> str:
+    """The disclaimer block with the given timestamp and all sources."""
     disclaimer_content = f"""**Last Updated:** {timestamp}
 
 *Disclaimer: All sections are automatically generated by AI and updated daily via GitHub Actions. Content is aggregated from multiple sources:*
@@ -178,22 +132,130 @@ def update_disclaimer_section(
 
 *All content is summarized using AI. Stories, quotes, and knowledge snippets are compiled without human review.*"""
     
-    new_content = f"{start_marker}\n{disclaimer_content}\n{end_marker}"
-    
-    # Preserve content before and after markers
-    before = content[:start_idx]
-    after = content[end_idx + len(end_marker):]
-    
-    # Reconstruct with new disclaimer section
-    updated_content = before + new_content + after
-    
-    # Check if content actually changed
-    if updated_content == content:
+    return f"{start_marker}\n{disclaimer_content}\n{end_marker}"
+
+
+def current_timestamp() -> str:
+    """Current UTC time as shown in the disclaimer."""
+    return datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S UTC")
+
+
+def section_name(start_marker: str) -> str:
+    """Section name from its start marker, e.g. <!--START_SECTION:ai_news--> -> ai_news."""
+    match = re.search(r"START_SECTION:(.+?)-->", start_marker)
+    return match.group(1) if match else start_marker
+
+
+def _plan_section(
+    content: str,
+    start_marker: str,
+    blocks: List[Span],
+    strays: List[Span],
+    new_block: str,
+    replacements: Dict[Span, str],
+    removals: List[Span],
+) -> bool:
+    """
+    Queue a section's edits: duplicate blocks (all but the last) and unpaired markers
+    are removed and the kept block is replaced. Returns whether the section changes.
+    """
+    if not blocks:
         return False
+    if len(blocks) > 1:
+        print(f"Found {len(blocks)} duplicate sections for {start_marker}, removing all but the last", file=sys.stderr)
+    if strays:
+        print(f"Removing {len(strays)} unpaired marker(s) for {start_marker}", file=sys.stderr)
+    kept = blocks[-1]
+    replacements[kept] = new_block
+    removals.extend(blocks[:-1] + strays)
+    return len(blocks) > 1 or bool(strays) or content[kept[0]:kept[1]] != new_block
+
+
+def render_readme(readme_path: str, section_updates: List[Tuple[str, str, str]]) -> Dict:
+    """
+    Apply all section updates in a single pass: read README once, tokenize every
+    marker once, substitute the changed segments and write once atomically.
+    section_updates holds (markdown, start_marker, end_marker) tuples.
+    The disclaimer timestamp is only touched when a real section changed.
+    Returns a manifest: {"changed": bool, "sections": {name: {"hash", "changed"}}}.
+    """
+    manifest = {"readme": readme_path, "changed": False, "sections": {}}
+    if not os.path.exists(readme_path):
+        print(f"Error: README file not found at {readme_path}", file=sys.stderr)
+        return manifest
     
-    write_file(readme_path, updated_content)
-    print(f"Disclaimer section updated with timestamp: {timestamp}", file=sys.stderr)
-    return True
+    content = read_file(readme_path)
+    markers = [(start_marker, end_marker) for _, start_marker, end_marker in section_updates]
+    blocks, strays = find_section_blocks(content, markers + [(DISCLAIMER_START, DISCLAIMER_END)])
+    
+    replacements: Dict[Span, str] = {}
+    removals: List[Span] = []
+    for markdown, start_marker, end_marker in section_updates:
+        if not blocks[start_marker]:
+            if start_marker not in content:
+                print(f"Warning: Start marker '{start_marker}' not found in README", file=sys.stderr)
+            else:
+                print(f"Error: No end marker '{end_marker}' after start marker in README", file=sys.stderr)
+        section_changed = _plan_section(
+            content, start_marker, blocks[start_marker], strays[start_marker],
+            section_block(markdown, start_marker, end_marker), replacements, removals,
+        )
+        manifest["sections"][section_name(start_marker)] = {
+            "hash": content_hash(markdown.strip())[:16],
+            "changed": section_changed,
+        }
+        if section_changed:
+            print(f"README section {start_marker} updated", file=sys.stderr)
+    
+    if not any(section["changed"] for section in manifest["sections"].values()):
+        return manifest
+    
+    timestamp = current_timestamp()
+    _plan_section(
+        content, DISCLAIMER_START, blocks[DISCLAIMER_START], strays[DISCLAIMER_START],
+        disclaimer_block(timestamp), replacements, removals,
+    )
+    
+    write_file(readme_path, splice(content, replacements, removals))
+    manifest["changed"] = True
+    print(f"README written (disclaimer timestamp: {timestamp})", file=sys.stderr)
+    return manifest
+
+
+def write_manifest(manifest_path: str, manifest: Dict):
+    """Write the changed/unchanged manifest for the workflow."""
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+
+
+README_SECTIONS = [
+    ("ai_news", "<!--START_SECTION:ai_news-->", "<!--END_SECTION:ai_news-->"),
+    ("business_news", "<!--START_SECTION:business_news-->", "<!--END_SECTION:business_news-->"),
+    ("tech_news", "<!--START_SECTION:tech_news-->", "<!--END_SECTION:tech_news-->"),
+    ("podcasts", "<!--START_SECTION:podcasts-->", "<!--END_SECTION:podcasts-->"),
+    ("trends", "<!--START_SECTION:trends-->", "<!--END_SECTION:trends-->"),
+]
+
+
+def update_readme(data: Dict, readme_path: str = "README.md") -> Dict:
+    """Render every README section from a content digest in a single pass. Returns the manifest."""
+    section_updates = []
+    for section_key, start_marker, end_marker in README_SECTIONS:
+        section_data = data.get(section_key) or {}
+        markdown = section_data.get("markdown", "") if isinstance(section_data, dict) else ""
+        # Always try to update, even if markdown is empty (to clear old content)
+        section_updates.append((markdown or "", start_marker, end_marker))
+    
+    # Digital art section (inspired by all news trends)
+    digital_art_markdown = data.get("digital_art_markdown", "")
+    if digital_art_markdown:
+        section_updates.append((
+            digital_art_markdown,
+            "<!--START_SECTION:digital_art-->",
+            "<!--END_SECTION:digital_art-->",
+        ))
+    
+    return render_readme(readme_path, section_updates)
 
 
 def main():
@@ -212,52 +274,28 @@ def main():
             print("Error: No content JSON file available", file=sys.stderr)
             sys.exit(1)
     
-    # Read content JSON
+    # Read and parse content JSON once
     with open(content_json_path, "r", encoding="utf-8") as f:
         content_data = f.read()
-    
-    # Update each section
-    sections = [
-        ("ai_news", "<!--START_SECTION:ai_news-->", "<!--END_SECTION:ai_news-->"),
-        ("business_news", "<!--START_SECTION:business_news-->", "<!--END_SECTION:business_news-->"),
-        ("tech_news", "<!--START_SECTION:tech_news-->", "<!--END_SECTION:tech_news-->"),
-        ("podcasts", "<!--START_SECTION:podcasts-->", "<!--END_SECTION:podcasts-->"),
-    ]
-    
-    updated = False
-    for section_key, start_marker, end_marker in sections:
-        markdown = extract_content_markdown(content_data, section_key)
-        # Always try to update, even if markdown is empty (to clear old content)
-        section_updated = update_readme_section(readme_path, markdown or "", start_marker, end_marker)
-        if section_updated:
-            updated = True
-    
-    # Update digital art section (inspired by all news trends)
     try:
         data = json.loads(content_data)
-        digital_art_markdown = data.get("digital_art_markdown", "")
-        if digital_art_markdown:
-            # Add digital art section after podcasts section
-            art_section_updated = update_readme_section(
-                readme_path,
-                digital_art_markdown,
-                "<!--START_SECTION:digital_art-->",
-                "<!--END_SECTION:digital_art-->"
-            )
-            if art_section_updated:
-                updated = True
-    except (json.JSONDecodeError, TypeError) as e:
-        print(f"Warning: Could not extract digital art section: {e}", file=sys.stderr)
+    except json.JSONDecodeError as e:
+        print(f"Warning: Could not parse content JSON: {e}", file=sys.stderr)
+        data = {}
+    if not isinstance(data, dict):
+        data = {}
+    
+    manifest = update_readme(data, readme_path)
     
-    # Update disclaimer section
-    disclaimer_updated = update_disclaimer_section(readme_path)
+    manifest_path = os.getenv("README_MANIFEST")
+    if manifest_path:
+        write_manifest(manifest_path, manifest)
     
-    if updated or disclaimer_updated:
+    if manifest["changed"]:
         print("README updated successfully", file=sys.stderr)
-        sys.exit(0)
     else:
         print("README unchanged", file=sys.stderr)
-        sys.exit(0)  # Exit 0 even if no changes
+    sys.exit(0)  # Exit 0 even if no changes
 
 
 if __name__ == "__main__":
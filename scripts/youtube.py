@@ -0,0 +1,55 @@
+"""
+YouTube Data API helpers shared by the content and podcast fetchers.
+
+videos.list accepts up to 50 comma-joined IDs and costs 1 quota unit per call
+regardless of how many IDs it carries, so video details are always looked up
+in batches after the video IDs have been collected. All calls go through the
+shared "youtube" rate limiter (clients.rate_limiter), so concurrent fetchers
+stay within the API's limits together.
+"""
+
+import sys
+from typing import Dict, Iterable
+
+import clients
+
+
+YOUTUBE_API_URL = "https://www.googleapis.com/youtube/v3"
+VIDEOS_BATCH_SIZE = 50
+
+
+def api_get(endpoint: str, params: Dict) -> Dict:
+    """Rate-limited GET of a Data API endpoint (e.g. "videos"); raises on HTTP errors."""
+    with clients.rate_limiter("youtube"):
+        response = clients.http_session().get(f"{YOUTUBE_API_URL}/{endpoint}", params=params, timeout=30)
+    response.raise_for_status()
+    return response.json()
+
+
+def fetch_video_details(video_ids: Iterable[str], api_key: str, parts: str = "contentDetails,statistics") -> Dict[str, Dict]:
+    """
+    Look up videos in batches of VIDEOS_BATCH_SIZE.
+    Returns {video_id: videos.list item}; IDs YouTube doesn't return (or failed batches) are left out.
+    """
+    ids = list(dict.fromkeys(video_id for video_id in video_ids if video_id))
+    details = {}
+    for i in range(0, len(ids), VIDEOS_BATCH_SIZE):
+        batch = ids[i:i + VIDEOS_BATCH_SIZE]
+        params = {"part": parts, "id": ",".join(batch), "key": api_key}
+        try:
+            data = api_get("videos", params)
+        except Exception as e:
+            print(f"Error fetching details for {len(batch)} YouTube video(s): {e}", file=sys.stderr)
+            continue
+        for item in data.get("items", []):
+            if item.get("id"):
+                details[item["id"]] = item
+    return details
+
+
+def video_statistic(details: Dict, name: str) -> int:
+    """An integer statistic (viewCount, commentCount, ...) from a videos.list item; 0 if missing."""
+    try:
+        return int((details or {}).get("statistics", {}).get(name, 0))
+    except (TypeError, ValueError):
+        return 0
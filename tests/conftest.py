@@ -0,0 +1,84 @@
+"""Make the scripts importable the way the workflow runs them (PYTHONPATH=scripts)."""
+
+import os
+import sys
+import json
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts")
+if SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, SCRIPTS_DIR)
+
+
+class StubServer(ThreadingHTTPServer):
+    """
+    Local stand-in for SendGrid and webhook endpoints.
+    script(path, *responses) queues (status, delay_seconds) responses for a path; the
+    last one repeats. Unscripted paths answer 202. Every POST is kept in requests.
+    """
+
+    daemon_threads = True
+    block_on_close = False
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), StubHandler)
+        self.url = f"http://127.0.0.1:{self.server_address[1]}"
+        self.requests = []
+        self.responses = {}
+        self.lock = threading.Lock()
+
+    def script(self, path, *responses):
+        self.responses[path] = list(responses)
+
+    def next_response(self, path):
+        with self.lock:
+            queued = self.responses.get(path)
+            if not queued:
+                return 202, 0
+            return queued.pop(0) if len(queued) > 1 else queued[0]
+
+    def posts(self, path):
+        return [request for request in self.requests if request["path"] == path]
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        with self.server.lock:
+            self.server.requests.append({
+                "path": self.path,
+                "json": json.loads(body or b"{}"),
+                "headers": dict(self.headers),
+                "at": time.monotonic(),
+            })
+        status, delay = self.server.next_response(self.path)
+        time.sleep(delay)
+        payload = b"{}"
+        try:
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+        except OSError:
+            # The client gave up (timeout) before the delayed response
+            pass
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    server = StubServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
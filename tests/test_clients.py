@@ -0,0 +1,21 @@
+"""Shared clients: one requests session per thread."""
+
+import threading
+
+import clients
+
+
+def test_http_session_is_reused_within_a_thread():
+    assert clients.http_session() is clients.http_session()
+
+
+def test_threads_get_their_own_session():
+    sessions = []
+    threads = [threading.Thread(target=lambda: sessions.append(clients.http_session())) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len({id(session) for session in sessions}) == 3
+    assert clients.http_session() not in sessions
@@ -0,0 +1,54 @@
+"""Email/SMS rendering keeps the layout of the original format_digest_notification."""
+
+import os
+import json
+
+import digest_templates
+from conftest import SCRIPTS_DIR
+
+ROOT = os.path.dirname(SCRIPTS_DIR)
+GOLDEN_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "golden")
+
+
+def read(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def test_matches_baseline_notification_output():
+    # Golden files are the output of the original format_digest_notification for this archive day
+    digest = json.loads(read(os.path.join(ROOT, "archive", "2025-11-21-digest.json")))
+
+    rendered = digest_templates.render_digest(digest)
+
+    assert rendered["subject"] == "📊 Daily Digest - 2025-11-21"
+    assert rendered["html"] == read(os.path.join(GOLDEN_DIR, "2025-11-21-digest.html"))
+    assert rendered["text"] == read(os.path.join(GOLDEN_DIR, "2025-11-21-digest.txt"))
+
+
+def test_quote_sections_render_items_only():
+    digest = {
+        "date": "2025-11-21",
+        "motivation_quotes": {"summary": "No motivation quotes found today.", "items": []},
+        "wise_knowledge": {
+            "summary": "Today's themes",
+            "items": [{"content": "Know thyself", "url": "https://example.com/q", "source": "r/quotes"}],
+        },
+    }
+
+    html = digest_templates.render_digest(digest)["html"]
+
+    assert "Motivation Quotes" not in html
+    assert "Today's themes" not in html
+    assert '<li>"Know thyself" <em>(<a href="https://example.com/q">r/quotes</a>)</em></li>' in html
+
+
+def test_html_fields_are_escaped():
+    digest = {
+        "date": "2025-11-21",
+        "tech_news": {"stories": [{"title": "<script>x</script> & \"more\"", "url": 'https://example.com/a"b'}]},
+    }
+
+    html = digest_templates.render_digest(digest)["html"]
+
+    assert '<li><a href="https://example.com/a%22b">&lt;script&gt;x&lt;/script&gt; &amp; "more"</a></li>' in html
@@ -0,0 +1,107 @@
+"""Notification dispatcher against local SendGrid and webhook stand-ins."""
+
+import time
+
+import pytest
+
+import outbox
+import send_notification
+
+
+@pytest.fixture
+def channels(stub_server, monkeypatch):
+    """Email goes to the stub's SendGrid path; webhooks are stub paths."""
+    monkeypatch.setenv("SENDGRID_API_KEY", "SG.test")
+    monkeypatch.setenv("SENDGRID_API_HOST", stub_server.url)
+    for name in ("SENDGRID_FROM_EMAIL", "TWILIO_ACCOUNT_SID", "TWILIO_AUTH_TOKEN", "TWILIO_PHONE_NUMBER"):
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setattr(send_notification, "WEBHOOK_BACKOFF_SECONDS", 0)
+    return send_notification.configured_senders()
+
+
+def queued(tmp_path, deliveries):
+    conn = outbox.connect(str(tmp_path / "outbox.db"))
+    outbox.enqueue(conn, "2025-11-21", "Daily Digest", "<p>digest</p>", "digest", deliveries)
+    return conn, outbox.due_messages(conn)
+
+
+def test_channels_are_delivered_concurrently(stub_server, channels, tmp_path):
+    stub_server.script("/v3/mail/send", (202, 0.5))
+    stub_server.script("/hook", (200, 0.5))
+    _, messages = queued(tmp_path, [("email", "me@example.com"), ("webhook", f"{stub_server.url}/hook")])
+
+    started = time.monotonic()
+    results, outcomes = send_notification.dispatch_notifications(messages, channels)
+    elapsed = time.monotonic() - started
+
+    assert results["email"]["ok"] and results["webhook"]["ok"]
+    assert all(error is None for error in outcomes.values())
+    assert elapsed < 0.9
+    assert stub_server.posts("/hook")[0]["json"]["subject"] == "Daily Digest"
+
+
+def test_failing_endpoint_does_not_affect_other_channels(stub_server, channels, tmp_path):
+    stub_server.script("/down", (500, 0))
+    conn, messages = queued(tmp_path, [("email", "me@example.com"), ("webhook", f"{stub_server.url}/down")])
+
+    results, outcomes = send_notification.dispatch_notifications(messages, channels)
+    send_notification.record_outcomes(conn, messages, outcomes)
+
+    assert results["email"] == {**results["email"], "ok": True, "sent": 1, "failed": 0}
+    assert results["webhook"] == {**results["webhook"], "ok": False, "sent": 0, "failed": 1}
+    assert len(stub_server.posts("/down")) == send_notification.WEBHOOK_RETRIES
+    # The failed webhook stays queued for a later run; the email is done
+    assert outbox.status_counts(conn) == {"pending": 1, "sent": 1}
+
+
+def test_webhook_retries_transient_errors(stub_server, channels, tmp_path):
+    stub_server.script("/flaky", (503, 0), (200, 0))
+    _, messages = queued(tmp_path, [("webhook", f"{stub_server.url}/flaky")])
+
+    results, _ = send_notification.dispatch_notifications(messages, channels)
+
+    assert results["webhook"]["ok"]
+    assert len(stub_server.posts("/flaky")) == 2
+
+
+def test_webhook_client_errors_are_not_retried(stub_server, channels, tmp_path):
+    stub_server.script("/gone", (404, 0))
+    _, messages = queued(tmp_path, [("webhook", f"{stub_server.url}/gone")])
+
+    results, _ = send_notification.dispatch_notifications(messages, channels)
+
+    assert not results["webhook"]["ok"]
+    assert len(stub_server.posts("/gone")) == 1
+
+
+def test_webhook_timeout_fails_the_message(stub_server, channels, tmp_path, monkeypatch):
+    monkeypatch.setattr(send_notification, "WEBHOOK_TIMEOUT", 0.2)
+    monkeypatch.setattr(send_notification, "WEBHOOK_RETRIES", 2)
+    stub_server.script("/hang", (200, 1.5))
+    _, messages = queued(tmp_path, [("webhook", f"{stub_server.url}/hang")])
+
+    started = time.monotonic()
+    results, outcomes = send_notification.dispatch_notifications(messages, channels)
+
+    assert time.monotonic() - started < 1.0
+    assert results["webhook"]["failed"] == 1
+    assert list(outcomes.values()) == ["send failed"]
+    assert len(stub_server.posts("/hang")) == 2
+
+
+def test_messages_of_one_channel_are_delivered_concurrently(stub_server, channels, tmp_path):
+    stub_server.script("/a", (200, 0.5))
+    stub_server.script("/b", (200, 0.5))
+    stub_server.script("/down", (500, 0))
+    urls = [f"{stub_server.url}{path}" for path in ("/a", "/b", "/down")]
+    conn, messages = queued(tmp_path, [("webhook", url) for url in urls])
+
+    started = time.monotonic()
+    results, outcomes = send_notification.dispatch_notifications(messages, channels)
+    elapsed = time.monotonic() - started
+    send_notification.record_outcomes(conn, messages, outcomes)
+
+    assert elapsed < 0.9
+    assert results["webhook"] == {**results["webhook"], "ok": False, "sent": 2, "failed": 1}
+    pending = outbox.due_messages(conn, ignore_backoff=True)
+    assert [message["recipient"] for message in pending] == [urls[2]]
@@ -0,0 +1,36 @@
+"""GitHub response cache: stale http entries are pruned, commit stats are kept."""
+
+import time
+
+import github_client
+
+
+def test_stale_entries_are_pruned_on_open(tmp_path):
+    path = str(tmp_path / "github_cache.db")
+    cache = github_client.ResponseCache(path)
+    cache.put_http("https://api.github.com/search/commits?q=old", '"a"', "{}")
+    cache.put_http("https://api.github.com/search/commits?q=new", '"b"', "{}")
+    cache.put_values({"commit-stats:abc": [1, 2]})
+    old = time.time() - (github_client.HTTP_CACHE_MAX_AGE_DAYS + 1) * 86400
+    with cache.conn:
+        cache.conn.execute("UPDATE http SET fetched_at = ? WHERE url LIKE '%old'", (old,))
+    cache.close()
+
+    cache = github_client.ResponseCache(path)
+
+    assert cache.get_http("https://api.github.com/search/commits?q=old") is None
+    assert cache.get_http("https://api.github.com/search/commits?q=new") == {"etag": '"b"', "body": "{}"}
+    assert cache.get_values(["commit-stats:abc"]) == {"commit-stats:abc": [1, 2]}
+
+
+def test_revalidated_entries_are_kept(tmp_path):
+    cache = github_client.ResponseCache(str(tmp_path / "github_cache.db"))
+    cache.put_http("https://api.github.com/user/repos", '"a"', "[]")
+    old = time.time() - (github_client.HTTP_CACHE_MAX_AGE_DAYS + 1) * 86400
+    with cache.conn:
+        cache.conn.execute("UPDATE http SET fetched_at = ?", (old,))
+
+    cache.touch_http("https://api.github.com/user/repos")
+
+    assert cache.prune_http(github_client.HTTP_CACHE_MAX_AGE_DAYS) == 0
+    assert cache.get_http("https://api.github.com/user/repos") is not None
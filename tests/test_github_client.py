@@ -0,0 +1,33 @@
+"""GitHub client: concurrent requests use one session per thread."""
+
+import threading
+
+import clients
+import github_client
+
+
+def test_concurrent_requests_use_per_thread_sessions(stub_server, monkeypatch):
+    sessions = []
+    lock = threading.Lock()
+    per_thread = clients.http_session
+
+    def recording_session():
+        session = per_thread()
+        with lock:
+            sessions.append((threading.get_ident(), session))
+        return session
+
+    monkeypatch.setattr(clients, "http_session", recording_session)
+    stub_server.script("/graphql", (200, 0.1))
+    client = github_client.GitHubClient("test-token", max_concurrency=4)
+
+    responses = client.map(lambda i: client.request("POST", f"{stub_server.url}/graphql", json={"i": i}), range(8))
+
+    assert all(response.status_code == 200 for response in responses)
+    assert all(post["headers"]["Authorization"] == "Bearer test-token" for post in stub_server.posts("/graphql"))
+    # Each session belongs to exactly one thread
+    threads_by_session = {}
+    for thread, session in sessions:
+        threads_by_session.setdefault(id(session), set()).add(thread)
+    assert all(len(threads) == 1 for threads in threads_by_session.values())
+    assert len(threads_by_session) > 1
@@ -0,0 +1,26 @@
+"""Commit search windows have fixed bounds, so cached search pages are revalidated."""
+
+import log_stats
+
+
+def test_daily_run_searches_single_days():
+    assert log_stats.date_windows("2025-11-20", "2025-11-21") == [
+        ("2025-11-20", "2025-11-20"),
+        ("2025-11-21", "2025-11-21"),
+    ]
+
+
+def test_consecutive_runs_share_a_window():
+    yesterday = log_stats.date_windows("2025-11-20", "2025-11-21")
+    today = log_stats.date_windows("2025-11-21", "2025-11-22")
+    assert set(yesterday) & set(today) == {("2025-11-21", "2025-11-21")}
+
+
+def test_backfill_uses_whole_months():
+    windows = log_stats.date_windows("2025-01-01", "2025-03-02")
+    assert windows == [
+        ("2025-01-01", "2025-01-31"),
+        ("2025-02-01", "2025-02-28"),
+        ("2025-03-01", "2025-03-01"),
+        ("2025-03-02", "2025-03-02"),
+    ]
@@ -0,0 +1,94 @@
+"""Rollup aggregates: re-applying a day replaces its contribution."""
+
+import json
+import shutil
+
+import rollups
+
+
+def digest(date, stories):
+    return {"date": date, "ai_news": {"stories": stories}}
+
+
+def story(title, source="Hacker News", points=10):
+    return {"title": title, "url": f"https://example.com/{abs(hash(title))}", "source": source, "points": points}
+
+
+def test_reapplying_a_day_replaces_its_counts():
+    aggregate = rollups.empty_aggregate("2025-W47")
+    assert rollups.apply_digest(aggregate, digest("2025-11-17", [story("OpenAI ships agents", points=50)]))
+    assert rollups.apply_digest(aggregate, digest("2025-11-18", [story("OpenAI ships agents", points=20)]))
+
+    # Re-run of the 18th with a different story mix
+    assert rollups.apply_digest(aggregate, digest("2025-11-18", [story("Nvidia earnings beat", source="Reuters", points=5)]))
+
+    assert aggregate["days"] == ["2025-11-17", "2025-11-18"]
+    agents = aggregate["stories"]["openai ships agents"]
+    assert agents["days"] == 1
+    assert agents["points"] == 50
+    assert agents["last_seen"] == "2025-11-17"
+    assert aggregate["stories"]["nvidia earnings beat"]["days"] == 1
+    assert aggregate["sources"] == {"Hacker News": 1, "Reuters": 1}
+    assert aggregate["themes"]["openai"] == 1
+    assert aggregate["themes"]["nvidia"] == 1
+
+
+def test_reapplying_the_same_digest_is_idempotent():
+    day = digest("2025-11-17", [story("OpenAI ships agents"), story("Chip export rules tighten", source="Reuters")])
+    once = rollups.empty_aggregate("2025-11")
+    rollups.apply_digest(once, day)
+    twice = rollups.empty_aggregate("2025-11")
+    rollups.apply_digest(twice, day)
+    rollups.apply_digest(twice, day)
+    assert twice == once
+
+
+def update(day, tmp_path):
+    return rollups.update_rollups(
+        day, str(tmp_path / "rollups"), str(tmp_path / "cache"), archive_dir=str(tmp_path / "archive"),
+    )
+
+
+def test_rerun_drops_stories_only_seen_that_day(tmp_path):
+    update(digest("2025-11-17", [story("Old headline")]), tmp_path)
+    updated = update(digest("2025-11-17", [story("New headline")]), tmp_path)
+    for aggregate in updated.values():
+        assert set(aggregate["stories"]) == {"new headline"}
+        assert aggregate["days"] == ["2025-11-17"]
+
+
+def test_day_without_recorded_contribution_is_left_alone():
+    aggregate = rollups.empty_aggregate("2025-11")
+    aggregate["days"] = ["2025-11-17"]
+    assert not rollups.apply_digest(aggregate, digest("2025-11-17", [story("Anything")]))
+    assert aggregate["stories"] == {}
+
+
+def test_aggregate_files_keep_top_stories_and_no_replay_data(tmp_path, monkeypatch):
+    monkeypatch.setattr(rollups, "STORY_LIMIT", 2)
+    update(digest("2025-11-17", [story("Agents", points=5), story("Chips", points=50), story("Robots", points=1)]), tmp_path)
+    update(digest("2025-11-18", [story("Agents", points=5)]), tmp_path)
+
+    saved = json.loads((tmp_path / "rollups" / "monthly" / "2025-11.json").read_text())
+    assert "contributions" not in saved
+    assert set(saved["stories"]) == {"agents", "chips"}
+    assert saved["stories"]["agents"]["days"] == 2
+    contributions = json.loads((tmp_path / "cache" / "monthly" / "2025-11.json").read_text())
+    assert sorted(contributions) == ["2025-11-17", "2025-11-18"]
+
+
+def test_cold_cache_replays_the_period_from_the_archive(tmp_path):
+    archive_dir = tmp_path / "archive"
+    archive_dir.mkdir()
+    for day in (digest("2025-11-17", [story("Agents")]), digest("2025-11-18", [story("Agents")])):
+        (archive_dir / f"{day['date']}-digest.json").write_text(json.dumps(day))
+        update(day, tmp_path)
+    shutil.rmtree(tmp_path / "cache")
+
+    # Re-run of the 18th with the cache gone: the 17th still counts once
+    updated = update(digest("2025-11-18", [story("Chips")]), tmp_path)
+
+    monthly = updated["monthly"]
+    assert monthly["days"] == ["2025-11-17", "2025-11-18"]
+    assert monthly["stories"]["agents"]["days"] == 1
+    assert monthly["stories"]["chips"]["days"] == 1
@@ -0,0 +1,74 @@
+"""Bulk subscriber fan-out against a local SendGrid stand-in."""
+
+import pytest
+
+import send_notification
+
+SEND_PATH = "/v3/mail/send"
+
+
+@pytest.fixture(autouse=True)
+def sendgrid_stub(stub_server, monkeypatch):
+    monkeypatch.setenv("SENDGRID_API_HOST", stub_server.url)
+    monkeypatch.setattr(send_notification, "SENDGRID_BACKOFF_SECONDS", 0)
+    return stub_server
+
+
+def fan_out(recipients, **kwargs):
+    return send_notification.send_email_batches(
+        api_key="SG.test",
+        recipients=recipients,
+        subject="Daily Digest",
+        content="<p>digest</p>",
+        **kwargs,
+    )
+
+
+def recipients(count):
+    return [f"reader{i}@example.com" for i in range(count)]
+
+
+def test_batches_respect_the_batch_size(sendgrid_stub):
+    stats = fan_out(recipients(25), batch_size=10, concurrency=3)
+
+    sizes = sorted(len(post["json"]["personalizations"]) for post in sendgrid_stub.posts(SEND_PATH))
+    assert sizes == [5, 10, 10]
+    # One personalization per recipient, so subscribers don't see each other
+    sent_to = [p["to"] for post in sendgrid_stub.posts(SEND_PATH) for p in post["json"]["personalizations"]]
+    assert all(len(to) == 1 for to in sent_to)
+    assert sorted(to[0]["email"] for to in sent_to) == sorted(recipients(25))
+    assert stats["batches"] == 3 and stats["sent"] == 25 and stats["failed"] == 0
+
+
+def test_service_unavailable_is_retried(sendgrid_stub):
+    sendgrid_stub.script(SEND_PATH, (503, 0), (202, 0))
+
+    stats = fan_out(recipients(3))
+
+    assert len(sendgrid_stub.posts(SEND_PATH)) == 2
+    assert stats["sent"] == 3 and stats["retries"] == 1
+    assert stats["failed_recipients"] == {}
+
+
+def test_failed_batches_are_counted(sendgrid_stub):
+    # Sequential batches: the second is rejected outright (not retried)
+    sendgrid_stub.script(SEND_PATH, (202, 0), (400, 0), (202, 0))
+
+    stats = fan_out(recipients(6), batch_size=2, concurrency=1)
+
+    assert len(sendgrid_stub.posts(SEND_PATH)) == 3
+    assert stats["sent"] == 4 and stats["failed"] == 2 and stats["failed_batches"] == 1
+    assert stats["failed_recipients"] == {
+        "reader2@example.com": "status 400",
+        "reader3@example.com": "status 400",
+    }
+
+
+def test_retries_are_bounded(sendgrid_stub):
+    sendgrid_stub.script(SEND_PATH, (500, 0))
+
+    stats = fan_out(recipients(4), batch_size=2, concurrency=2)
+
+    assert len(sendgrid_stub.posts(SEND_PATH)) == 2 * send_notification.SENDGRID_BATCH_RETRIES
+    assert stats["failed"] == 4 and stats["sent"] == 0
+    assert stats["retries"] == 2 * (send_notification.SENDGRID_BATCH_RETRIES - 1)
@@ -0,0 +1,36 @@
+"""Trend matrix: kept in .cache, rebuilt from the archive when the cache is cold."""
+
+import os
+import json
+import shutil
+import subprocess
+import sys
+
+import trends
+from conftest import SCRIPTS_DIR
+
+ARCHIVE_DIR = os.path.join(os.path.dirname(SCRIPTS_DIR), "archive")
+
+
+def test_importing_trends_does_not_load_numpy():
+    code = "import sys, trends; print('numpy' in sys.modules)"
+    env = dict(os.environ, PYTHONPATH=SCRIPTS_DIR)
+    result = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "False"
+
+
+def test_cold_cache_rebuilds_history_from_archive(tmp_path):
+    archive_dir = tmp_path / "archive"
+    archive_dir.mkdir()
+    for name in ("2025-11-20-digest.json", "2025-11-21-digest.json"):
+        shutil.copy(os.path.join(ARCHIVE_DIR, name), archive_dir / name)
+    with open(archive_dir / "2025-11-21-digest.json", encoding="utf-8") as f:
+        today = json.load(f)
+    path = str(tmp_path / ".cache" / "trends" / "matrix.npz")
+
+    assert trends.update_trends(today, path, archive_dir=str(archive_dir)) is not None
+    assert trends.TrendMatrix.load(path).days == ["2025-11-20", "2025-11-21"]
+
+    # A warm cache appends (or replaces) today only
+    trends.update_trends(today, path, archive_dir=str(archive_dir))
+    assert trends.TrendMatrix.load(path).days == ["2025-11-20", "2025-11-21"]
@@ -0,0 +1,60 @@
+"""README rendering: one tokenize pass over every marker, one write."""
+
+import update_readme
+
+SECTIONS = ("ai_news", "tech_news", "disclaimer")
+
+
+def readme(tmp_path, text):
+    path = tmp_path / "README.md"
+    path.write_text(text, encoding="utf-8")
+    return path
+
+
+def block(name, body):
+    return f"<!--START_SECTION:{name}-->\n{body}\n<!--END_SECTION:{name}-->"
+
+
+def test_sections_and_disclaimer_are_replaced(tmp_path, monkeypatch):
+    monkeypatch.setattr(update_readme, "current_timestamp", lambda: "2025-11-21 00:00:00 UTC")
+    path = readme(tmp_path, "# Me\n\n" + "\n\n".join(block(name, "old") for name in SECTIONS) + "\n")
+
+    manifest = update_readme.update_readme({"ai_news": {"markdown": "## AI\n\n1. Story"}}, str(path))
+
+    text = path.read_text(encoding="utf-8")
+    assert manifest["changed"]
+    assert manifest["sections"]["ai_news"]["changed"] and manifest["sections"]["tech_news"]["changed"]
+    assert block("ai_news", "\n## AI\n\n1. Story\n") in text
+    assert "*Content will be updated daily via GitHub Actions*" in text
+    assert "**Last Updated:** 2025-11-21 00:00:00 UTC" in text
+    assert "old" not in text
+
+
+def test_duplicates_and_unpaired_markers_are_removed(tmp_path):
+    text = "\n".join([
+        block("ai_news", "first"),
+        "<!--END_SECTION:tech_news-->",
+        block("ai_news", "second"),
+        block("tech_news", "news"),
+        "<!--START_SECTION:ai_news-->",
+    ])
+    path = readme(tmp_path, text)
+
+    update_readme.update_readme({"ai_news": {"markdown": "fresh"}, "tech_news": {"markdown": "news"}}, str(path))
+
+    result = path.read_text(encoding="utf-8")
+    assert result.count("<!--START_SECTION:ai_news-->") == 1
+    assert result.count("<!--END_SECTION:tech_news-->") == 1
+    assert "fresh" in result and "first" not in result and "second" not in result
+
+
+def test_unchanged_readme_is_not_written(tmp_path):
+    path = readme(tmp_path, "\n".join(block(name, "old") for name in SECTIONS))
+    data = {"ai_news": {"markdown": "AI"}, "tech_news": {"markdown": "Tech"}}
+    update_readme.update_readme(data, str(path))
+    written = path.read_text(encoding="utf-8")
+
+    manifest = update_readme.update_readme(data, str(path))
+
+    assert not manifest["changed"]
+    assert path.read_text(encoding="utf-8") == written